@@ -5,6 +5,7 @@ from typing import Literal
 import semver
 from fastapi import Response
 
+from ayon_server.addons.settings_caching import clear_resolved_settings
 from ayon_server.api.dependencies import CurrentUser
 from ayon_server.exceptions import (
     AyonException,
@@ -85,6 +86,7 @@ async def copy_addon_variant(
         copy_to,
         target_settings,
     )
+    await clear_resolved_settings()
 
 
 class VariantCopyRequest(OPModel):
@@ -2,7 +2,7 @@ import os
 
 import aiocache
 from fastapi import Header, Query, Request, Response
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import RedirectResponse
 
 from ayon_server.api.dependencies import (
     AllowGuests,
@@ -11,6 +11,7 @@ from ayon_server.api.dependencies import (
     NoTraces,
     ProjectName,
 )
+from ayon_server.api.files import LocalFileResponse
 from ayon_server.api.responses import EmptyResponse
 from ayon_server.exceptions import (
     BadRequestException,
@@ -18,7 +19,11 @@ from ayon_server.exceptions import (
     NotFoundException,
 )
 from ayon_server.files import Storages, create_project_file_record
-from ayon_server.helpers.preview import create_video_thumbnail, get_file_preview
+from ayon_server.helpers.preview import (
+    create_video_thumbnail,
+    get_file_preview,
+    schedule_file_preview,
+)
 from ayon_server.lib.postgres import Postgres
 from ayon_server.models.file_info import FileInfo
 from ayon_server.types import Field, OPModel
@@ -95,6 +100,7 @@ async def upload_project_file(
             file_id,
         )
 
+    schedule_file_preview(project_name, file_id, content_type)
     return CreateFileResponseModel(id=file_id)
 
 
@@ -169,7 +175,7 @@ async def get_project_file(
     project_name: ProjectName,
     file_id: FileID,
     user: CurrentUser,
-) -> FileResponse | Response:
+) -> LocalFileResponse | Response:
     """Get a project file (comment attachment etc.)
 
     The `preview` query parameter can be used to get
@@ -226,7 +232,7 @@ async def get_project_file_payload(
     project_name: ProjectName,
     file_id: FileID,
     user: CurrentUser,
-) -> FileResponse | Response:
+) -> LocalFileResponse | Response:
     storage = await Storages.project(project_name)
     if storage.storage_type != "local":
         raise BadRequestException("File storage is not local")
@@ -241,7 +247,10 @@ async def get_project_file_payload(
     if headers["Content-Type"].startswith("video"):
         return await serve_video(request, path, content_type=headers["Content-Type"])
 
-    return FileResponse(path, headers=headers)
+    # Files are immutable, so the browser may reuse them
+    # and revalidate them using the ETag afterwards
+    headers = {**headers, "Cache-Control": "private, max-age=600"}
+    return LocalFileResponse(path, headers=headers)
 
 
 @router.get(
@@ -253,7 +262,7 @@ async def get_project_file_thumbnail(
     project_name: ProjectName,
     file_id: FileID,
     user: CurrentUser,
-) -> FileResponse | Response:
+) -> LocalFileResponse | Response:
     """Get a project file (comment attachment etc.)
 
     The `preview` query parameter can be used to get
@@ -8,11 +8,14 @@ from fastapi import Query, Response
 
 from ayon_server.access.utils import AccessChecker
 from ayon_server.api.dependencies import AllowGuests, CurrentUser, ProjectName
-from ayon_server.helpers.hierarchy_cache import rebuild_hierarchy_cache
-from ayon_server.lib.redis import Redis
+from ayon_server.helpers.hierarchy_cache import (
+    get_hierarchy_cache_version,
+    load_hierarchy_cache,
+    rebuild_hierarchy_cache,
+)
 from ayon_server.logging import logger
 from ayon_server.types import OPModel
-from ayon_server.utils import camelize, json_dumps, json_loads
+from ayon_server.utils import json_dumps
 
 from .router import router
 
@@ -38,6 +41,9 @@ def _build_response(
         # pop or filter attributes, we need to do that on a copy
 
         if attrib_whitelist == set():
+            if "attrib" not in folder:
+                # attributes were not loaded from the cache at all
+                return folder
             # sligthly faster than copying
             return {k: v for k, v in folder.items() if k not in ("attrib", "ownAttrib")}
 
@@ -92,49 +98,70 @@ class FolderListModel(OPModel):
 
 
 class FolderListLoader:
-    _current_futures: dict[str, asyncio.Task[list[dict[str, Any]]]]
+    """Load folder lists from the hierarchy cache.
+
+    Parsed folder lists are kept in memory along with the version
+    of the cache they were loaded from, so subsequent requests
+    don't need to fetch and parse the cache again until it changes.
+    Concurrent requests for the same list share a single load.
+    """
+
+    max_cached_lists: int = 8
+
+    _current_futures: dict[tuple[str, bool], asyncio.Task[list[dict[str, Any]]]]
+    _cached_lists: dict[tuple[str, bool], tuple[str, list[dict[str, Any]]]]
     _lock: asyncio.Lock
     _executor: ThreadPoolExecutor
 
     def __init__(self):
         self._current_futures = {}
+        self._cached_lists = {}
         self._lock = asyncio.Lock()
         self._executor = ThreadPoolExecutor(max_workers=10)
 
-    async def get_folder_list(self, project_name: str) -> list[dict[str, Any]]:
+    async def get_folder_list(
+        self,
+        project_name: str,
+        attrib: bool = True,
+    ) -> list[dict[str, Any]]:
+        key = (project_name, attrib)
         async with self._lock:
-            if project_name not in self._current_futures:
-                self._current_futures[project_name] = asyncio.create_task(
-                    self._load_folders(project_name)
+            if key not in self._current_futures:
+                self._current_futures[key] = asyncio.create_task(
+                    self._load_folders(project_name, attrib)
                 )
 
-        data = await self._current_futures[project_name]
+        data = await self._current_futures[key]
 
         async with self._lock:
-            self._current_futures.pop(project_name, None)
+            self._current_futures.pop(key, None)
 
         return data
 
-    async def _load_folders(self, project_name: str) -> list[dict[str, Any]]:
-        logger.trace(f"Loading folders for project {project_name}")
-        camelize_memo = {}
-
-        def camelize_memoized(src: str) -> str:
-            if src not in camelize_memo:
-                camelize_memo[src] = camelize(src)
-            return camelize_memo[src]
+    async def _load_folders(
+        self,
+        project_name: str,
+        attrib: bool,
+    ) -> list[dict[str, Any]]:
+        key = (project_name, attrib)
+        version = await get_hierarchy_cache_version(project_name)
+        if version is None:
+            await rebuild_hierarchy_cache(project_name)
+            version = await get_hierarchy_cache_version(project_name)
+
+        if (cached := self._cached_lists.get(key)) and cached[0] == version:
+            return cached[1]
 
-        def process_record(record: dict[str, Any]) -> dict[str, Any]:
-            return {camelize_memoized(k): v for k, v in record.items()}
+        logger.trace(f"Loading folders for project {project_name}")
+        folder_list = await load_hierarchy_cache(project_name, attrib=attrib)
 
-        entities_data = await Redis.get("project-folders", project_name)
-        if entities_data is None:
-            folder_list = await rebuild_hierarchy_cache(project_name)
-        else:
-            folder_list = json_loads(entities_data)
+        if version is not None:
+            self._cached_lists.pop(key, None)
+            self._cached_lists[key] = (version, folder_list)
+            while len(self._cached_lists) > self.max_cached_lists:
+                self._cached_lists.pop(next(iter(self._cached_lists)))
 
-        assert isinstance(folder_list, list)
-        return [process_record(record) for record in folder_list]
+        return folder_list
 
     async def build_response(
         self,
@@ -183,13 +210,12 @@ async def get_folder_list(
     # several megabytes in size, so we need to be careful  not to block other
     # requests while fetching the list and processing the result.
     #
-    # Folder list is fetched from redis, where it is stored as JSON in a
-    # very similar manner we need to return, but:
+    # Folder list is fetched from redis, where each folder is stored as JSON
+    # in the same format we need to return (attributes are stored separately
+    # and loaded only when requested), but all folders are stored there,
+    # so we need to filter out the ones the user does not have access to.
     #
-    # - for top level keys, it uses snake_case notation as used in the database
-    #   instead of camelCase as used in the frontend.
-    # - all folders are stored there, so we need to filter out the ones the user
-    #   does not have access to. So we cannot avoid parsing the JSON, solving the ACL
+    # Parsed lists are kept in memory until the cache version changes.
 
     if user.is_guest:
         # We allow access to this endpoint for guest users
@@ -213,7 +239,7 @@ async def get_folder_list(
     logger.trace(f"Loaded folder access list in {elapsed_time:.3f} seconds")
 
     start_time = time.monotonic()
-    entities = await folder_list_loader.get_folder_list(project_name)
+    entities = await folder_list_loader.get_folder_list(project_name, attrib=attrib)
     elapsed_time = time.monotonic() - start_time
     ent_count = len(entities)
     me = f"{ent_count} folders {'with' if attrib else 'without'} attr of {project_name}"
@@ -5,20 +5,34 @@ from ayon_server.events import EventStream
 from ayon_server.events.patch import build_project_change_events
 from ayon_server.helpers.deploy_project import anatomy_to_project_data
 from ayon_server.helpers.extract_anatomy import extract_project_anatomy
+from ayon_server.helpers.project_cache import project_cache
 from ayon_server.lib.redis import Redis
 from ayon_server.settings.anatomy import Anatomy
-from ayon_server.utils import RequestCoalescer
+from ayon_server.utils import RequestCoalescer, json_dumps, json_loads
 
 from .router import router
 
 
 async def _get_project_anatomy(project_name: ProjectName) -> Anatomy:
-    if cached_data := await Redis.get_json("project-anatomy", project_name):
-        return Anatomy(**cached_data)
+    """Return the project anatomy.
 
-    project = await ProjectEntity.load(project_name)
-    anatomy = extract_project_anatomy(project)
-    await Redis.set_json("project-anatomy", project_name, anatomy.dict(), ttl=3600)
+    The returned object is shared by all requests. Do not modify it.
+    """
+    if entry := project_cache.get("project-anatomy", project_name):
+        return entry.shared
+
+    generation = project_cache.generation
+    if cached_data := await Redis.get("project-anatomy", project_name):
+        data = cached_data.decode()
+        anatomy = Anatomy(**json_loads(data))
+    else:
+        project = await ProjectEntity.load(project_name)
+        anatomy = extract_project_anatomy(project)
+        data = json_dumps(anatomy.dict())
+        await Redis.set("project-anatomy", project_name, data, ttl=3600)
+
+    if entry := project_cache.put("project-anatomy", project_name, data, generation):
+        entry.shared = anatomy
     return anatomy
 
 
@@ -2,6 +2,7 @@ __all__ = [
     "frontend_modules",
     "info",
     "metrics",
+    "queries",
     "secrets",
     "sites",
     "dbimport",
@@ -17,7 +18,7 @@ from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import logger
 from ayon_server.types import Field, OPModel
 
-from . import dbimport, frontend_modules, info, metrics, secrets, sites
+from . import dbimport, frontend_modules, info, metrics, queries, secrets, sites
 from .router import router
 
 
@@ -0,0 +1,59 @@
+from typing import Literal
+
+from fastapi import Query
+
+from ayon_server.api.dependencies import CurrentUser
+from ayon_server.api.responses import EmptyResponse
+from ayon_server.exceptions import ForbiddenException
+from ayon_server.lib.postgres_stats import query_stats
+from ayon_server.types import Field, OPModel
+
+from .router import router
+
+
+class QueryStatsItem(OPModel):
+    fingerprint: str = Field(..., title="Normalized query hash")
+    query: str = Field(..., title="Normalized query")
+    calls: int = Field(..., title="Number of executions")
+    rows: int = Field(..., title="Total number of rows returned or affected")
+    errors: int = Field(..., title="Number of failed executions")
+    total_time: float = Field(..., title="Total execution time in seconds")
+    mean_time: float = Field(..., title="Mean execution time in seconds")
+    max_time: float = Field(..., title="Maximum execution time in seconds")
+
+
+class QueryStatsResponse(OPModel):
+    since: float = Field(..., title="Timestamp of the collection start")
+    queries: list[QueryStatsItem] = Field(default_factory=list)
+
+
+@router.get("/system/queries")
+async def get_query_stats(
+    user: CurrentUser,
+    limit: int = Query(50, ge=1, le=1000),
+    order_by: Literal["total_time", "mean_time", "max_time", "calls", "rows"] = Query(
+        "total_time"
+    ),
+) -> QueryStatsResponse:
+    """Return execution statistics of database queries
+
+    Queries differing only in literal values and project names
+    are grouped together. Statistics are collected by the server
+    process handling the request since its start or the last reset.
+    """
+    if not user.is_admin:
+        raise ForbiddenException("Only administrators can view query statistics")
+
+    return QueryStatsResponse(
+        since=query_stats.since,
+        queries=[QueryStatsItem(**r) for r in query_stats.top(limit, order_by)],
+    )
+
+
+@router.delete("/system/queries", status_code=204)
+async def reset_query_stats(user: CurrentUser) -> EmptyResponse:
+    """Reset query statistics of the server process"""
+    if not user.is_admin:
+        raise ForbiddenException("Only administrators can reset query statistics")
+    query_stats.reset()
+    return EmptyResponse()
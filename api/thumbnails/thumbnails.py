@@ -1,8 +1,10 @@
 import functools
+import time
 from typing import Literal
 
-from fastapi import APIRouter, Query, Request, Response
+from fastapi import APIRouter, Header, Path, Query, Request, Response
 
+from ayon_server.access.utils import folder_access_list
 from ayon_server.api.dependencies import (
     AllowGuests,
     CurrentUser,
@@ -15,23 +17,34 @@ from ayon_server.api.dependencies import (
     VersionID,
     WorkfileID,
 )
+from ayon_server.api.files import etag_matches
 from ayon_server.api.responses import EmptyResponse
+from ayon_server.config import ayonconfig
 from ayon_server.entities.folder import FolderEntity
 from ayon_server.entities.task import TaskEntity
 from ayon_server.entities.version import VersionEntity
 from ayon_server.entities.workfile import WorkfileEntity
 from ayon_server.exceptions import (
     AyonException,
+    BadRequestException,
     ForbiddenException,
     NotFoundException,
+    PayloadTooLargeException,
 )
-from ayon_server.files import Storages
 from ayon_server.helpers.preview import get_file_preview
-from ayon_server.helpers.thumbnails import get_fake_thumbnail, store_thumbnail
+from ayon_server.helpers.project_list import project_index
+from ayon_server.helpers.thumbnails import (
+    get_fake_thumbnail,
+    get_signed_thumbnail_url,
+    get_thumbnail_version,
+    load_thumbnail,
+    store_thumbnail,
+    verify_thumbnail_signature,
+)
 from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import logger
-from ayon_server.types import Field, OPModel
-from ayon_server.utils import EntityID
+from ayon_server.types import PROJECT_NAME_REGEX, Field, OPModel
+from ayon_server.utils import EntityID, SQLTool
 
 #
 # Router
@@ -47,11 +60,24 @@ PlaceholderOption = Literal["empty", "none"]
 
 
 async def body_from_request(request: Request) -> bytes:
-    result = b""
+    """Read the thumbnail image from the request body.
+
+    Chunks are collected to a single growing buffer. Uploads larger
+    than `ayonconfig.thumbnail_max_upload_size` are rejected
+    as soon as the limit is exceeded.
+    """
+    max_size = ayonconfig.thumbnail_max_upload_size
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_size:
+        raise PayloadTooLargeException(f"Thumbnail exceeds {max_size} bytes")
+
+    buffer = bytearray()
     async for chunk in request.stream():
-        result += chunk
-    logger.debug(f"Received thumbnail payload of {len(result)} bytes")
-    return result
+        buffer += chunk
+        if len(buffer) > max_size:
+            raise PayloadTooLargeException(f"Thumbnail exceeds {max_size} bytes")
+    logger.debug(f"Received thumbnail payload of {len(buffer)} bytes")
+    return bytes(buffer)
 
 
 @functools.cache
@@ -72,7 +98,20 @@ async def retrieve_thumbnail(
     thumbnail_id: str | None,
     placeholder: PlaceholderOption = "none",
     original: bool = False,
+    *,
+    if_none_match: str | None = None,
+    cache_control: str | None = None,
+    version: str | None = None,
 ) -> Response:
+    """Return the thumbnail image response
+
+    The response has a strong ETag derived from the thumbnail content.
+    A matching If-None-Match request header results in 304 Not Modified
+    without loading the image.
+
+    `cache_control` is only used when the thumbnail content matches
+    the requested `version` (if specified).
+    """
     query = f"SELECT * FROM project_{project_name}.thumbnails WHERE id = $1"
     if thumbnail_id is not None:
         try:
@@ -81,26 +120,34 @@ async def retrieve_thumbnail(
             pass  # project does not exist
         else:
             if res:
-                payload = None
-                if original:
-                    storage = await Storages.project(project_name)
-                    try:
-                        payload = await storage.get_thumbnail(thumbnail_id)
-                    except FileNotFoundError:
-                        pass
-
                 record = res[0]
-                payload = payload or record["data"]
-                return Response(
-                    media_type=record["mime"],
-                    status_code=200,
-                    content=payload,
-                    headers={
-                        "X-Thumbnail-Id": thumbnail_id,
-                        "X-Thumbnail-Time": str(record.get("created_at", 0)),
-                        "Cache-Control": f"max-age={60}",
-                    },
+                current_version = get_thumbnail_version(record)
+                if cache_control is None or version not in (None, current_version):
+                    cache_control = f"private, max-age={60}"
+                etag = (
+                    f'"{current_version}-original"'
+                    if original
+                    else f'"{current_version}"'
+                )
+                headers = {
+                    "X-Thumbnail-Id": thumbnail_id,
+                    "X-Thumbnail-Time": str(record.get("created_at", 0)),
+                    "ETag": etag,
+                    "Cache-Control": cache_control,
+                }
+                if if_none_match and etag_matches(if_none_match, etag):
+                    return Response(status_code=304, headers=headers)
+
+                payload = await load_thumbnail(
+                    project_name, thumbnail_id, record, original=original
                 )
+                if payload:
+                    return Response(
+                        media_type=record["mime"],
+                        status_code=200,
+                        content=payload,
+                        headers=headers,
+                    )
 
     if placeholder == "empty":
         return get_fake_thumbnail_response()
@@ -184,6 +231,7 @@ async def get_thumbnail(
     thumbnail_id: ThumbnailID,
     placeholder: PlaceholderOption = Query("empty"),
     original: bool = Query(False),
+    if_none_match: str | None = Header(None),
 ) -> Response:
     """Get a thumbnail by its ID.
 
@@ -195,7 +243,161 @@ async def get_thumbnail(
         raise ForbiddenException("Only managers can access arbitrary thumbnails")
 
     return await retrieve_thumbnail(
-        project_name, thumbnail_id, placeholder=placeholder, original=original
+        project_name,
+        thumbnail_id,
+        placeholder=placeholder,
+        original=original,
+        if_none_match=if_none_match,
+    )
+
+
+#
+# Batch access
+#
+
+ThumbnailEntityType = Literal["folder", "version", "task", "workfile"]
+
+# Joins resolving the folder (hierarchy path) of the entity
+THUMBNAIL_ENTITY_JOINS: dict[str, str] = {
+    "folder": "JOIN project_{p}.hierarchy h ON h.id = e.id",
+    "version": """
+        JOIN project_{p}.products p ON p.id = e.product_id
+        JOIN project_{p}.hierarchy h ON h.id = p.folder_id
+    """,
+    "task": "JOIN project_{p}.hierarchy h ON h.id = e.folder_id",
+    "workfile": """
+        JOIN project_{p}.tasks t ON t.id = e.task_id
+        JOIN project_{p}.hierarchy h ON h.id = t.folder_id
+    """,
+}
+
+
+class ThumbnailUrlsRequestModel(OPModel):
+    entity_type: ThumbnailEntityType = Field(..., title="Entity type")
+    entity_ids: list[str] = Field(
+        ...,
+        title="Entity IDs",
+        max_items=1000,
+        example=["af10c8f0e9b111e9b8f90242ac130003"],
+    )
+
+
+class ThumbnailUrlModel(OPModel):
+    entity_id: str = Field(..., title="Entity ID")
+    thumbnail_id: str | None = Field(None, title="Thumbnail ID")
+    url: str = Field(
+        ...,
+        title="Thumbnail URL",
+        description="Signed URL of the thumbnail image, or the entity "
+        "thumbnail endpoint if the entity does not have its own thumbnail",
+    )
+
+
+class ThumbnailUrlsResponseModel(OPModel):
+    thumbnails: list[ThumbnailUrlModel] = Field(default_factory=list)
+
+
+@router.post("/projects/{project_name}/thumbnails/batch", dependencies=[AllowGuests])
+async def get_thumbnail_urls(
+    user: CurrentUser,
+    project_name: ProjectName,
+    payload: ThumbnailUrlsRequestModel,
+) -> ThumbnailUrlsResponseModel:
+    """Get thumbnail URLs of multiple entities at once.
+
+    Thumbnails are returned as signed URLs, which don't require
+    authentication and may be cached by the browser until they expire,
+    so displaying a large number of entities does not require
+    a separate request (and an access check) for each of them.
+
+    Entities the user cannot access are omitted from the response.
+    """
+    entity_type = payload.entity_type
+    try:
+        entity_ids = [EntityID.parse(entity_id) for entity_id in payload.entity_ids]
+    except ValueError as e:
+        raise BadRequestException(str(e)) from e
+
+    try:
+        access_list = await folder_access_list(user, project_name)
+    except ForbiddenException:
+        return ThumbnailUrlsResponseModel()
+
+    conditions = ["e.id = ANY($1::uuid[])"]
+    if access_list is not None:
+        conditions.append(f"h.path like ANY ('{{{', '.join(access_list)}}}')")
+
+    joins = THUMBNAIL_ENTITY_JOINS[entity_type].format(p=project_name)
+    query = f"""
+        SELECT
+            e.id AS entity_id,
+            e.thumbnail_id AS id,
+            th.meta AS meta,
+            th.created_at AS created_at
+        FROM project_{project_name}.{entity_type}s e
+        {joins}
+        LEFT JOIN project_{project_name}.thumbnails th
+        ON th.id = e.thumbnail_id
+        {SQLTool.conditions(conditions)}
+    """
+
+    result = ThumbnailUrlsResponseModel()
+    async for row in Postgres.iterate(query, entity_ids):
+        entity_id = EntityID.parse(row["entity_id"])
+        assert entity_id  # mypy
+        if row["created_at"] is None:
+            # The entity does not have a thumbnail. Use the entity endpoint
+            # which falls back to thumbnails or previews of related entities
+            url = f"/api/projects/{project_name}/{entity_type}s/{entity_id}/thumbnail"
+            result.thumbnails.append(ThumbnailUrlModel(entity_id=entity_id, url=url))
+            continue
+
+        thumbnail_id = EntityID.parse(row["id"])
+        assert thumbnail_id  # mypy
+        url = await get_signed_thumbnail_url(
+            project_name, thumbnail_id, get_thumbnail_version(row)
+        )
+        result.thumbnails.append(
+            ThumbnailUrlModel(entity_id=entity_id, thumbnail_id=thumbnail_id, url=url)
+        )
+    return result
+
+
+@router.get(
+    "/projects/{project_name}/thumbnails/{thumbnail_id}/signed",
+    response_class=Response,
+    dependencies=[NoTraces, AllowGuests],
+)
+async def get_signed_thumbnail(
+    thumbnail_id: ThumbnailID,
+    project_name: str = Path(..., title="Project name", regex=PROJECT_NAME_REGEX),
+    version: str = Query(..., alias="v"),
+    expires: int = Query(..., alias="exp"),
+    signature: str = Query(..., alias="sig"),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """Get a thumbnail using a signed URL.
+
+    Signed URLs are returned by the batch thumbnail endpoint.
+    The URL contains the content version of the thumbnail, so the response
+    may be cached by browsers and proxies until the URL expires.
+
+    The endpoint does not require authentication,
+    the URL signature is the only authorization.
+    """
+    await verify_thumbnail_signature(
+        project_name, thumbnail_id, version, expires, signature
+    )
+    if (project := await project_index.get(project_name)) is None:
+        raise NotFoundException("Project not found")
+    project_name = project.name
+    max_age = max(0, expires - int(time.time()))
+    return await retrieve_thumbnail(
+        project_name,
+        thumbnail_id,
+        if_none_match=if_none_match,
+        cache_control=f"public, max-age={max_age}, immutable",
+        version=version,
     )
 
 
@@ -245,6 +447,7 @@ async def get_folder_thumbnail(
     folder_id: FolderID,
     placeholder: PlaceholderOption = Query("empty"),
     original: bool = Query(False),
+    if_none_match: str | None = Header(None),
 ) -> Response:
     query = f"""
         WITH reviewables AS (
@@ -295,6 +498,7 @@ async def get_folder_thumbnail(
             res["thumbnail_id"],
             placeholder=placeholder,
             original=original,
+            if_none_match=if_none_match,
         )
 
     if res["version_thumbnail_id"]:
@@ -306,6 +510,7 @@ async def get_folder_thumbnail(
             res["version_thumbnail_id"],
             placeholder=placeholder,
             original=original,
+            if_none_match=if_none_match,
         )
 
     if res["reviewable_id"]:
@@ -358,6 +563,7 @@ async def get_version_thumbnail(
     version_id: VersionID,
     placeholder: PlaceholderOption = Query("empty"),
     original: bool = Query(False),
+    if_none_match: str | None = Header(None),
 ) -> Response:
     query = f"""
         WITH reviewables AS (
@@ -400,6 +606,7 @@ async def get_version_thumbnail(
             res["thumbnail_id"],
             placeholder=placeholder,
             original=original,
+            if_none_match=if_none_match,
         )
 
     if res["reviewable_id"]:
@@ -454,6 +661,7 @@ async def get_workfile_thumbnail(
     workfile_id: WorkfileID,
     placeholder: PlaceholderOption = Query("empty"),
     original: bool = Query(False),
+    if_none_match: str | None = Header(None),
 ) -> Response:
     try:
         workfile = await WorkfileEntity.load(project_name, workfile_id)
@@ -464,7 +672,11 @@ async def get_workfile_thumbnail(
         else:
             raise NotFoundException("Workfile not found")
     return await retrieve_thumbnail(
-        project_name, workfile.thumbnail_id, placeholder=placeholder, original=original
+        project_name,
+        workfile.thumbnail_id,
+        placeholder=placeholder,
+        original=original,
+        if_none_match=if_none_match,
     )
 
 
@@ -508,6 +720,7 @@ async def get_task_thumbnail(
     task_id: TaskID,
     placeholder: PlaceholderOption = Query("empty"),
     original: bool = Query(False),
+    if_none_match: str | None = Header(None),
 ) -> Response:
     query = f"""
         WITH reviewables AS (
@@ -556,6 +769,7 @@ async def get_task_thumbnail(
             res["thumbnail_id"],
             placeholder=placeholder,
             original=original,
+            if_none_match=if_none_match,
         )
 
     if res["version_thumbnail_id"]:
@@ -566,6 +780,7 @@ async def get_task_thumbnail(
             res["version_thumbnail_id"],
             placeholder=placeholder,
             original=original,
+            if_none_match=if_none_match,
         )
 
     if res["reviewable_id"]:
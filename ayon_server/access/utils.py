@@ -1,8 +1,10 @@
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from ayon_server.exceptions import ForbiddenException
 from ayon_server.lib.postgres import Postgres
-from ayon_server.utils import SQLTool
+from ayon_server.lib.redis import Redis
+from ayon_server.logging import logger
+from ayon_server.utils import SQLTool, create_hash, hash_data, json_dumps, json_loads
 
 if TYPE_CHECKING:
     from ayon_server.access.permissions import FolderAccessList
@@ -38,22 +40,117 @@ def path_to_paths(
     return result
 
 
+#
+# Folder access list cache
+#
+# Access lists containing "assigned" permissions depend on task assignees
+# and folder paths, so they are cached in Redis per project, in a hash
+# with a `version` field and one `{user_name}:{access_type}` field per
+# cached list. Each list is stored along with the version it was built
+# for and a fingerprint of the permission set, so changes of access
+# groups or user access do not need explicit invalidation.
+#
+# Changes of tasks and folders invalidate the whole project cache by
+# replacing the hash with a new version. Lists built concurrently with
+# the invalidation are stored with the old version and never used.
+#
+
+FOLDER_ACCESS_LIST_NS = "folder-access-list"
+FOLDER_ACCESS_LIST_TTL = 3600
+
+# Task and folder events changing the result of "assigned" permissions
+FOLDER_ACCESS_TOPICS = (
+    "entity.task.created",
+    "entity.task.deleted",
+    "entity.task.assignees_changed",
+    "entity.task.folder_changed",
+    "entity.folder.deleted",
+    "entity.folder.renamed",
+    "entity.folder.parent_changed",
+)
+
+
+async def invalidate_folder_access_lists(
+    project_name: str,
+    events: list[dict[str, Any]] | None = None,
+) -> None:
+    """Invalidate cached folder access lists of the project.
+
+    When events are provided, the cache is invalidated only if any
+    of them may change the access lists.
+    """
+    if events is not None and not any(
+        event["topic"] in FOLDER_ACCESS_TOPICS for event in events
+    ):
+        return
+    try:
+        await Redis.hreplace(
+            FOLDER_ACCESS_LIST_NS,
+            project_name,
+            {"version": create_hash()},
+            ttl=FOLDER_ACCESS_LIST_TTL,
+        )
+    except Exception as e:
+        logger.warning(f"Unable to invalidate folder access lists: {e}")
+
+
 async def parse_permset(
     user: "UserEntity",
     project_name: str,
     access_type: "AccessType",
     permset: "FolderAccessList",
 ) -> list[str] | None:
-    """Convert a permission set to a list of paths"""
+    """Convert a permission set to a list of paths
+
+    Lists depending on task assignments are cached in Redis.
+    """
     if not permset.enabled:
         return None
 
-    # TODO: Enable caching when we figure out how to invalidate it
-    # ns = "folder-access-list"
-    # key = f"{project_name}:{user.name}:{access_type}"
-    # if (cached := await Redis.get_json(ns, key)) is not None:
-    #     return cached
+    if not any(perm.access_type == "assigned" for perm in permset.access_list):
+        # Only path-based permissions. No need to hit the database
+        return await _parse_permset(user, project_name, access_type, permset)
+
+    field = f"{user.name}:{access_type}"
+    fingerprint = hash_data(permset.dict())
+    version: str = ""
+
+    try:
+        res = await Redis.hmget(FOLDER_ACCESS_LIST_NS, project_name, ["version", field])
+    except Exception as e:
+        logger.warning(f"Unable to load cached folder access list: {e}")
+    else:
+        version = res[0].decode("ascii") if res[0] else ""
+        if res[1] is not None:
+            cached = json_loads(res[1])
+            if cached["version"] == version and cached["fingerprint"] == fingerprint:
+                return cached["paths"]
+
+    folder_list = await _parse_permset(user, project_name, access_type, permset)
 
+    logger.trace(
+        f"Caching {user.name} {project_name} {access_type} "
+        f"access list ({len(folder_list)} paths)"
+    )
+    payload = {"version": version, "fingerprint": fingerprint, "paths": folder_list}
+    try:
+        await Redis.hset(
+            FOLDER_ACCESS_LIST_NS,
+            project_name,
+            {field: json_dumps(payload)},
+            ttl=FOLDER_ACCESS_LIST_TTL,
+        )
+    except Exception as e:
+        logger.warning(f"Unable to cache folder access list: {e}")
+    return folder_list
+
+
+async def _parse_permset(
+    user: "UserEntity",
+    project_name: str,
+    access_type: "AccessType",
+    permset: "FolderAccessList",
+) -> list[str]:
     fpaths = set()
     for perm in permset.access_list:
         if perm.access_type == "hierarchy":
@@ -92,13 +189,7 @@ async def parse_permset(
                     include_parents=access_type == "read",
                 ):
                     fpaths.add(path)
-    folder_list = list(fpaths)
-    # logger.trace(
-    #     f"Caching {user.name} {project_name} {access_type} "
-    #     f"access: {', '.join(folder_list)}"
-    # )
-    # await Redis.set_json(ns, key, folder_list)
-    return folder_list
+    return list(fpaths)
 
 
 async def folder_access_list(
@@ -27,7 +27,7 @@ from ayon_server.activities.watchers.watcher_list import get_watcher_list
 from ayon_server.entities.core import ProjectLevelEntity
 from ayon_server.events.eventstream import EventStream
 from ayon_server.exceptions import BadRequestException, NotFoundException
-from ayon_server.helpers.hierarchy_cache import rebuild_hierarchy_cache
+from ayon_server.helpers.hierarchy_cache import refresh_hierarchy_cache_entities
 from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import logger
 from ayon_server.utils import create_uuid
@@ -266,7 +266,9 @@ async def create_activity(
         # Publishing reviewables must invalidate the hierarchy cache
 
         if activity_type == "reviewable":
-            await rebuild_hierarchy_cache(project_name)
+            await refresh_hierarchy_cache_entities(
+                project_name, entity_type, [entity_id]
+            )
 
     # Notify the front-end about the new activity
 
@@ -290,57 +292,58 @@ async def create_activity(
         "body": body,
     }
 
-    with logger.contextualize(activity_id=activity_id, activity_type=activity_type):
-        await EventStream.dispatch(
-            "activity.created",
-            project=project_name,
-            description=f"Created {activity_type} activity",
-            summary=summary,
-            store=activity_type not in DO_NOT_TRACK_ACTIVITIES,
-            user=user_name,
-            sender=sender,
-            sender_type=sender_type,
-            payload=event_payload,
+    events: list[dict[str, Any]] = [
+        {
+            "topic": "activity.created",
+            "project": project_name,
+            "description": f"Created {activity_type} activity",
+            "summary": summary,
+            "store": activity_type not in DO_NOT_TRACK_ACTIVITIES,
+            "user": user_name,
+            "sender": sender,
+            "sender_type": sender_type,
+            "payload": event_payload,
+        }
+    ]
+
+    # Send inbox notifications
+
+    notify_important: list[str] = []
+    notify_normal: list[str] = []
+    for ref in references:
+        if ref.entity_type != "user":
+            continue
+        assert ref.entity_name is not None, "This should have been checked before"
+        if ref.reference_type == "author":
+            continue
+        if (
+            ref.reference_type in ["mention", "watching"]
+            and activity_type != "status.change"
+        ):
+            notify_important.append(ref.entity_name)
+        elif ref.entity_name not in notify_important:
+            notify_normal.append(ref.entity_name)
+
+    notify_description = body.split("\n")[0]
+    for recipients, is_important in (
+        (notify_important, True),
+        (notify_normal, False),
+    ):
+        if not recipients:
+            continue
+        events.append(
+            {
+                "topic": "inbox.message",
+                "project": project_name,
+                "description": notify_description,
+                "summary": {"isImportant": is_important},
+                "recipients": recipients,
+                "store": False,
+                "user": user_name,
+            }
         )
 
-        # Send inbox notifications
-
-        notify_important: list[str] = []
-        notify_normal: list[str] = []
-        for ref in references:
-            if ref.entity_type != "user":
-                continue
-            assert ref.entity_name is not None, "This should have been checked before"
-            if ref.reference_type == "author":
-                continue
-            if (
-                ref.reference_type in ["mention", "watching"]
-                and activity_type != "status.change"
-            ):
-                notify_important.append(ref.entity_name)
-            elif ref.entity_name not in notify_important:
-                notify_normal.append(ref.entity_name)
-
-        notify_description = body.split("\n")[0]
-        if notify_important:
-            await EventStream.dispatch(
-                "inbox.message",
-                project=project_name,
-                description=notify_description,
-                summary={"isImportant": True},
-                recipients=notify_important,
-                store=False,
-                user=user_name,
-            )
-        if notify_normal:
-            await EventStream.dispatch(
-                "inbox.message",
-                project=project_name,
-                description=notify_description,
-                summary={"isImportant": False},
-                recipients=notify_normal,
-                store=False,
-                user=user_name,
-            )
+    with logger.contextualize(activity_id=activity_id, activity_type=activity_type):
+        await EventStream.dispatch_many(events)
 
     return activity_id
@@ -25,7 +25,12 @@ from ayon_server.addons.models import (
     SourceInfo,
     SSOOption,
 )
-from ayon_server.addons.settings_caching import AddonSettingsCache
+from ayon_server.addons.settings_caching import (
+    AddonSettingsCache,
+    get_resolved_settings,
+    resolved_settings_key,
+    set_resolved_settings,
+)
 from ayon_server.exceptions import AyonException, BadRequestException, NotFoundException
 from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import log_traceback, logger
@@ -450,6 +455,43 @@ class BaseServerAddon:
                 return {}
         return data
 
+    # Resolved settings cache
+
+    async def _load_resolved_settings(self, key: str) -> BaseSettingsModel | None:
+        """Return cached settings with the overrides already applied."""
+        if (model := self.get_settings_model()) is None:
+            return None
+        if (cached := await get_resolved_settings(key)) is None:
+            return None
+        try:
+            settings = model(**cached["data"])
+        except Exception:
+            logger.trace(f"Invalid cached {self} settings")
+            return None
+        settings._has_studio_overrides = cached.get("studio")
+        settings._has_project_overrides = cached.get("project")
+        settings._has_site_overrides = cached.get("site")
+        return settings
+
+    async def _store_resolved_settings(
+        self,
+        key: str,
+        settings: BaseSettingsModel,
+    ) -> None:
+        if type(settings) is not self.get_settings_model():
+            # settings are not an instance of the model we are able
+            # to re-create them from (custom get_default_settings)
+            return
+        await set_resolved_settings(
+            key,
+            {
+                "data": settings.dict(),
+                "studio": settings._has_studio_overrides,
+                "project": settings._has_project_overrides,
+                "site": settings._has_site_overrides,
+            },
+        )
+
     # Get settings and apply the overrides
 
     async def get_studio_settings(
@@ -464,26 +506,38 @@ class BaseServerAddon:
         You shouldn't override this method, unless absolutely necessary.
         """
 
-        if as_version and as_version != self.version:
-            try:
-                settings = await self.definition[as_version].get_default_settings()
-            except KeyError:
-                raise NotFoundException(
-                    f"Version {as_version} does not exists"
-                ) from None
-        else:
-            settings = await self.get_default_settings()
-        if settings is None:
-            return None  # this addon has no settings at all
-        overrides = await self.get_studio_overrides(
-            variant=variant,
-            as_version=as_version,
-            settings_cache=settings_cache,
-        )
-        if overrides:
-            settings = apply_overrides(settings, overrides)
-            settings._has_studio_overrides = True
+        cache_key: str | None = None
+        if not as_version or as_version == self.version:
+            cache_key = await resolved_settings_key(self.name, self.version, variant)
+        if cache_key:
+            settings = await self._load_resolved_settings(cache_key)
+            if settings is not None:
+                return settings
+
+        # Resolved settings are stored in the shared cache
+        with Postgres.primary():
+            if as_version and as_version != self.version:
+                try:
+                    settings = await self.definition[as_version].get_default_settings()
+                except KeyError:
+                    raise NotFoundException(
+                        f"Version {as_version} does not exists"
+                    ) from None
+            else:
+                settings = await self.get_default_settings()
+            if settings is None:
+                return None  # this addon has no settings at all
+            overrides = await self.get_studio_overrides(
+                variant=variant,
+                as_version=as_version,
+                settings_cache=settings_cache,
+            )
+            if overrides:
+                settings = apply_overrides(settings, overrides)
+                settings._has_studio_overrides = True
 
+        if cache_key:
+            await self._store_resolved_settings(cache_key, settings)
         return settings
 
     async def get_project_settings(
@@ -499,25 +553,40 @@ class BaseServerAddon:
         You shouldn't override this method, unless absolutely necessary.
         """
 
-        settings = await self.get_studio_settings(
-            variant=variant,
-            as_version=as_version,
-            settings_cache=settings_cache,
-        )
-        if settings is None:
-            return None  # this addon has no settings at all
-        has_studio_overrides = settings._has_studio_overrides
+        cache_key: str | None = None
+        if not as_version or as_version == self.version:
+            cache_key = await resolved_settings_key(
+                self.name, self.version, variant, project_name
+            )
+        if cache_key:
+            settings = await self._load_resolved_settings(cache_key)
+            if settings is not None:
+                return settings
+
+        # Resolved settings are stored in the shared cache
+        with Postgres.primary():
+            settings = await self.get_studio_settings(
+                variant=variant,
+                as_version=as_version,
+                settings_cache=settings_cache,
+            )
+            if settings is None:
+                return None  # this addon has no settings at all
+            has_studio_overrides = settings._has_studio_overrides
+
+            project_overrides = await self.get_project_overrides(
+                project_name,
+                variant=variant,
+                as_version=as_version,
+                settings_cache=settings_cache,
+            )
+            if project_overrides:
+                settings = apply_overrides(settings, project_overrides)
+                settings._has_project_overrides = True
+            settings._has_studio_overrides = has_studio_overrides
 
-        project_overrides = await self.get_project_overrides(
-            project_name,
-            variant=variant,
-            as_version=as_version,
-            settings_cache=settings_cache,
-        )
-        if project_overrides:
-            settings = apply_overrides(settings, project_overrides)
-            settings._has_project_overrides = True
-        settings._has_studio_overrides = has_studio_overrides
+        if cache_key:
+            await self._store_resolved_settings(cache_key, settings)
         return settings
 
     async def get_project_site_settings(
@@ -4,6 +4,7 @@ from typing import Any
 
 from ayon_server.addons.addon import BaseServerAddon
 from ayon_server.addons.definition import ServerAddonDefinition
+from ayon_server.addons.settings_caching import clear_resolved_settings
 from ayon_server.config import ayonconfig
 from ayon_server.exceptions import NotFoundException
 from ayon_server.lib.postgres import Postgres
@@ -19,6 +20,7 @@ class AddonLibrary:
     async def clear_addon_list_cache():
         await Redis.delete_ns("addon-list")
         await Redis.delete_ns("all-settings")
+        await clear_resolved_settings()
 
     @classmethod
     def getinstance(cls) -> "AddonLibrary":
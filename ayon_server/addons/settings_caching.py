@@ -1,12 +1,31 @@
-__all__ = ["AddonSettingsCache", "AddonKey", "SettingsCache"]
+__all__ = [
+    "AddonSettingsCache",
+    "AddonKey",
+    "SettingsCache",
+    "clear_resolved_settings",
+    "get_resolved_settings",
+    "resolved_settings_key",
+    "set_resolved_settings",
+]
 
 import time
 from dataclasses import dataclass
 from typing import Any
 
+from ayon_server.config import ayonconfig
 from ayon_server.exceptions import BadRequestException
 from ayon_server.lib.postgres import Postgres
+from ayon_server.lib.redis import Redis
 from ayon_server.logging import logger
+from ayon_server.utils import create_hash, hash_data
+
+RESOLVED_SETTINGS_NS = "resolved-settings"
+
+# Generation stamp of the resolved settings cache is a part of every
+# cache key. Clearing the cache creates a new stamp, so settings which
+# were being resolved from the old overrides at the same time are stored
+# under a key no one reads anymore (and expire).
+SETTINGS_GENERATION_NS = "settings-generation"
 
 
 @dataclass
@@ -32,75 +51,172 @@ async def load_all_settings(
         raise BadRequestException("User name is required when site ID is provided")
 
     start_time = time.time()
-    hashes = []
+
+    # Addons are matched as (name, version) pairs against an unnested
+    # pair of arrays, so the primary key index of the settings tables
+    # can be used (unlike matching concatenated name-version strings)
+    names: list[str] = []
+    versions: list[str] = []
     for addon_name, addon_version in addons.items():
-        hashes.append(f"{addon_name}-{addon_version}")
+        if addon_version is None:
+            continue
+        names.append(addon_name)
+        versions.append(addon_version)
 
     result: SettingsCache = {}
 
-    # Studio level settings
-
-    query = """
-        SELECT addon_name, addon_version, data
-        FROM public.settings
-        WHERE
-            addon_name || '-' || addon_version = ANY($1)
-        AND variant = $2
-    """
-
-    async for row in Postgres.iterate(query, hashes, variant):
-        key = row["addon_name"], row["addon_version"]
-        result[key] = AddonSettingsCache(studio=row["data"])
+    # Settings resolved from the result are stored in the shared cache
+    with Postgres.primary():
+        # Studio level settings
 
-    if site_id and user_name:
         query = """
             SELECT addon_name, addon_version, data
-            FROM public.site_settings
-            WHERE
-                addon_name || '-' || addon_version = ANY($1)
-            AND site_id = $2
-            AND user_name = $3
-        """
-        async for row in Postgres.iterate(query, hashes, site_id, user_name):
-            key = row["addon_name"], row["addon_version"]
-            if key not in result:
-                result[key] = AddonSettingsCache()
-            result[key].site = row["data"]
-
-    # Project level settings
-
-    if project_name:
-        query = f"""
-            SELECT addon_name, addon_version, data
-            FROM project_{project_name}.settings
+            FROM public.settings
             WHERE
-                addon_name || '-' || addon_version = ANY($1)
-            AND variant = $2
+                (addon_name, addon_version) IN (
+                    SELECT * FROM UNNEST($1::text[], $2::text[])
+                )
+            AND variant = $3
         """
 
-        async for row in Postgres.iterate(query, hashes, variant):
+        async for row in Postgres.iterate(query, names, versions, variant):
             key = row["addon_name"], row["addon_version"]
-            if key not in result:
-                result[key] = AddonSettingsCache()
-            result[key].project = row["data"]
+            result[key] = AddonSettingsCache(studio=row["data"])
 
-        # Project site level settings
+        if site_id and user_name:
+            query = """
+                SELECT addon_name, addon_version, data
+                FROM public.site_settings
+                WHERE
+                    (addon_name, addon_version) IN (
+                        SELECT * FROM UNNEST($1::text[], $2::text[])
+                    )
+                AND site_id = $3
+                AND user_name = $4
+            """
+            async for row in Postgres.iterate(
+                query, names, versions, site_id, user_name
+            ):
+                key = row["addon_name"], row["addon_version"]
+                if key not in result:
+                    result[key] = AddonSettingsCache()
+                result[key].site = row["data"]
 
-        if site_id and user_name and project_name:
+        # Project level settings
+
+        if project_name:
             query = f"""
                 SELECT addon_name, addon_version, data
-                FROM project_{project_name}.project_site_settings
+                FROM project_{project_name}.settings
                 WHERE
-                    addon_name || '-' || addon_version = ANY($1)
-                AND site_id = $2
-                AND user_name = $3
+                    (addon_name, addon_version) IN (
+                        SELECT * FROM UNNEST($1::text[], $2::text[])
+                    )
+                AND variant = $3
             """
-            async for row in Postgres.iterate(query, hashes, site_id, user_name):
+
+            async for row in Postgres.iterate(query, names, versions, variant):
                 key = row["addon_name"], row["addon_version"]
                 if key not in result:
                     result[key] = AddonSettingsCache()
-                result[key].project_site = row["data"]
+                result[key].project = row["data"]
+
+            # Project site level settings
+
+            if site_id and user_name and project_name:
+                query = f"""
+                    SELECT addon_name, addon_version, data
+                    FROM project_{project_name}.project_site_settings
+                    WHERE
+                        (addon_name, addon_version) IN (
+                            SELECT * FROM UNNEST($1::text[], $2::text[])
+                        )
+                    AND site_id = $3
+                    AND user_name = $4
+                """
+                async for row in Postgres.iterate(
+                    query, names, versions, site_id, user_name
+                ):
+                    key = row["addon_name"], row["addon_version"]
+                    if key not in result:
+                        result[key] = AddonSettingsCache()
+                    result[key].project_site = row["data"]
 
     logger.trace(f"Settings cache loaded in {time.time() - start_time:.2f} seconds")
 
     return result
+
+
+#
+# Resolved settings
+#
+
+
+async def _get_settings_generation() -> str:
+    generation = await Redis.get(SETTINGS_GENERATION_NS, "resolved")
+    if generation is None:
+        generation = create_hash()
+        await Redis.set(SETTINGS_GENERATION_NS, "resolved", generation)
+        return generation
+    return generation.decode("ascii")
+
+
+async def resolved_settings_key(
+    addon_name: str,
+    addon_version: str,
+    variant: str,
+    project_name: str | None = None,
+) -> str | None:
+    """Return a cache key of addon settings resolved for the given scope.
+
+    Site overrides are not cached: they are applied on top
+    of the cached project settings, so the entries are shared
+    by all users and sites.
+
+    The key must be created before the settings are loaded, so the result
+    is not cached if the cache was cleared in the meantime.
+    Returns None if the settings should not be cached.
+    """
+    if not ayonconfig.settings_cache_ttl:
+        return None
+    try:
+        generation = await _get_settings_generation()
+    except Exception as e:
+        logger.trace(f"Unable to load settings cache generation: {e}")
+        return None
+    return hash_data((addon_name, addon_version, variant, project_name, generation))
+
+
+async def get_resolved_settings(key: str) -> dict[str, Any] | None:
+    """Return cached resolved settings (defaults with all overrides applied)"""
+    if not ayonconfig.settings_cache_ttl:
+        return None
+    try:
+        return await Redis.get_json(RESOLVED_SETTINGS_NS, key)
+    except Exception as e:
+        logger.trace(f"Unable to load cached settings: {e}")
+        return None
+
+
+async def set_resolved_settings(key: str, data: dict[str, Any]) -> None:
+    if not ayonconfig.settings_cache_ttl:
+        return
+    try:
+        await Redis.set_json(
+            RESOLVED_SETTINGS_NS,
+            key,
+            data,
+            ttl=ayonconfig.settings_cache_ttl,
+        )
+    except Exception as e:
+        logger.trace(f"Unable to cache resolved settings: {e}")
+
+
+async def clear_resolved_settings() -> None:
+    """Drop all cached resolved settings.
+
+    Call this every time addon settings overrides are written
+    to the database without dispatching a settings.changed event.
+    """
+    await Redis.set(SETTINGS_GENERATION_NS, "resolved", create_hash())
+    await Redis.delete_ns(RESOLVED_SETTINGS_NS)
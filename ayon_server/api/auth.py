@@ -5,6 +5,7 @@ from starlette.requests import Request
 
 from ayon_server.auth.session import Session
 from ayon_server.auth.utils import hash_password
+from ayon_server.background.session_sync import session_sync
 from ayon_server.entities import UserEntity
 from ayon_server.exceptions import UnauthorizedException
 from ayon_server.lib.postgres import Postgres
@@ -123,7 +124,7 @@ async def user_from_request(request: Request) -> UserEntity:
         logger.trace(f"Unauthorized request: {reason}")
         raise UnauthorizedException(reason)
 
-    await Redis.incr("user-requests", session_data.user.name)
+    session_sync.count_request(session_data.user.name)
     user = UserEntity.from_record(session_data.user.dict())
     user.add_session(session_data)
 
@@ -147,7 +148,13 @@ class AuthMiddleware(BaseHTTPMiddleware):
             request.state.user = None
             request.state.unauthorized_reason = str(e)
 
-        with logger.contextualize(**context):
+        # Reads of the user are routed to the primary database
+        # for a while after their writes (if read replicas are used)
+        # and database connection hold times are recorded per route
+        with (
+            logger.contextualize(**context),
+            Postgres.session(context.get("user"), request.scope),
+        ):
             response = await call_next(request)
 
         return response
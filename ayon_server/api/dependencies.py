@@ -15,7 +15,7 @@ from ayon_server.exceptions import (
     UnauthorizedException,
     UnsupportedMediaException,
 )
-from ayon_server.helpers.project_list import build_project_list, get_project_list
+from ayon_server.helpers.project_list import build_project_list, project_index
 from ayon_server.logging import logger
 from ayon_server.types import (
     ATTRIBUTE_NAME_REGEX,
@@ -226,11 +226,8 @@ async def dep_project_name(
 
     await current_user.ensure_project_access(project_name)
 
-    project_list = await get_project_list()
-
-    for pn in project_list:
-        if project_name.lower() == pn.name.lower():
-            return pn.name
+    if (project := await project_index.get(project_name)) is not None:
+        return project.name
 
     # try again
     project_list = await build_project_list()
@@ -1,10 +1,17 @@
+import contextlib
 import os
+from email.utils import parsedate
+from urllib.parse import quote
 
 import aiofiles
 from fastapi import Request, Response
 from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
 from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
 
+from ayon_server.config import ayonconfig
 from ayon_server.exceptions import AyonException, BadRequestException, NotFoundException
 from ayon_server.helpers.mimetypes import guess_mime_type
 from ayon_server.helpers.statistics import update_traffic_stats
@@ -50,6 +57,92 @@ async def handle_upload(request: Request, target_path: str) -> int:
     return i
 
 
+class LocalFileResponse(FileResponse):
+    """Response serving a file from the local file system.
+
+    Starlette's FileResponse handles single and multiple byte ranges,
+    If-Range and ETag/Last-Modified headers and uses the zero-copy
+    `http.response.pathsend` ASGI extension for whole files
+    when the server supports it (granian).
+
+    On top of that, conditional requests (If-None-Match,
+    If-Modified-Since) are answered with 304 Not Modified,
+    and when `ayonconfig.files_accel_redirect` is set, files inside
+    `ayonconfig.files_accel_redirect_root` are handed over to the
+    fronting proxy (X-Accel-Redirect / X-Sendfile) instead of being
+    streamed by the server.
+    """
+
+    chunk_size = 1024 * 1024
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            # Missing file is handled by FileResponse
+            with contextlib.suppress(FileNotFoundError):
+                self.stat_result = await run_in_threadpool(os.stat, self.path)
+                self.set_stat_headers(self.stat_result)
+
+        if self.stat_result is not None:
+            request_headers = Headers(scope=scope)
+            if self.is_not_modified(request_headers):
+                headers = {
+                    k: self.headers[k]
+                    for k in ("etag", "last-modified", "cache-control")
+                    if k in self.headers
+                }
+                await Response(status_code=304, headers=headers)(scope, receive, send)
+                return
+
+            if redirect := get_accel_redirect(str(self.path)):
+                header, value = redirect
+                headers = {
+                    k: v for k, v in self.headers.items() if k != "content-length"
+                }
+                headers[header] = value
+                response = Response(status_code=self.status_code, headers=headers)
+                await response(scope, receive, send)
+                if self.background is not None:
+                    await self.background()
+                return
+
+        await super().__call__(scope, receive, send)
+
+    def is_not_modified(self, request_headers: Headers) -> bool:
+        if if_none_match := request_headers.get("if-none-match"):
+            return etag_matches(if_none_match, self.headers.get("etag"))
+
+        if if_modified_since := request_headers.get("if-modified-since"):
+            last_modified = self.headers.get("last-modified")
+            if last_modified is None:
+                return False
+            since = parsedate(if_modified_since)
+            modified = parsedate(last_modified)
+            return since is not None and modified is not None and modified <= since
+        return False
+
+
+def etag_matches(if_none_match: str, etag: str | None) -> bool:
+    """Return True if the If-None-Match header value matches the ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag is not None and etag in tags
+
+
+def get_accel_redirect(path: str) -> tuple[str, str] | None:
+    """Return a header offloading the file to the fronting proxy (if enabled)"""
+    if not ayonconfig.files_accel_redirect:
+        return None
+    root = os.path.join(os.path.abspath(ayonconfig.files_accel_redirect_root), "")
+    path = os.path.abspath(path)
+    if not path.startswith(root):
+        return None
+    if ayonconfig.files_accel_redirect == "x-sendfile":
+        return "x-sendfile", path
+    prefix = ayonconfig.files_accel_redirect_prefix.rstrip("/")
+    return "x-accel-redirect", quote(f"{prefix}/{path.removeprefix(root)}")
+
+
 async def handle_download(
     path: str,
     media_type: str = "application/octet-stream",
@@ -62,7 +155,7 @@ async def handle_download(
     if not os.path.isfile(path):
         raise NotFoundException(f"No such file {filename}")
 
-    return FileResponse(
+    return LocalFileResponse(
         path,
         media_type=media_type,
         filename=filename,
@@ -31,10 +31,13 @@ maintenance_scheduler = MaintenanceScheduler()
 async def load_access_groups() -> None:
     """Load access groups from the database."""
     from ayon_server.access.access_groups import AccessGroups
+    from ayon_server.auth.session import Session
 
     await AccessGroups.load()
     EventStream.subscribe("access_group.updated", AccessGroups.update_hook, True)
     EventStream.subscribe("access_group.deleted", AccessGroups.update_hook, True)
+    EventStream.subscribe("access_group.updated", Session.access_group_hook, True)
+    EventStream.subscribe("access_group.deleted", Session.access_group_hook, True)
 
 
 def init_addon_endpoints(target_app: "FastAPI") -> None:
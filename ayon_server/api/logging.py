@@ -15,6 +15,7 @@ from ayon_server.lib.postgres_exceptions import (
     IntegrityConstraintViolationError,
     parse_postgres_exception,
 )
+from ayon_server.lib.runtime_metrics import http_request_duration, http_requests
 from ayon_server.logging import log_exception, logger
 
 
@@ -149,12 +150,21 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             # except ExceptionGroup as eg:
             #     response = handle_exception_group(eg)
 
+            # Runtime metrics use the route template (not the path)
+            # to keep the number of series bounded
+            process_time = time.perf_counter() - start_time
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            status = str(response.status_code)
+            http_requests.inc(request.method, route_path, status)
+            http_request_duration.observe(process_time, request.method, route_path)
+
             # Before processing the request, we don't have access to
             # the route information, so we need to check it here
             # (that's also why we don't track the beginning of the request)
             should_trace = path.startswith("/api")  # or path.startswith("/graphql")
 
-            if should_trace and (route := request.scope.get("route")):
+            if should_trace and route:
                 # We don't need to log successful requests to routes,
                 # that have "NoTraces" dependencies.
                 # They are usually heartbeats that pollute the logs.
@@ -170,8 +180,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 if request.state.user:
                     extras["user"] = request.state.user.name
 
-                process_time = round(time.perf_counter() - start_time, 3)
-                f_result = f"| {response.status_code} in {process_time}s"
+                f_result = f"| {response.status_code} in {round(process_time, 3)}s"
                 with logger.contextualize(**extras):
                     logger.trace(f"[{request.method}] {path} {f_result}")
 
@@ -1,5 +1,5 @@
 import asyncio
-import copy
+import collections
 import time
 import uuid
 from contextlib import suppress
@@ -14,7 +14,10 @@ from ayon_server.config import ayonconfig
 from ayon_server.entities import UserEntity
 from ayon_server.events import EventStream, HandlerType
 from ayon_server.exceptions import UnauthorizedException
+from ayon_server.helpers.project_cache import project_cache
+from ayon_server.helpers.project_list import project_index
 from ayon_server.lib.redis import Redis
+from ayon_server.lib.runtime_metrics import websocket_fanout_duration
 from ayon_server.logging import log_traceback, logger
 from ayon_server.utils import get_nickname, json_dumps, json_loads, obscure
 
@@ -46,11 +49,26 @@ async def handle_subscribers(message: dict[str, Any]) -> None:
     asyncio.create_task(_handle_subscribers_task(event_id, list(handlers)))
 
 
+class QueuedMessage:
+    """Serialized message waiting in the client queue.
+
+    Messages with a key may be replaced by a newer message
+    with the same key while they are still waiting.
+    """
+
+    __slots__ = ("key", "payload")
+
+    def __init__(self, key: str | None, payload: str):
+        self.key = key
+        self.payload = payload
+
+
 class Client:
     id: str
     sock: WebSocket
     topics: list[str] = []
     disconnected: bool = False
+    evicted: bool = False
     authorized: bool = False
     created_at: float
     project_name: str | None = None
@@ -60,6 +78,15 @@ class Client:
         self.id = str(uuid.uuid1())
         self.sock: WebSocket = sock
         self.created_at = time.time()
+        self.queue: collections.deque[QueuedMessage] = collections.deque()
+        self._keyed: dict[str, QueuedMessage] = {}
+        self._queue_event = asyncio.Event()
+        self._writer: asyncio.Task[None] | None = None
+        self._full_since: float | None = None
+
+        # Counters
+        self.dropped: int = 0  # messages dropped because the queue was full
+        self.coalesced: int = 0  # messages replaced by a newer one
 
     @property
     def user_name(self) -> str | None:
@@ -74,6 +101,13 @@ class Client:
             return True
         return self.user.data.get("isGuest", False)
 
+    def can_access_project(self, project_name: str) -> bool:
+        if self.user is None:
+            return False
+        if self.user.is_manager:
+            return True
+        return project_name in self.user.data.get("accessGroups", {})
+
     async def authorize(
         self,
         access_token: str,
@@ -93,13 +127,72 @@ class Client:
             return True
         return False
 
+    #
+    # Sending
+    #
+
     async def send(self, message: dict[str, Any], auth_only: bool = True):
         if (not self.authorized) and auth_only:
             return None
+        self.enqueue(json_dumps(message))
+
+    def enqueue(self, payload: str, key: str | None = None) -> None:
+        """Queue a serialized message to be sent by the writer task.
+
+        Never blocks, so a slow client cannot stall the broadcast.
+        If a message with the same key is still waiting in the queue,
+        its payload is replaced, so the client receives only the latest
+        one. When the queue is full, a message is dropped according
+        to the websocket_drop_policy setting.
+        """
         if not self.is_valid:
-            return None
+            return
+
+        if key is not None and (queued := self._keyed.get(key)) is not None:
+            queued.payload = payload
+            self.coalesced += 1
+            return
+
+        if len(self.queue) >= ayonconfig.websocket_queue_size:
+            self.dropped += 1
+            if self._full_since is None:
+                self._full_since = time.monotonic()
+            if ayonconfig.websocket_drop_policy == "newest":
+                return
+            self._forget(self.queue.popleft())
+
+        queued = QueuedMessage(key, payload)
+        self.queue.append(queued)
+        if key is not None:
+            self._keyed[key] = queued
+
+        self._queue_event.set()
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def _forget(self, queued: QueuedMessage) -> None:
+        if queued.key is not None and self._keyed.get(queued.key) is queued:
+            del self._keyed[queued.key]
+
+    def _take(self) -> str:
+        queued = self.queue.popleft()
+        self._forget(queued)
+        if not self.queue:
+            # client caught up
+            self._full_since = None
+        return queued.payload
+
+    async def _write_loop(self) -> None:
+        while self.is_valid:
+            if not self.queue:
+                self._queue_event.clear()
+                await self._queue_event.wait()
+                continue
+            await self._send_text(self._take())
+
+    async def _send_text(self, payload: str) -> None:
         try:
-            await self.sock.send_text(json_dumps(message))
+            await self.sock.send_text(payload)
         except WebSocketDisconnect:
             logger.warning("[WS] Client disconnected")
             self.disconnected = True
@@ -109,6 +202,22 @@ class Client:
         except Exception:
             log_traceback("[WS] Error sending message")
 
+    @property
+    def is_slow(self) -> bool:
+        """Queue overflowed and the client did not catch up in time"""
+        timeout = ayonconfig.websocket_eviction_timeout
+        if not timeout or self._full_since is None:
+            return False
+        return time.monotonic() - self._full_since > timeout
+
+    def stop(self) -> None:
+        """Stop the writer task and discard pending messages"""
+        self.queue.clear()
+        self._keyed.clear()
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+
     async def receive(self):
         data = await self.sock.receive_text()
         try:
@@ -124,16 +233,158 @@ class Client:
 
     @property
     def is_valid(self) -> bool:
-        if self.disconnected:
+        if self.disconnected or self.evicted:
             return False
         if not self.authorized and (time.time() - self.created_at > 3):
             return False
         return True
 
 
+class SubscriptionIndex:
+    """Index of authorized clients used to route messages.
+
+    - topics: prefix trie of subscribed topics. Every node holds
+      ids of the clients subscribed to the prefix ending in the node,
+      so walking the trie along the message topic yields all clients
+      whose subscription is a prefix of the topic.
+    - wildcard: clients subscribed to all topics
+    - projects: clients by the project they are restricted to
+      (None key holds clients receiving messages of all projects)
+    - recipients: clients by user name (for targeted messages)
+
+    Project access rights are checked only for the clients
+    that passed all the filters above.
+    """
+
+    def __init__(self) -> None:
+        self.topics: dict[str | None, Any] = {}
+        self.wildcard: set[str] = set()
+        self.projects: dict[str | None, set[str]] = {}
+        self.recipients: dict[str, set[str]] = {}
+        # client_id: (client, indexed topics, project name, user name)
+        self._entries: dict[str, tuple[Client, list[str], str | None, str | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, client: Client) -> None:
+        self.remove(client.id)
+        topics = list(client.topics)
+        project_name = client.project_name
+        user_name = client.user_name
+        self._entries[client.id] = (client, topics, project_name, user_name)
+
+        for topic in topics:
+            if topic == "*":
+                self.wildcard.add(client.id)
+                continue
+            node = self.topics
+            for char in topic:
+                node = node.setdefault(char, {})
+            node.setdefault(None, set()).add(client.id)
+
+        self.projects.setdefault(project_name, set()).add(client.id)
+        if user_name is not None:
+            self.recipients.setdefault(user_name, set()).add(client.id)
+
+    def remove(self, client_id: str) -> None:
+        entry = self._entries.pop(client_id, None)
+        if entry is None:
+            return
+        _, topics, project_name, user_name = entry
+
+        self.wildcard.discard(client_id)
+        for topic in topics:
+            if topic != "*":
+                self._remove_topic(topic, client_id)
+
+        if project_name in self.projects:
+            self.projects[project_name].discard(client_id)
+            if not self.projects[project_name]:
+                del self.projects[project_name]
+
+        if user_name is not None and user_name in self.recipients:
+            self.recipients[user_name].discard(client_id)
+            if not self.recipients[user_name]:
+                del self.recipients[user_name]
+
+    def _remove_topic(self, topic: str, client_id: str) -> None:
+        path: list[tuple[dict[str | None, Any], str]] = []
+        node = self.topics
+        for char in topic:
+            if (child := node.get(char)) is None:
+                return
+            path.append((node, char))
+            node = child
+
+        ids = node.get(None)
+        if ids is None:
+            return
+        ids.discard(client_id)
+        if ids:
+            return
+        del node[None]
+
+        # prune empty branches
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+
+    def match(self, message: dict[str, Any]) -> list[Client]:
+        """Return clients the message should be delivered to.
+
+        Applies topic, recipient and project filters.
+        """
+        topic = message.get("topic") or ""
+        result = set(self.wildcard)
+        node = self.topics
+        for char in topic:
+            if (ids := node.get(None)) is not None:
+                result.update(ids)
+            if (next_node := node.get(char)) is None:
+                break
+            node = next_node
+        else:
+            if (ids := node.get(None)) is not None:
+                result.update(ids)
+
+        if not result:
+            return []
+
+        recipients = message.get("recipients", None)
+        if isinstance(recipients, list):
+            targeted: set[str] = set()
+            for user_name in recipients:
+                targeted.update(self.recipients.get(user_name, ()))
+            result &= targeted
+
+        project_name = message.get("project", None)
+        if project_name and topic != "inbox.message":
+            # skip clients restricted to other projects
+            result &= self.projects.get(None, set()) | self.projects.get(
+                project_name, set()
+            )
+
+        clients: list[Client] = []
+        for client_id in result:
+            client = self._entries[client_id][0]
+            if project_name and not client.can_access_project(project_name):
+                continue
+            clients.append(client)
+        return clients
+
+
 class Messaging(BackgroundWorker):
     def initialize(self):
         self.clients: dict[str, Client] = {}
+        self.index = SubscriptionIndex()
+        self.last_purge = time.time()
+
+        # Counters of the clients that already left
+        self.dropped: int = 0
+        self.coalesced: int = 0
+        self.evicted: int = 0
 
     async def join(self, websocket: WebSocket):
         if not self.is_running:
@@ -144,17 +395,102 @@ class Messaging(BackgroundWorker):
         self.clients[client.id] = client
         return client
 
+    async def authorize(
+        self,
+        client: Client,
+        access_token: str,
+        topics: list[str],
+        project: str | None = None,
+    ) -> bool:
+        """Authorize the client and subscribe it to the given topics"""
+        if not await client.authorize(access_token, topics=topics, project=project):
+            return False
+        self.index.add(client)
+        return True
+
+    def leave(self, client_id: str) -> None:
+        """Remove the client from the list of connected clients"""
+        self.index.remove(client_id)
+        if (client := self.clients.pop(client_id, None)) is not None:
+            self.dropped += client.dropped
+            self.coalesced += client.coalesced
+            client.stop()
+
     async def purge(self):
         to_rm = []
         for client_id, client in list(self.clients.items()):
+            if client.is_slow and not client.evicted:
+                logger.warning(
+                    f"[WS] Disconnecting slow client {client.user_name} "
+                    f"({len(client.queue)} messages pending)"
+                )
+                client.evicted = True
+                self.evicted += 1
+
             if not client.is_valid:
                 if not client.disconnected:
+                    # 1013: try again later
+                    code = 1013 if client.evicted else 1000
                     with suppress(RuntimeError):
-                        await client.sock.close(code=1000)
+                        await client.sock.close(code=code)
                 to_rm.append(client_id)
         for client_id in to_rm:
-            with suppress(KeyError):
-                del self.clients[client_id]
+            self.leave(client_id)
+
+    def stats(self) -> dict[str, int]:
+        """Return the websocket queue metrics"""
+        depths = [len(client.queue) for client in self.clients.values()]
+        return {
+            "clients": len(self.clients),
+            "queue_depth": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            "dropped": self.dropped
+            + sum(client.dropped for client in self.clients.values()),
+            "coalesced": self.coalesced
+            + sum(client.coalesced for client in self.clients.values()),
+            "evicted": self.evicted,
+        }
+
+    def broadcast(self, message: dict[str, Any]) -> None:
+        """Queue the message for all subscribed clients.
+
+        The message is serialized once per audience variant:
+        the regular one, and (if needed) the one for guest users,
+        that contains obscured user names and log messages.
+        """
+        clients = self.index.match(message)
+        if not clients:
+            return
+
+        regular_payload: str | None = None
+        guest_payload: str | None = None
+
+        # Progress updates of the same event waiting in a client queue
+        # are replaced by the latest one
+        key: str | None = None
+        if (
+            ayonconfig.websocket_coalesce_progress
+            and message.get("status") == "in_progress"
+            and message.get("id")
+        ):
+            key = message["id"]
+
+        for client in clients:
+            if client.is_guest and message.get("user") != client.user_name:
+                if guest_payload is None:
+                    m = message.copy()
+                    if m.get("user"):
+                        m["user"] = get_nickname(m["user"])
+                    if message["topic"].startswith("log"):
+                        m["description"] = obscure(m["description"])
+                    guest_payload = json_dumps(m)
+                client.enqueue(guest_payload, key)
+            else:
+                if regular_payload is None:
+                    m = message.copy()
+                    m.pop("recipients", None)
+                    regular_payload = json_dumps(m)
+                client.enqueue(regular_payload, key)
 
     async def run(self) -> None:
         self.pubsub = await Redis.pubsub()
@@ -178,48 +514,23 @@ class Messaging(BackgroundWorker):
                     message = json_loads(raw_message["data"])
 
                 await handle_subscribers(message)
-
-                # TODO: much much smarter logic here
-                for _client_id, client in self.clients.items():
-                    project_name = message.get("project", None)
-                    if (
-                        client.project_name is not None
-                        and message.get("topic") != "inbox.message"
-                    ):
-                        if project_name and project_name != client.project_name:
-                            continue
-
-                    if project_name and client.user and (not client.user.is_manager):
-                        access_groups = client.user.data.get("accessGroups", {})
-                        if project_name not in access_groups:
-                            continue
-
-                    recipients = message.get("recipients", None)
-                    if isinstance(recipients, list):
-                        if client.user_name not in recipients:
-                            continue
-
-                    for topic in client.topics:
-                        if topic == "*" or message["topic"].startswith(topic):
-                            if (
-                                client.is_guest
-                                and message.get("user") != client.user_name
-                            ):
-                                m = copy.deepcopy(message)
-                                if m.get("user"):
-                                    m["user"] = get_nickname(m["user"])
-                                if message["topic"].startswith("log"):
-                                    m["description"] = obscure(m["description"])
-                                await client.send(m)
-                            else:
-                                m = copy.deepcopy(message)
-                                m.pop("recipients", None)
-                                await client.send(m)
+                start = time.perf_counter()
+                self.broadcast(message)
+                websocket_fanout_duration.observe(time.perf_counter() - start)
 
                 if message["topic"] == "server.restart_requested":
                     restart_server()
 
-                await self.purge()
+                if message["topic"] == "server.project_changed":
+                    project_cache.drop(message.get("project"))
+
+                if message["topic"] == "server.project_list_changed":
+                    if message.get("version") != project_index.version:
+                        project_index.invalidate()
+
+                if time.time() - self.last_purge > 1:
+                    self.last_purge = time.time()
+                    await self.purge()
 
             except Exception:
                 log_traceback("Unhandled exception in messaging loop", nodb=True)
@@ -212,16 +212,14 @@ async def ws_endpoint(websocket: WebSocket) -> None:
                 message["topic"] == "auth"
                 and (token := message.get("token")) is not None
             ):
-                await client.authorize(
+                await messaging.authorize(
+                    client,
                     token,
                     topics=message.get("subscribe", []),
                     project=message.get("project"),
                 )
     except (RuntimeError, WebSocketDisconnect):
-        try:
-            del messaging.clients[client.id]
-        except KeyError:
-            pass
+        messaging.leave(client.id)
 
 
 #
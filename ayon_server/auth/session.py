@@ -1,6 +1,7 @@
 __all__ = ["Session"]
 
 import asyncio
+import collections
 import time
 from collections.abc import AsyncGenerator
 from typing import Any
@@ -48,11 +49,95 @@ def is_local_ip(ip: str) -> bool:
 class Session:
     ns = "session"
 
+    # Sessions are cached in the server process for a short time
+    # (ayonconfig.session_cache_ttl) to avoid loading and parsing
+    # them from Redis on every request. Changes of sessions are
+    # announced using `invalidation_channel`, so other processes
+    # can drop their cached copies.
+
+    invalidation_channel = f"{ayonconfig.redis_channel}-session"
+    cache_size = 10000
+
+    # token: (cached at (monotonic time), session)
+    _cache: collections.OrderedDict[str, tuple[float, SessionModel]] = (
+        collections.OrderedDict()
+    )
+    # incremented on every invalidation, so sessions loaded
+    # before the invalidation are not cached
+    _cache_generation: int = 0
+
     @classmethod
     def is_expired(cls, session: SessionModel) -> bool:
         ttl = 600 if session.is_service else ayonconfig.session_ttl
         return time.time() - session.last_used > ttl
 
+    #
+    # Cache
+    #
+
+    @classmethod
+    def _cache_get(cls, token: str) -> SessionModel | None:
+        if (cached := cls._cache.get(token)) is None:
+            return None
+        cached_at, session = cached
+        if time.monotonic() - cached_at > ayonconfig.session_cache_ttl:
+            cls._cache.pop(token, None)
+            return None
+        return session
+
+    @classmethod
+    def _cache_put(cls, token: str, session: SessionModel) -> None:
+        if not ayonconfig.session_cache_ttl:
+            return
+        cls._cache[token] = (time.monotonic(), session)
+        cls._cache.move_to_end(token)
+        while len(cls._cache) > cls.cache_size:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    def drop_cached(
+        cls,
+        token: str | None = None,
+        user_name: str | None = None,
+    ) -> None:
+        """Drop sessions cached in this process.
+
+        Drops the session of the given token, all sessions of the given
+        user, or all cached sessions if neither is specified.
+        """
+        cls._cache_generation += 1
+        if token is not None:
+            cls._cache.pop(token, None)
+        elif user_name is not None:
+            for key, (_, session) in list(cls._cache.items()):
+                if session.user.name == user_name:
+                    cls._cache.pop(key, None)
+        else:
+            cls._cache.clear()
+
+    @classmethod
+    async def invalidate(
+        cls,
+        token: str | None = None,
+        user_name: str | None = None,
+    ) -> None:
+        """Drop cached sessions in all server processes"""
+        cls.drop_cached(token=token, user_name=user_name)
+        message = {"token": token, "user": user_name}
+        try:
+            await Redis.publish(json_dumps(message), channel=cls.invalidation_channel)
+        except Exception as e:
+            logger.warning(f"Unable to publish session invalidation: {e}")
+
+    @classmethod
+    async def access_group_hook(cls, *args) -> None:
+        """Drop all cached sessions when access groups change"""
+        cls.drop_cached()
+
+    #
+    # Session management
+    #
+
     @classmethod
     async def check(cls, token: str, request: Request | None) -> SessionModel | None:
         """Return a session corresponding to a given access token.
@@ -62,11 +147,16 @@ class Session:
         If it's not expired, update the last_used field and extend
         its lifetime.
         """
-        data = await Redis.get(cls.ns, token)
-        if not data:
-            return None
-
-        session = SessionModel(**json_loads(data))
+        generation = cls._cache_generation
+        if (cached := cls._cache_get(token)) is not None:
+            session = cached.copy()
+            changed = False
+        else:
+            data = await Redis.get(cls.ns, token)
+            if not data:
+                return None
+            session = SessionModel(**json_loads(data))
+            changed = True  # not cached yet
 
         if cls.is_expired(session):
             await cls.delete(token, "Session expired")
@@ -80,6 +170,7 @@ class Session:
                 session.client_info = get_client_info(request)
                 session.last_used = time.time()
                 await Redis.set(cls.ns, token, session.json())
+                changed = True
             elif not ayonconfig.disable_check_session_ip:
                 real_ip = get_real_ip(request)
                 if not is_local_ip(real_ip):
@@ -97,6 +188,10 @@ class Session:
                 session.last_used = time.time()
                 await Redis.set(cls.ns, token, json_dumps(session.dict()))
                 await cls.on_extend(session)
+                changed = True
+
+        if changed and generation == cls._cache_generation:
+            cls._cache_put(token, session.copy())
 
         return session
 
@@ -169,6 +264,7 @@ class Session:
             session.client_info = client_info
         session.last_used = time.time()
         await Redis.set(cls.ns, token, session.json())
+        await cls.invalidate(token)
 
     @classmethod
     async def delete(cls, token: str, message: str = "User logged out") -> None:
@@ -183,6 +279,7 @@ class Session:
                     user=session.user.name,
                 )
         await Redis.delete(cls.ns, token)
+        await cls.invalidate(token)
 
     @classmethod
     async def list(
@@ -244,6 +341,8 @@ class Session:
             await Redis.delete(cls.ns, token)
             logged_out = True
 
+        await cls.invalidate(user_name=user_name)
+
         if logged_out:
             message = message or f"User {user_name} logged out from all sessions"
             await EventStream.dispatch(
@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+from ayon_server.background.background_worker import BackgroundWorker
+from ayon_server.lib.runtime_metrics import event_loop_lag
+
+INTERVAL = 1.0
+
+
+class EventLoopMonitor(BackgroundWorker):
+    """Measure how late the event loop wakes up a sleeping task.
+
+    The delay is the time other tasks (background workers,
+    request handlers) block the loop, so it is also the lag
+    of the background workers scheduled in this process.
+    """
+
+    async def run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(INTERVAL)
+            lag = time.perf_counter() - start - INTERVAL
+            event_loop_lag.observe(max(0.0, lag))
+
+
+event_loop_monitor = EventLoopMonitor()
@@ -1,5 +1,5 @@
 import asyncio
-import queue
+import collections
 import time
 from typing import Any
 
@@ -14,11 +14,27 @@ class LogCollector(BackgroundWorker):
 
     It is started as a background worker and runs in the background
     so it does not block the main loop.
+
+    Messages are stored in batches: the worker sleeps until a message
+    arrives, then it drains the queue and stores everything waiting
+    using a single EventStream.dispatch_many call.
     """
 
     def initialize(self):
-        self.queue: queue.Queue[dict[str, Any]] = queue.Queue()
+        # deque append/popleft are thread safe, so the handler
+        # may be called from any thread
+        self.queue: collections.deque[dict[str, Any]] = collections.deque()
         self.start_time = time.time()
+
+        # Counters
+        self.queued: int = 0  # messages accepted to the queue
+        self.written: int = 0  # messages stored in the event stream
+        self.dropped: int = 0  # messages lost (queue full or write failed)
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._reported_dropped: int = 0
+
         logger.add(self, level=ayonconfig.log_level_db)
 
     def __call__(self, message):
@@ -26,7 +42,12 @@ class LogCollector(BackgroundWorker):
         # collector is not running to catch the messages
         # that are logged during the startup.
         record = message.record
-        if len(self.queue.queue) > 1000:
+        if record["extra"].get("nodb", False):
+            # Used by the API middleware to avoid writing to the database
+            return
+
+        if len(self.queue) >= ayonconfig.log_collector_queue_size:
+            self.dropped += 1
             return
 
         topic = f"log.{record['level'].name.lower()}"
@@ -39,10 +60,7 @@ class LogCollector(BackgroundWorker):
         user = extra.pop("user", None)
         project = record.pop("project", None)
 
-        if extra.pop("nodb", False):
-            # Used by the API middleware to avoid writing to the database
-            return
-        self.queue.put(
+        self.queue.append(
             {
                 "topic": topic,
                 "description": description,
@@ -51,15 +69,75 @@ class LogCollector(BackgroundWorker):
                 "payload": extra,
             }
         )
+        self.queued += 1
+        self._notify()
 
-    async def process_message(self, record):
+    def _notify(self) -> None:
+        """Wake up the worker. May be called from any thread."""
+        if self._loop is None or self._wakeup is None or self._wakeup.is_set():
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # loop is closed
+            pass
+
+    def stats(self) -> dict[str, int]:
+        """Return the collector counters"""
+        return {
+            "queued": self.queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": len(self.queue),
+        }
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        while self.queue and len(batch) < ayonconfig.log_collector_batch_size:
+            batch.append(self.queue.popleft())
+        return batch
+
+    async def process_batch(self, batch: list[dict[str, Any]]) -> None:
         try:
-            await EventStream.dispatch(**record)
+            await EventStream.dispatch_many(batch)
         except Exception:
-            m = f"Unable to dispatch log message: {record}"
-            logger.warning(m, nodb=True)
+            pass
+        else:
+            self.written += len(batch)
+            return
+
+        # Bulk write failed. Store the messages one by one,
+        # so a single invalid message does not discard the whole batch
+
+        for record in batch:
+            try:
+                await EventStream.dispatch(**record)
+            except Exception:
+                self.dropped += 1
+                m = f"Unable to dispatch log message: {record}"
+                logger.warning(m, nodb=True)
+            else:
+                self.written += 1
+
+    async def report_dropped(self) -> None:
+        """Store a warning when messages were dropped since the last report"""
+        dropped = self.dropped - self._reported_dropped
+        if not dropped:
+            return
+        self._reported_dropped = self.dropped
+        try:
+            await EventStream.dispatch(
+                "log.warning",
+                description=f"Log collector dropped {dropped} messages",
+                payload={"module": __name__, "dropped": dropped},
+            )
+        except Exception:
+            pass
 
     async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
         # During the startup, we cannot write to the database
         # so the following loop patiently waits for the database
         # to become ready.
@@ -72,20 +150,26 @@ class LogCollector(BackgroundWorker):
             break
 
         while True:
-            if self.queue.empty():
-                await asyncio.sleep(0.2)
-                continue
-
-            record = self.queue.get()
-            await self.process_message(record)
+            if not self.queue:
+                self._wakeup.clear()
+                # check again - a message might have arrived
+                # between the check and clearing the event
+                if not self.queue:
+                    await self._wakeup.wait()
+
+            batch = self._take_batch()
+            if batch:
+                await self.process_batch(batch)
+            await self.report_dropped()
 
     async def finalize(self):
-        while not self.queue.empty():
+        self._loop = None
+        self._wakeup = None
+        while self.queue:
             logger.trace(
-                f"Processing {len(self.queue.queue)} remaining log messages", nodb=True
+                f"Processing {len(self.queue)} remaining log messages", nodb=True
             )
-            record = self.queue.get()
-            await self.process_message(record)
+            await self.process_batch(self._take_batch())
 
 
 # Create the instance here.
@@ -0,0 +1,79 @@
+import asyncio
+import collections
+import time
+from typing import Any
+
+from ayon_server.auth.session import Session
+from ayon_server.background.background_worker import BackgroundWorker
+from ayon_server.config import ayonconfig
+from ayon_server.lib.redis import Redis
+from ayon_server.logging import log_traceback, logger
+from ayon_server.utils import json_loads
+
+
+class SessionSync(BackgroundWorker):
+    """Keep per-process session data in sync with other server processes.
+
+    - Listens for session invalidation messages published by
+      `Session.invalidate` and drops the affected cached sessions.
+    - Periodically writes per-user request counters collected
+      by the auth middleware to Redis.
+    """
+
+    def initialize(self):
+        self.requests: collections.Counter[str] = collections.Counter()
+        self.last_flush = time.monotonic()
+
+    def count_request(self, user_name: str) -> None:
+        self.requests[user_name] += 1
+
+    async def flush_requests(self) -> None:
+        self.last_flush = time.monotonic()
+        if not self.requests:
+            return
+        requests, self.requests = self.requests, collections.Counter()
+        try:
+            await Redis.incr_many("user-requests", dict(requests))
+        except Exception:
+            log_traceback("Unable to store user request counters", nodb=True)
+
+    def handle_message(self, message: dict[str, Any]) -> None:
+        Session.drop_cached(
+            token=message.get("token"),
+            user_name=message.get("user"),
+        )
+
+    async def run(self):
+        pubsub = await Redis.pubsub()
+        await pubsub.subscribe(Session.invalidation_channel)
+        # Sessions might have changed while we were not listening
+        Session.drop_cached()
+
+        try:
+            while True:
+                try:
+                    raw_message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=1,
+                    )
+                    if raw_message is not None:
+                        self.handle_message(json_loads(raw_message["data"]))
+                    else:
+                        await asyncio.sleep(0.01)
+
+                    elapsed = time.monotonic() - self.last_flush
+                    if elapsed > ayonconfig.user_requests_flush_interval:
+                        await self.flush_requests()
+
+                except Exception:
+                    log_traceback("Unhandled exception in session sync", nodb=True)
+                    await asyncio.sleep(0.5)
+        finally:
+            await pubsub.aclose()
+
+    async def finalize(self):
+        logger.trace("Storing remaining user request counters", nodb=True)
+        await self.flush_requests()
+
+
+session_sync = SessionSync()
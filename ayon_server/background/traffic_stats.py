@@ -0,0 +1,94 @@
+import asyncio
+import datetime
+import time
+
+from ayon_server.background.background_worker import BackgroundWorker
+from ayon_server.config import ayonconfig
+from ayon_server.lib.postgres import Postgres
+from ayon_server.logging import log_traceback, logger
+
+FLUSH_QUERY = """
+    INSERT INTO public.traffic_stats (date, service, ingress, egress)
+    SELECT date, service, ingress, egress
+    FROM UNNEST($1::date[], $2::varchar[], $3::bigint[], $4::bigint[])
+    AS t(date, service, ingress, egress)
+    ON CONFLICT (date, service) DO UPDATE SET
+        ingress = traffic_stats.ingress + EXCLUDED.ingress,
+        egress = traffic_stats.egress + EXCLUDED.egress
+"""
+
+
+class TrafficStatsCollector(BackgroundWorker):
+    """Accumulate ingress/egress traffic in memory and store it periodically.
+
+    Updating the traffic_stats row of the day on every file transfer
+    serializes all concurrent uploads and downloads on a single row,
+    so the amounts are summed per day and service and written
+    in one statement every `ayonconfig.traffic_stats_flush_interval`
+    seconds and when the server shuts down.
+    """
+
+    def initialize(self):
+        # (date, service): [ingress, egress]
+        self.pending: dict[tuple[datetime.date, str], list[int]] = {}
+        self.last_flush = time.monotonic()
+        self.finalizing = False
+
+    @property
+    def is_collecting(self) -> bool:
+        """Return True if added amounts are going to be stored"""
+        return bool(self.is_running) and not self.finalizing
+
+    def add(
+        self,
+        service: str,
+        ingress: int = 0,
+        egress: int = 0,
+        date: datetime.date | None = None,
+    ) -> None:
+        # The day is recorded when the traffic is reported, so amounts
+        # buffered before midnight are not counted on the next day
+        key = (date or datetime.date.today(), service)
+        if (amounts := self.pending.get(key)) is None:
+            self.pending[key] = [ingress, egress]
+        else:
+            amounts[0] += ingress
+            amounts[1] += egress
+
+    async def flush(self) -> None:
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        keys = list(pending)
+        try:
+            await Postgres.execute(
+                FLUSH_QUERY,
+                [date for date, _ in keys],
+                [service for _, service in keys],
+                [pending[key][0] for key in keys],
+                [pending[key][1] for key in keys],
+            )
+        except Exception:
+            log_traceback("Unable to store traffic stats", nodb=True)
+            # Keep the amounts for the next attempt
+            for (date, service), (ingress, egress) in pending.items():
+                self.add(service, ingress, egress, date=date)
+
+    async def run(self):
+        self.finalizing = False
+        while True:
+            await asyncio.sleep(1)
+            elapsed = time.monotonic() - self.last_flush
+            if elapsed >= ayonconfig.traffic_stats_flush_interval:
+                await self.flush()
+
+    async def finalize(self):
+        # Amounts reported during (and after) the last flush
+        # are written directly by update_traffic_stats
+        self.finalizing = True
+        logger.trace("Storing remaining traffic stats", nodb=True)
+        await self.flush()
+
+
+traffic_stats = TrafficStatsCollector()
@@ -1,8 +1,11 @@
 from ayon_server.installer import background_installer
 
 from .background_worker import BackgroundWorker
+from .event_loop_monitor import event_loop_monitor
 from .invalidate_actions import invalidate_actions
 from .log_collector import log_collector
+from .session_sync import session_sync
+from .traffic_stats import traffic_stats
 
 
 class BackgroundWorkers:
@@ -22,8 +25,11 @@ class BackgroundWorkers:
     def __init__(self):
         self.tasks: list[BackgroundWorker] = [
             background_installer,
+            event_loop_monitor,
             invalidate_actions,
             log_collector,
+            session_sync,
+            traffic_stats,
         ]
 
     def start(self):
@@ -228,13 +228,7 @@ class ProjectLevelEntity(BaseEntity):
 
             else:
                 # Create a new entity
-                fields = dict_exclude(
-                    self.dict(exclude_none=True),
-                    self.model.dynamic_fields,
-                )
-                fields["attrib"] = attrib
-
-                await self.pre_save(True)
+                fields = await self.prepare_insert()
                 await Postgres.execute(
                     *SQLTool.insert(
                         f"project_{self.project_name}.{self.entity_type}s",
@@ -245,15 +239,48 @@ class ProjectLevelEntity(BaseEntity):
             if auto_commit:
                 await self.commit()
 
+    async def prepare_insert(self) -> dict[str, Any]:
+        """Prepare a new entity for insertion.
+
+        Runs the pre_save hook and returns the column values of the
+        database row, but does not execute the INSERT itself,
+        so the caller may insert multiple entities at once.
+        """
+        if self.status is None:
+            self.status = await self.get_default_status()
+
+        attrib = {}
+        for key in self.own_attrib:
+            with suppress(AttributeError):
+                if (value := getattr(self.attrib, key)) is not None:
+                    attrib[key] = value
+
+        fields = dict_exclude(
+            self.dict(exclude_none=True),
+            self.model.dynamic_fields,
+        )
+        fields["attrib"] = attrib
+
+        await self.pre_save(True)
+        return fields
+
     async def commit(self) -> None:
         await self.refresh_views(self.project_name)
 
     @classmethod
-    async def refresh_views(cls, project_name: str) -> None:
+    async def refresh_views(
+        cls,
+        project_name: str,
+        events: list[dict[str, Any]] | None = None,
+    ) -> None:
         """Refresh the views for the entity type in the given project.
 
         This method should be overridden in subclasses to refresh.
         and should be called from commit() method after the entity is saved.
+
+        When `events` (entity events created by the operations layer)
+        are provided, subclasses may use them to update only the affected
+        parts of the views and caches instead of rebuilding them.
         """
         pass
 
@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import Any
 
-from ayon_server.access.utils import ensure_entity_access
+from ayon_server.access.utils import (
+    ensure_entity_access,
+    invalidate_folder_access_lists,
+)
 from ayon_server.entities.common import query_entity_data
 from ayon_server.entities.core import ProjectLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
@@ -9,8 +12,14 @@ from ayon_server.exceptions import (
     AyonException,
     ForbiddenException,
 )
-from ayon_server.helpers.hierarchy_cache import rebuild_hierarchy_cache
-from ayon_server.helpers.inherited_attributes import rebuild_inherited_attributes
+from ayon_server.helpers.hierarchy_cache import (
+    rebuild_hierarchy_cache,
+    update_hierarchy_cache,
+)
+from ayon_server.helpers.inherited_attributes import (
+    rebuild_inherited_attributes,
+    update_inherited_attributes,
+)
 from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import logger
 from ayon_server.types import ProjectLevelEntityType
@@ -179,35 +188,40 @@ class FolderEntity(ProjectLevelEntity):
                     )
                 )
 
-            # This needs to run in save, not in refresh_views, because
-            # we may need the hierarchy record in the same transaction
-            await Postgres.execute(
-                f"""
-                REFRESH MATERIALIZED VIEW
-                project_{self.project_name}.hierarchy
-                """
-            )
+            # hierarchy table is updated by a trigger on the folders
+            # table, so the path is available in the same transaction
 
             if auto_commit:
                 await self.commit()
 
     @classmethod
-    async def refresh_views(cls, project_name: str) -> None:
-        """Refresh hierarchy materialized view on folder save."""
+    async def refresh_views(
+        cls,
+        project_name: str,
+        events: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Refresh exported attributes and hierarchy cache on folder save."""
         logger.trace(f"Refreshing folder views for project {project_name}")
 
         # Do not change the order of these calls!
         #
         # Inherited attributes call:
-        #  - refreshes hierarchy materialized view
         #  - rebuilds exported_attributes table
+        #    (which depends on hierarchy table maintained by triggers)
         #
         # Hierarchy cache call:
         #  - caches the hierarchy table in Redis
         #  - which depends on the exported_attributes table
+        #
+        # When events are provided, only affected subtrees / folders are updated
 
-        await rebuild_inherited_attributes(project_name)
-        await rebuild_hierarchy_cache(project_name)
+        await invalidate_folder_access_lists(project_name, events)
+        if events is None:
+            await rebuild_inherited_attributes(project_name)
+            await rebuild_hierarchy_cache(project_name)
+        else:
+            await update_inherited_attributes(project_name, events)
+            await update_hierarchy_cache(project_name, events)
 
     async def delete(self, *args, auto_commit: bool = True, **kwargs) -> bool:
         async with Postgres.transaction():
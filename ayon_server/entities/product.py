@@ -1,6 +1,9 @@
+from typing import Any
+
 from ayon_server.access.utils import ensure_entity_access
 from ayon_server.entities.core import ProjectLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
+from ayon_server.helpers.hierarchy_cache import update_hierarchy_cache
 from ayon_server.lib.postgres import Postgres
 from ayon_server.types import ProjectLevelEntityType
 
@@ -48,6 +51,19 @@ class ProductEntity(ProjectLevelEntity):
 
         return cls.from_record(project_name, record)
 
+    @classmethod
+    async def refresh_views(
+        cls,
+        project_name: str,
+        events: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Update the hierarchy cache on product changes."""
+
+        if events is not None:
+            # deleting or moving a product (along with its versions)
+            # affects has_versions flag of the cached folders
+            await update_hierarchy_cache(project_name, events)
+
     #
     # Access Control
     #
@@ -4,10 +4,12 @@ along with the project data, this entity also handles
 folder_types of the project and the folder hierarchy.
 """
 
+import copy
 from collections.abc import Sequence
 from datetime import datetime
 from typing import Any
 
+from ayon_server.access.utils import invalidate_folder_access_lists
 from ayon_server.entities.core import TopLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
 from ayon_server.entities.models.submodels import LinkTypeModel
@@ -20,17 +22,20 @@ from ayon_server.entities.project_aux_tables import (
     link_types_update,
 )
 from ayon_server.exceptions import NotFoundException, ServiceUnavailableException
+from ayon_server.helpers.hierarchy_cache import clear_hierarchy_cache
 from ayon_server.helpers.inherited_attributes import rebuild_inherited_attributes
+from ayon_server.helpers.project_cache import invalidate_project_cache, project_cache
 from ayon_server.helpers.project_list import build_project_list
 from ayon_server.lib.postgres import Postgres
 from ayon_server.lib.redis import Redis
-from ayon_server.utils import SQLTool, dict_exclude, get_nickname
+from ayon_server.utils import SQLTool, dict_exclude, get_nickname, json_loads
 
 
 class ProjectEntity(TopLevelEntity):
     entity_type: str = "project"
     model: ModelSet = ModelSet("project", attribute_library["project"], False)
     original_attributes: dict[str, Any] = {}
+    readonly: bool = False
 
     #
     # Load
@@ -42,8 +47,16 @@ class ProjectEntity(TopLevelEntity):
         name: str,
         transaction=None,  # deprecated
         for_update: bool = False,
+        readonly: bool = False,
     ) -> "ProjectEntity":
-        """Load a project from the database."""
+        """Load a project from the database.
+
+        When `readonly` is True, the returned entity shares the parsed
+        project data with other readers in the process, so it must not
+        be modified (nested structures are not copied) and it cannot
+        be saved. Use it in hot read paths, where validating the project
+        model on every request is not affordable.
+        """
 
         project_name = name
 
@@ -51,115 +64,148 @@ class ProjectEntity(TopLevelEntity):
             # if we are not going to update the project, we can use the cache
             # to speed up the loading. Otherwise, we need to lock the project
             # record to prevent concurrent modifications
-            if payload := await Redis.get_json("project-data", project_name):
-                if isinstance(payload, list):
-                    payload = payload[0]
-                return cls.from_record(payload=payload)
-
-        try:
-            project_data = await Postgres.fetchrow(
-                f"""
-                SELECT  *
-                FROM public.projects
-                WHERE name ILIKE $1
-                {'FOR UPDATE NOWAIT' if for_update else ''}
-                """,
-                name,
-            )
+            generation = project_cache.generation
+            if (entry := project_cache.get("project-data", project_name)) is None:
+                if cached_data := await Redis.get("project-data", project_name):
+                    data = cached_data.decode()
+                    entry = project_cache.put(
+                        "project-data", project_name, data, generation
+                    )
+                    if entry is None:
+                        # cache disabled or invalidated while loading
+                        return cls._from_cached(data, readonly)
+
+            if entry is not None:
+                if not readonly:
+                    return cls._from_cached(entry.data)
+                if entry.shared is None:
+                    entry.shared = cls._from_cached(entry.data, readonly=True)
+                return entry.shared.shared_copy()
+
+        # The result is stored in the shared project cache
+        with Postgres.primary():
+            try:
+                project_data = await Postgres.fetchrow(
+                    f"""
+                    SELECT  *
+                    FROM public.projects
+                    WHERE name ILIKE $1
+                    {'FOR UPDATE NOWAIT' if for_update else ''}
+                    """,
+                    name,
+                )
 
-            if project_data is None:
+                if project_data is None:
+                    raise NotFoundException(f"Project '{project_name}' not found")
+
+                # Load folder types
+                folder_types = []
+                for name, data in await Postgres.fetch(
+                    f"""
+                    SELECT name, data
+                    FROM project_{project_name}.folder_types
+                    ORDER BY position
+                    {'FOR UPDATE' if for_update else ''}
+                    """
+                ):
+                    folder_types.append({"name": name, **data})
+
+                # Load task types
+                task_types = []
+                for name, data in await Postgres.fetch(
+                    f"""
+                    SELECT name, data
+                    FROM project_{project_name}.task_types
+                    ORDER BY position
+                    {'FOR UPDATE' if for_update else ''}
+                    """
+                ):
+                    task_types.append({"name": name, **data})
+
+                # Load link types
+                link_types = []
+                for row in await Postgres.fetch(
+                    f"""
+                    SELECT name, link_type, input_type, output_type, data
+                    FROM project_{project_name}.link_types
+                    {'FOR UPDATE' if for_update else ''}
+                    """
+                ):
+                    link_types.append(dict(row))
+
+                # Load statuses
+                statuses = []
+                for name, data in await Postgres.fetch(
+                    f"""
+                    SELECT name, data
+                    FROM project_{project_name}.statuses
+                    ORDER BY position
+                    {'FOR UPDATE' if for_update else ''}
+                    """
+                ):
+                    statuses.append({"name": name, **data})
+
+                # Load tags
+                tags = []
+                for name, data in await Postgres.fetch(
+                    f"""
+                    SELECT name, data
+                    FROM project_{project_name}.tags
+                    ORDER BY position
+                    {'FOR UPDATE' if for_update else ''}
+                    """
+                ):
+                    tags.append({"name": name, **data})
+
+                payload = dict(project_data) | {
+                    "folder_types": folder_types,
+                    "task_types": task_types,
+                    "link_types": link_types,
+                    "statuses": statuses,
+                    "tags": tags,
+                }
+            except Postgres.UndefinedTableError:
+                # If the project schema does not exist, it means the project was deleted
                 raise NotFoundException(f"Project '{project_name}' not found")
-
-            # Load folder types
-            folder_types = []
-            for name, data in await Postgres.fetch(
-                f"""
-                SELECT name, data
-                FROM project_{project_name}.folder_types
-                ORDER BY position
-                {'FOR UPDATE' if for_update else ''}
-                """
-            ):
-                folder_types.append({"name": name, **data})
-
-            # Load task types
-            task_types = []
-            for name, data in await Postgres.fetch(
-                f"""
-                SELECT name, data
-                FROM project_{project_name}.task_types
-                ORDER BY position
-                {'FOR UPDATE' if for_update else ''}
-                """
-            ):
-                task_types.append({"name": name, **data})
-
-            # Load link types
-            link_types = []
-            for row in await Postgres.fetch(
-                f"""
-                SELECT name, link_type, input_type, output_type, data
-                FROM project_{project_name}.link_types
-                {'FOR UPDATE' if for_update else ''}
-                """
-            ):
-                link_types.append(dict(row))
-
-            # Load statuses
-            statuses = []
-            for name, data in await Postgres.fetch(
-                f"""
-                SELECT name, data
-                FROM project_{project_name}.statuses
-                ORDER BY position
-                {'FOR UPDATE' if for_update else ''}
-                """
-            ):
-                statuses.append({"name": name, **data})
-
-            # Load tags
-            tags = []
-            for name, data in await Postgres.fetch(
-                f"""
-                SELECT name, data
-                FROM project_{project_name}.tags
-                ORDER BY position
-                {'FOR UPDATE' if for_update else ''}
-                """
-            ):
-                tags.append({"name": name, **data})
-
-            payload = dict(project_data) | {
-                "folder_types": folder_types,
-                "task_types": task_types,
-                "link_types": link_types,
-                "statuses": statuses,
-                "tags": tags,
-            }
-        except Postgres.UndefinedTableError:
-            # If the project schema does not exist, it means the project was deleted
-            raise NotFoundException(f"Project '{project_name}' not found")
-        except Postgres.LockNotAvailableError:
-            raise ServiceUnavailableException(
-                f"Project '{project_name}' is currently being modified"
-            )
+            except Postgres.LockNotAvailableError:
+                raise ServiceUnavailableException(
+                    f"Project '{project_name}' is currently being modified"
+                )
 
         cls.original_attributes = project_data["attrib"]
         await Redis.set_json("project-data", project_name, payload, ttl=3600)
         return cls.from_record(payload=payload)
 
+    @classmethod
+    def _from_cached(cls, data: str, readonly: bool = False) -> "ProjectEntity":
+        payload = json_loads(data)
+        if isinstance(payload, list):
+            payload = payload[0]
+        project = cls.from_record(payload=payload)
+        project.readonly = readonly
+        return project
+
+    def shared_copy(self) -> "ProjectEntity":
+        """Return a read-only copy sharing nested data with this entity"""
+        project = copy.copy(self)
+        project._payload = self._payload.copy()
+        project.readonly = True
+        return project
+
     #
     # Save
     #
 
     async def save(self, *args, **kwargs) -> bool:
         """Save the project to the database."""
+        assert not self.readonly, "Unable to save a read-only project"
         async with Postgres.transaction():
             try:
                 return await self._save()
             finally:
                 await Redis.delete("project-anatomy", self.name)
                 await Redis.delete("project-data", self.name)
+                await invalidate_project_cache(self.name)
                 await build_project_list()
 
     async def _save(self) -> bool:
@@ -240,6 +286,7 @@ class ProjectEntity(TopLevelEntity):
         """Delete existing project."""
         if not self.name:
             raise KeyError("Unable to delete project. Not loaded")
+        assert not self.readonly, "Unable to delete a read-only project"
 
         async with Postgres.transaction():
             try:
@@ -250,7 +297,9 @@ class ProjectEntity(TopLevelEntity):
             finally:
                 await Redis.delete("project-anatomy", self.name)
                 await Redis.delete("project-data", self.name)
-                await Redis.delete("project-folders", self.name)
+                await invalidate_project_cache(self.name)
+                await clear_hierarchy_cache(self.name)
+                await invalidate_folder_access_lists(self.name)
                 await build_project_list()
         return True
 
@@ -1,11 +1,17 @@
 from typing import Any
 
-from ayon_server.access.utils import ensure_entity_access
+from ayon_server.access.utils import (
+    ensure_entity_access,
+    invalidate_folder_access_lists,
+)
 from ayon_server.entities.common import query_entity_data
 from ayon_server.entities.core import ProjectLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
 from ayon_server.exceptions import AyonException
-from ayon_server.helpers.hierarchy_cache import rebuild_hierarchy_cache
+from ayon_server.helpers.hierarchy_cache import (
+    rebuild_hierarchy_cache,
+    update_hierarchy_cache,
+)
 from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import logger
 from ayon_server.types import ProjectLevelEntityType
@@ -102,8 +108,16 @@ class TaskEntity(ProjectLevelEntity):
             await super().save(auto_commit=auto_commit)
 
     @classmethod
-    async def refresh_views(cls, project_name: str) -> None:
-        await rebuild_hierarchy_cache(project_name)
+    async def refresh_views(
+        cls,
+        project_name: str,
+        events: list[dict[str, Any]] | None = None,
+    ) -> None:
+        await invalidate_folder_access_lists(project_name, events)
+        if events is None:
+            await rebuild_hierarchy_cache(project_name)
+        else:
+            await update_hierarchy_cache(project_name, events)
 
     async def ensure_create_access(self, user, **kwargs) -> None:
         if user.is_manager:
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Optional
 
 from ayon_server.access.access_groups import AccessGroups
 from ayon_server.access.permissions import Permissions
+from ayon_server.access.utils import invalidate_folder_access_lists
 from ayon_server.auth.utils import (
     create_password,
     hash_password,
@@ -238,6 +239,7 @@ class UserEntity(TopLevelEntity):
                     await Postgres.execute(query)
                 except Postgres.UndefinedTableError:
                     continue
+                await invalidate_folder_access_lists(project.name)
 
         return res[0]["count"]
 
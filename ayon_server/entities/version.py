@@ -1,4 +1,4 @@
-from typing import NoReturn
+from typing import Any, NoReturn
 
 from ayon_server.access.utils import ensure_entity_access
 from ayon_server.entities.common import query_entity_data
@@ -7,6 +7,7 @@ from ayon_server.entities.models import ModelSet
 from ayon_server.exceptions import (
     ConstraintViolationException,
 )
+from ayon_server.helpers.hierarchy_cache import update_hierarchy_cache
 from ayon_server.lib.postgres import Postgres
 from ayon_server.types import ProjectLevelEntityType
 
@@ -97,9 +98,18 @@ class VersionEntity(ProjectLevelEntity):
             )
 
     @classmethod
-    async def refresh_views(cls, project_name: str) -> None:
+    async def refresh_views(
+        cls,
+        project_name: str,
+        events: list[dict[str, Any]] | None = None,
+    ) -> None:
         """Refresh hierarchy materialized view on folder save."""
 
+        if events is not None:
+            # new and deleted versions affect has_versions
+            # flag of the cached folders
+            await update_hierarchy_cache(project_name, events)
+
         await Postgres.execute(
             f"""
             REFRESH MATERIALIZED VIEW CONCURRENTLY
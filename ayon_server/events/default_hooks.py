@@ -2,6 +2,7 @@ __all__ = ["DEFAULT_HOOKS"]
 
 from typing import TYPE_CHECKING
 
+from ayon_server.addons.settings_caching import clear_resolved_settings
 from ayon_server.lib.redis import Redis
 from ayon_server.logging import logger
 
@@ -14,10 +15,21 @@ if TYPE_CHECKING:
 async def clear_settings_cache(event: "EventModel"):
     logger.trace("Clearing all-settings cache")
     await Redis.delete_ns("all-settings")
+    if event.topic == "settings.changed":
+        await clear_resolved_settings()
+
+
+async def clear_resolved_settings_cache(event: "EventModel"):
+    logger.trace("Clearing resolved settings cache")
+    await clear_resolved_settings()
 
 
 DEFAULT_HOOKS: list[tuple[str, HandlerType, bool]] = [
     ("settings.changed", clear_settings_cache, False),
     ("bundle.created", clear_settings_cache, False),
     ("bundle.updated", clear_settings_cache, False),
+    # promoting a bundle copies the staging overrides to production
+    ("bundle.status_changed", clear_settings_cache, False),
+    # overrides of a re-created project must not be served from the cache
+    ("entity.project.deleted", clear_resolved_settings_cache, False),
 ]
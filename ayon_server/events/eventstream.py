@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from typing import Any
 
@@ -9,6 +10,14 @@ from ayon_server.utils import SQLTool, json_dumps
 
 from .base import EventModel, EventStatus, HandlerType, create_id
 
+EVENT_COLUMNS_COUNT = 12
+
+# Postgres limits the number of query parameters to 32767
+MAX_QUERY_ARGS = 32767
+
+# Maximum number of events handled by local hooks at the same time
+MAX_CONCURRENT_HOOKS = 10
+
 
 class EventStream:
     model: type[EventModel] = EventModel
@@ -33,6 +42,163 @@ class EventStream:
                 if not mapping:
                     hooks.pop(topic)
 
+    #
+    # Dispatch helpers
+    #
+
+    @staticmethod
+    def _create_event(
+        topic: str,
+        *,
+        sender: str | None = None,
+        sender_type: str | None = None,
+        hash: str | None = None,
+        project: str | None = None,
+        user: str | None = None,
+        depends_on: str | None = None,
+        description: str | None = None,
+        summary: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
+        finished: bool = True,
+    ) -> EventModel:
+        event_id = create_id()
+        if hash is None:
+            hash = event_id
+        return EventModel(
+            id=event_id,
+            hash=hash,
+            sender=sender,
+            sender_type=sender_type,
+            topic=topic,
+            project=project,
+            user=user,
+            depends_on=depends_on,
+            status="finished" if finished else "pending",
+            description=description or "",
+            summary=summary or {},
+            payload=payload or {},
+            retries=0,
+        )
+
+    @staticmethod
+    def _insert_query(rows: int, reuse: bool) -> str:
+        n = EVENT_COLUMNS_COUNT
+        values = ", ".join(
+            "(" + ", ".join(f"${r * n + c + 1}" for c in range(n)) + ")"
+            for r in range(rows)
+        )
+        query = f"""
+            INSERT INTO
+            public.events (
+                id,
+                hash,
+                sender,
+                sender_type,
+                topic,
+                project_name,
+                user_name,
+                depends_on,
+                status,
+                description,
+                summary,
+                payload
+            )
+            VALUES {values}
+        """
+        if reuse:
+            query += """
+                ON CONFLICT (hash) DO UPDATE SET
+                    id = EXCLUDED.id,
+                    sender = EXCLUDED.sender,
+                    sender_type = EXCLUDED.sender_type,
+                    topic = EXCLUDED.topic,
+                    project_name = EXCLUDED.project_name,
+                    user_name = EXCLUDED.user_name,
+                    depends_on = EXCLUDED.depends_on,
+                    status = EXCLUDED.status,
+                    description = EXCLUDED.description,
+                    summary = EXCLUDED.summary,
+                    payload = EXCLUDED.payload,
+                    updated_at = NOW()
+            """
+        else:
+            query += "ON CONFLICT (hash) DO NOTHING"
+        return query
+
+    @staticmethod
+    def _insert_args(event: EventModel) -> list[Any]:
+        return [
+            event.id,
+            event.hash,
+            event.sender,
+            event.sender_type,
+            event.topic,
+            event.project,
+            event.user,
+            event.depends_on,
+            event.status,
+            event.description,
+            event.summary,
+            event.payload,
+        ]
+
+    @staticmethod
+    def _message(
+        event: EventModel,
+        *,
+        store: bool,
+        recipients: list[str] | None,
+    ) -> str:
+        """Serialize the event to be published via Redis"""
+        depends_on = (
+            str(event.depends_on).replace("-", "") if event.depends_on else None
+        )
+        return json_dumps(
+            {
+                "id": str(event.id).replace("-", ""),
+                "topic": event.topic,
+                "project": event.project,
+                "user": event.user,
+                "dependsOn": depends_on,
+                "description": event.description,
+                "summary": event.summary,
+                "status": event.status,
+                "progress": 100 if event.status == "finished" else 0.0,
+                "sender": event.sender,
+                "senderType": event.sender_type,
+                "store": store,  # useful to allow querying details
+                "recipients": recipients,
+                "createdAt": event.created_at,
+                "updatedAt": event.updated_at,
+            }
+        )
+
+    @staticmethod
+    def _log_created(event: EventModel) -> None:
+        if event.topic.startswith("log."):
+            return
+        p = f" ({event.description})" if event.description else ""
+        ctx = {"nodb": True, "event_id": event.id}
+        if event.user:
+            ctx["user"] = event.user
+        if event.project:
+            ctx["project"] = event.project
+        with logger.contextualize(**ctx):
+            logger.debug(f"[EVENT CREATE] {event.topic}{p}")
+
+    @classmethod
+    async def _run_local_hooks(cls, event: EventModel) -> None:
+        handlers = cls.local_hooks.get(event.topic, {}).values()
+        for handler in handlers:
+            try:
+                await handler(event)
+            except Exception:
+                log_traceback(f"Error in event handler '{handler.__name__}'")
+
+    #
+    # Dispatch
+    #
+
     @classmethod
     async def dispatch(
         cls,
@@ -66,89 +232,26 @@ class EventStream:
         recipients:
             list of user names to notify via websocket (None for all users)
         """
-        if summary is None:
-            summary = {}
-        if payload is None:
-            payload = {}
-        if description is None:
-            description = ""
 
-        event_id = create_id()
-        if hash is None:
-            hash = f"{event_id}"
-
-        status: str = "finished" if finished else "pending"
-        progress: float = 100 if finished else 0.0
-
-        event = EventModel(
-            id=event_id,
-            hash=hash,
+        event = cls._create_event(
+            topic,
             sender=sender,
             sender_type=sender_type,
-            topic=topic,
+            hash=hash,
             project=project,
             user=user,
             depends_on=depends_on,
-            status=status,
             description=description,
             summary=summary,
             payload=payload,
-            retries=0,
+            finished=finished,
         )
 
         if store:
-            query = """
-                INSERT INTO
-                public.events (
-                    id,
-                    hash,
-                    sender,
-                    sender_type,
-                    topic,
-                    project_name,
-                    user_name,
-                    depends_on,
-                    status,
-                    description,
-                    summary,
-                    payload
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-            """
-            if reuse:
-                query += """
-                    ON CONFLICT (hash) DO UPDATE SET
-                        id = EXCLUDED.id,
-                        sender = EXCLUDED.sender,
-                        sender_type = EXCLUDED.sender_type,
-                        topic = EXCLUDED.topic,
-                        project_name = EXCLUDED.project_name,
-                        user_name = EXCLUDED.user_name,
-                        depends_on = EXCLUDED.depends_on,
-                        status = EXCLUDED.status,
-                        description = EXCLUDED.description,
-                        summary = EXCLUDED.summary,
-                        payload = EXCLUDED.payload,
-                        updated_at = NOW()
-                """
-            else:
-                query += "ON CONFLICT (hash) DO NOTHING"
-
             try:
                 res = await Postgres.execute(
-                    query,
-                    event.id,
-                    event.hash,
-                    event.sender,
-                    event.sender_type,
-                    event.topic,
-                    event.project,
-                    event.user,
-                    event.depends_on,
-                    status,
-                    description,
-                    event.summary,
-                    event.payload,
+                    cls._insert_query(1, reuse),
+                    *cls._insert_args(event),
                 )
             except Postgres.ForeignKeyViolationError as e:
                 raise ConstraintViolationException(
@@ -165,49 +268,115 @@ class EventStream:
                     "Event with the same hash already exists",
                 )
 
-        depends_on = (
-            str(event.depends_on).replace("-", "") if event.depends_on else None
-        )
-        await Redis.publish(
-            json_dumps(
-                {
-                    "id": str(event.id).replace("-", ""),
-                    "topic": event.topic,
-                    "project": event.project,
-                    "user": event.user,
-                    "dependsOn": depends_on,
-                    "description": event.description,
-                    "summary": event.summary,
-                    "status": event.status,
-                    "progress": progress,
-                    "sender": sender,
-                    "senderType": sender_type,
-                    "store": store,  # useful to allow querying details
-                    "recipients": recipients,
-                    "createdAt": event.created_at,
-                    "updatedAt": event.updated_at,
-                }
-            )
-        )
+        await Redis.publish(cls._message(event, store=store, recipients=recipients))
+        cls._log_created(event)
+        await cls._run_local_hooks(event)
+        return event.id
 
-        if not event.topic.startswith("log."):
-            p = f" ({event.description})" if event.description else ""
-            ctx = {"nodb": True, "event_id": event.id}
-            if event.user:
-                ctx["user"] = event.user
-            if event.project:
-                ctx["project"] = event.project
-            with logger.contextualize(**ctx):
-                logger.debug(f"[EVENT CREATE] {event.topic}{p}")
+    @classmethod
+    async def dispatch_many(
+        cls,
+        events: list[dict[str, Any]],
+        *,
+        sender: str | None = None,
+        sender_type: str | None = None,
+    ) -> list[str]:
+        """Dispatch multiple events at once.
 
-        handlers = cls.local_hooks.get(event.topic, {}).values()
-        for handler in handlers:
+        Each item of `events` is a dict of keyword arguments accepted
+        by `dispatch`. `sender` and `sender_type` are used for events,
+        that don't specify their own.
+
+        Stored events are inserted using multi-row statements in a single
+        transaction, all events are published using one Redis pipeline
+        and local hooks of different events run concurrently.
+
+        If any of the events cannot be stored, none of them is dispatched
+        and ConstraintViolationException is raised.
+
+        Returns the list of event IDs in the same order as the input.
+        """
+
+        if not events:
+            return []
+
+        dispatched: list[tuple[EventModel, bool, list[str] | None]] = []
+        to_store: dict[bool, list[EventModel]] = {False: [], True: []}
+        for kwargs in events:
+            kwargs = {"sender": sender, "sender_type": sender_type, **kwargs}
+            store = kwargs.pop("store", True)
+            reuse = kwargs.pop("reuse", False)
+            recipients = kwargs.pop("recipients", None)
+            event = cls._create_event(**kwargs)
+            dispatched.append((event, store, recipients))
+            if store:
+                to_store[reuse].append(event)
+
+        if to_store[False] or to_store[True]:
+            chunk_size = MAX_QUERY_ARGS // EVENT_COLUMNS_COUNT
             try:
-                await handler(event)
-            except Exception:
-                log_traceback(f"Error in event handler '{handler.__name__}'")
+                async with Postgres.transaction():
+                    for reuse, stored_events in to_store.items():
+                        if reuse:
+                            # ON CONFLICT DO UPDATE cannot affect the same row
+                            # twice in one statement, so reused events
+                            # are inserted one by one (in a single pipeline)
+                            await Postgres.executemany(
+                                cls._insert_query(1, reuse=True),
+                                [cls._insert_args(e) for e in stored_events],
+                            )
+                            continue
 
-        return event.id
+                        for i in range(0, len(stored_events), chunk_size):
+                            chunk = stored_events[i : i + chunk_size]
+                            args = [a for e in chunk for a in cls._insert_args(e)]
+                            res = await Postgres.execute(
+                                cls._insert_query(len(chunk), reuse=False),
+                                *args,
+                            )
+                            if res != f"INSERT 0 {len(chunk)}":
+                                raise ConstraintViolationException(
+                                    "Event with the same hash already exists",
+                                )
+
+            except Postgres.ForeignKeyViolationError as e:
+                raise ConstraintViolationException(
+                    "Event depends on non-existing event",
+                ) from e
+
+            except Postgres.UniqueViolationError as e:
+                raise ConstraintViolationException(
+                    "Unable to reuse the event. Another event depends on it",
+                ) from e
+
+        await Redis.publish_many(
+            [
+                cls._message(event, store=store, recipients=recipients)
+                for event, store, recipients in dispatched
+            ]
+        )
+
+        for event, _, _ in dispatched:
+            cls._log_created(event)
+
+        # Handlers of a single event run sequentially (as in dispatch),
+        # different events are handled concurrently
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_HOOKS)
+
+        async def run_hooks(event: EventModel) -> None:
+            async with semaphore:
+                await cls._run_local_hooks(event)
+
+        await asyncio.gather(
+            *(
+                run_hooks(event)
+                for event, _, _ in dispatched
+                if event.topic in cls.local_hooks
+            )
+        )
+
+        return [event.id for event, _, _ in dispatched]
 
     @classmethod
     async def update(
@@ -92,6 +92,13 @@ class UnsupportedMediaException(AyonException):
     status: int = 415
 
 
+class PayloadTooLargeException(AyonException):
+    """Exception raised when a request body exceeds the allowed size."""
+
+    detail: str = "Payload too large"
+    status: int = 413
+
+
 class RangeNotSatisfiableException(AyonException):
     """Exception raised when a Range Request is not satisfiable."""
 
@@ -1,4 +1,8 @@
 from typing import Literal
 
 StorageType = Literal["local", "s3"]
-FileGroup = Literal["uploads", "thumbnails"]
+FileGroup = Literal["uploads", "thumbnails", "previews"]
+
+# Storage file name suffixes of generated thumbnail variants
+SCALED_THUMBNAIL_VARIANT = "scaled"
+THUMBNAIL_VARIANTS = (SCALED_THUMBNAIL_VARIANT,)
@@ -33,7 +33,7 @@ from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import log_traceback, logger
 from ayon_server.models.file_info import FileInfo
 
-from .common import FileGroup, StorageType
+from .common import THUMBNAIL_VARIANTS, FileGroup, StorageType
 from .utils import list_local_files
 
 
@@ -102,7 +102,7 @@ class ProjectStorage:
     # Common file management methods
 
     async def get_filegroup_dir(self, file_group: FileGroup) -> str:
-        assert file_group in ["uploads", "thumbnails"], "Invalid file group"
+        assert file_group in ["uploads", "thumbnails", "previews"], "Invalid file group"
         root = await self.get_root()
         project_dirname = self.project_name
         if self.storage_type == "s3":
@@ -228,6 +228,20 @@ class ProjectStorage:
             log_traceback("Error getting CDN link")
             raise AyonException("Failed to get CDN link")
 
+    async def read_file(
+        self,
+        file_id: str,
+        file_group: FileGroup = "uploads",
+    ) -> bytes:
+        """Return the content of the file stored in the storage
+
+        The whole file is loaded to memory, so this should be used
+        for reasonably small files only.
+        Raises `FileNotFoundError` if the file is not found.
+        """
+        path = await self.get_path(file_id, file_group=file_group)
+        return await self._read_bytes(path)
+
     #
     # Putting files into the storage
     #
@@ -326,6 +340,9 @@ class ProjectStorage:
         """
 
         path = await self.get_path(file_id, file_group=file_group)
+        return await self._unlink_path(path)
+
+    async def _unlink_path(self, path: str) -> bool:
         if self.storage_type == "local":
             try:
                 os.remove(path)
@@ -470,10 +487,88 @@ class ProjectStorage:
     # Used for storing original images of the thumbnail
     # in order to keep database size small
 
-    async def store_thumbnail(self, thumbnail_id: str, payload: bytes) -> None:
+    async def get_thumbnail_path(
+        self,
+        thumbnail_id: str,
+        variant: str | None = None,
+    ) -> str:
+        """Return the path of the thumbnail image on the storage
+
+        Without a variant, the path of the original image is returned.
+        """
+        path = await self.get_path(thumbnail_id, file_group="thumbnails")
+        if variant:
+            path = f"{path}.{variant}"
+        return path
+
+    async def store_thumbnail(
+        self,
+        thumbnail_id: str,
+        payload: bytes,
+        variant: str | None = None,
+    ) -> None:
         """Store the thumbnail image in the storage."""
         logger.debug(f"Storing thumbnail {thumbnail_id} to {self}")
-        path = await self.get_path(thumbnail_id, file_group="thumbnails")
+        path = await self.get_thumbnail_path(thumbnail_id, variant)
+        await self._write_bytes(path, payload)
+
+    async def get_thumbnail(
+        self,
+        thumbnail_id: str,
+        variant: str | None = None,
+    ) -> bytes:
+        """Retrieve the thumbnail image from the storage.
+
+        Raises `FileNotFoundError` if the thumbnail is not found.
+        """
+        path = await self.get_thumbnail_path(thumbnail_id, variant)
+        try:
+            return await self._read_bytes(path)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(
+                f"Thumbnail {thumbnail_id} not found on {self}"
+            ) from e
+
+    async def delete_thumbnail(self, thumbnail_id: str) -> None:
+        """Delete the thumbnail image from the storage.
+
+        Fail silently if the thumbnail is not found.
+        """
+        logger.debug(f"Deleting thumbnail {thumbnail_id} from {self}")
+        for variant in THUMBNAIL_VARIANTS:
+            path = await self.get_thumbnail_path(thumbnail_id, variant)
+            await self._unlink_path(path)
+        await self.unlink(thumbnail_id, file_group="thumbnails")
+
+    # Preview methods
+    # Generated preview images of project files are kept
+    # in the storage, so they survive Redis cache eviction
+
+    async def store_preview(self, file_id: str, payload: bytes) -> None:
+        """Store the preview image of a project file in the storage."""
+        logger.debug(f"Storing preview of {file_id} to {self}")
+        path = await self.get_path(file_id, file_group="previews")
+        await self._write_bytes(path, payload)
+
+    async def get_preview(self, file_id: str) -> bytes:
+        """Retrieve the preview image of a project file from the storage.
+
+        Raises `FileNotFoundError` if the preview is not found.
+        """
+        path = await self.get_path(file_id, file_group="previews")
+        try:
+            return await self._read_bytes(path)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Preview of {file_id} not found on {self}") from e
+
+    async def delete_preview(self, file_id: str) -> None:
+        """Delete the preview image of a project file from the storage.
+
+        Fail silently if the preview is not found.
+        """
+        await self.unlink(file_id, file_group="previews")
+
+    async def _write_bytes(self, path: str, payload: bytes) -> None:
         if self.storage_type == "local":
             directory, _ = os.path.split(path)
             if not os.path.isdir(directory):
@@ -488,34 +583,19 @@ class ProjectStorage:
             except Exception as e:
                 raise AyonException(f"Failed to write file: {e}") from e
         elif self.storage_type == "s3":
-            return await store_s3_file(self, path, payload)
+            await store_s3_file(self, path, payload)
 
-    async def get_thumbnail(self, thumbnail_id: str) -> bytes:
-        """Retrieve the thumbnail image from the storage.
-
-        Raises `FileNotFoundError` if the thumbnail is not found.
-        """
-        path = await self.get_path(thumbnail_id, file_group="thumbnails")
+    async def _read_bytes(self, path: str) -> bytes:
         if self.storage_type == "local":
             try:
                 async with aiofiles.open(path, "rb") as f:
                     return await f.read()
-            except FileNotFoundError as e:
-                raise FileNotFoundError(
-                    f"Thumbnail {thumbnail_id} not found on {self}"
-                ) from e
+            except FileNotFoundError:
+                raise
             except Exception as e:
                 raise AyonException(f"Failed to read file: {e}") from e
         return await retrieve_s3_file(self, path)
 
-    async def delete_thumbnail(self, thumbnail_id: str) -> None:
-        """Delete the thumbnail image from the storage.
-
-        Fail silently if the thumbnail is not found.
-        """
-        logger.debug(f"Deleting thumbnail {thumbnail_id} from {self}")
-        await self.unlink(thumbnail_id, file_group="thumbnails")
-
     # Trash project storage
     # This is called when a project is deleted
     # It won't delete the files, instead it renames the local directory
@@ -1,8 +1,9 @@
 import asyncio
 import os
 import time
+from collections.abc import AsyncIterator
 from concurrent.futures import ThreadPoolExecutor
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 import boto3
 import httpx
@@ -15,6 +16,11 @@ from ayon_server.config import ayonconfig
 from ayon_server.exceptions import AyonException, NotFoundException
 from ayon_server.helpers.download import get_file_name_from_headers
 from ayon_server.helpers.statistics import update_traffic_stats
+from ayon_server.lib.runtime_metrics import (
+    s3_part_upload_duration,
+    s3_upload_bytes,
+    s3_upload_duration,
+)
 from ayon_server.logging import logger
 from ayon_server.models.file_info import FileInfo
 
@@ -220,7 +226,7 @@ class FileIterator:
 async def list_s3_files(
     storage: "ProjectStorage", file_group: FileGroup
 ) -> AsyncGenerator[str, None]:
-    assert file_group in ["uploads", "thumbnails"], "Invalid file group"
+    assert file_group in ["uploads", "thumbnails", "previews"], "Invalid file group"
     file_iterator = FileIterator(storage, file_group)
     await file_iterator.init_iterator()
     async for key in file_iterator:
@@ -228,21 +234,28 @@ async def list_s3_files(
         yield fname
 
 
-# Multipart upload to S3 with async queue
+# Multipart upload to S3
 # Used for larger files
 
+# S3 requires all parts except the last one to be at least 5 MB
+MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 class S3Uploader:
-    _worker_task: asyncio.Task[Any] | None
-    _queue: asyncio.Queue[bytes | None]
+    """Multipart upload of a stream of chunks to S3.
+
+    Each pushed chunk is uploaded as a separate part in a thread pool.
+    Up to `concurrency` parts are uploaded at once; `push_chunk` waits
+    when all slots are taken, so at most `concurrency` chunks are kept
+    in memory.
+    """
 
     def __init__(
         self,
         client,
         bucket_name: str,
         *,
-        max_queue_size=5,
-        max_workers=4,
+        concurrency: int | None = None,
         content_type: str | None = None,
         content_disposition: str | None = None,
     ):
@@ -254,10 +267,12 @@ class S3Uploader:
         self.content_type = content_type
         self.content_disposition = content_disposition
 
-        # Limited-size async queue for chunk uploads to prevent over-filling
-        self._queue = asyncio.Queue(maxsize=max_queue_size)
-        self._worker_task = None
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        concurrency = max(1, concurrency or ayonconfig.s3_upload_concurrency)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: list[asyncio.Task[tuple[int, str]]] = []
+        self._next_part_number = 1
+        self._error: BaseException | None = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
 
     def _init_file_upload(self, key: str):
         if self._multipart:
@@ -295,28 +310,22 @@ class S3Uploader:
         etag = res["ResponseMetadata"]["HTTPHeaders"]["etag"]
         return part_number, etag
 
-    async def _worker(self):
-        """
-        Async worker that continuously processes chunks in the queue.
-        Uploads to S3 and maintains part order.
-        """
-        part_number = 1
-
-        while True:
-            chunk = await self._queue.get()
-            if chunk is None:
-                break  # Exit signal received
-
-            # Upload the chunk in a thread pool, and block asyncio minimally
-            part_number, etag = await asyncio.get_running_loop().run_in_executor(
+    async def _upload_part(self, chunk: bytes, part_number: int) -> tuple[int, str]:
+        start_time = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
                 self._executor,
                 self._upload_chunk,
                 chunk,
                 part_number,
             )
-            self._parts.append((part_number, etag))
-            part_number += 1
-            self._queue.task_done()  # Mark chunk as processed
+        except Exception as e:
+            if self._error is None:
+                self._error = e
+            raise
+        finally:
+            self._slots.release()
+            s3_part_upload_duration.observe(time.perf_counter() - start_time)
 
     async def init_file_upload(self, file_path: str):
         await asyncio.get_running_loop().run_in_executor(
@@ -324,14 +333,33 @@ class S3Uploader:
             self._init_file_upload,
             file_path,
         )
-        self._worker_task = asyncio.create_task(self._worker())
 
     async def push_chunk(self, chunk: bytes):
         """
-        Push chunk to the queue for background processing by the worker.
-        If the queue is full, wait until there's space.
+        Start uploading the chunk as the next part.
+        If the maximum number of parts is being uploaded, wait for a free slot.
+        Raises the error of a previously failed part upload.
         """
-        await self._queue.put(chunk)
+        if self._error is not None:
+            raise self._error
+        await self._slots.acquire()
+        if self._error is not None:
+            self._slots.release()
+            raise self._error
+
+        part_number = self._next_part_number
+        self._next_part_number += 1
+        self._tasks.append(asyncio.create_task(self._upload_part(chunk, part_number)))
+
+    async def _wait_for_parts(self) -> list[tuple[int, str]]:
+        tasks, self._tasks = self._tasks, []
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        parts: list[tuple[int, str]] = []
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+            parts.append(result)
+        return sorted(parts)
 
     def _complete(self):
         if not self._multipart:
@@ -350,15 +378,18 @@ class S3Uploader:
 
     async def complete(self):
         """
-        Signal the worker to complete and wait for uploads to finish.
-        Finalize the multipart upload.
+        Wait for the part uploads to finish and
+        finalize the multipart upload with the parts in order.
         """
-        await self._queue.put(None)  # Shutdown signal for the worker
-        if self._worker_task:
-            await self._worker_task  # Wait for the worker to finish.
+        self._parts = await self._wait_for_parts()
 
         logger.debug(f"Completing upload for {self._key}")
-        await asyncio.get_running_loop().run_in_executor(self._executor, self._complete)
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._complete
+            )
+        finally:
+            self._executor.shutdown(wait=False)
 
     def _abort(self) -> None:
         if not self._multipart:
@@ -376,7 +407,15 @@ class S3Uploader:
     async def abort(self) -> None:
         """Abort the multipart upload if there's an exception."""
         logger.warning("Aborting upload")
-        await asyncio.get_running_loop().run_in_executor(self._executor, self._abort)
+        # Parts still being uploaded would be stored after the abort
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._abort
+            )
+        finally:
+            self._executor.shutdown(wait=False)
 
     def __del__(self):
         """Ensure clean-up if the object is destroyed prematurely."""
@@ -386,6 +425,40 @@ class S3Uploader:
             pass  # pass silently, probably already aborted
 
 
+async def upload_stream_to_s3(
+    uploader: S3Uploader,
+    stream: AsyncIterator[bytes],
+) -> int:
+    """Push the stream to the uploader in parts of the configured size.
+
+    Returns the number of uploaded bytes.
+    """
+    part_size = max(MIN_PART_SIZE, ayonconfig.s3_upload_part_size)
+    buff = bytearray()
+    size = 0
+    async for chunk in stream:
+        buff += chunk
+        if len(buff) >= part_size:
+            await uploader.push_chunk(bytes(buff))
+            size += len(buff)
+            buff.clear()
+
+    if buff:
+        await uploader.push_chunk(bytes(buff))
+        size += len(buff)
+    return size
+
+
+def log_upload_throughput(source: str, size: int, upload_time: float) -> None:
+    s3_upload_bytes.inc(source, amount=size)
+    s3_upload_duration.observe(upload_time, source)
+    throughput = size / upload_time / (1024 * 1024) if upload_time else 0
+    logger.info(
+        f"Uploaded {size} bytes in {upload_time:.2f} seconds "
+        f"({throughput:.1f} MB/s)"
+    )
+
+
 async def handle_s3_upload(
     storage: "ProjectStorage",
     request: Request,
@@ -417,26 +490,13 @@ async def handle_s3_upload(
 
         try:
             await uploader.init_file_upload(path)
-            buffer_size = 1024 * 1024 * 5
-            buff = b""
-
-            async for chunk in request.stream():
-                buff += chunk
-                if len(buff) >= buffer_size:
-                    await uploader.push_chunk(buff)
-                    i += len(buff)
-                    buff = b""
-
-            if buff:
-                await uploader.push_chunk(buff)
-                i += len(buff)
-
+            i = await upload_stream_to_s3(uploader, request.stream())
             await uploader.complete()
             upload_time = time.monotonic() - start_time
             finished_ok = True
 
             await update_traffic_stats("ingress", i, service="s3")
-            logger.info(f"Uploaded {i} bytes in {upload_time:.2f} seconds")
+            log_upload_throughput("request", i, upload_time)
             return i
 
         finally:
@@ -464,39 +524,36 @@ async def remote_to_s3(
     uploader = S3Uploader(client, storage.bucket_name)
 
     await uploader.init_file_upload(path)
+    finished_ok = False
+
+    try:
+        async with httpx.AsyncClient(
+            timeout=timeout or ayonconfig.http_timeout,
+            follow_redirects=True,
+        ) as client:
+            async with client.stream(
+                method,
+                url,
+                headers=headers,
+                params=params,
+            ) as response:
+                content_type = response.headers.get("content-type")
+                filename = get_file_name_from_headers(dict(response.headers))
+                filename = filename or path.split("/")[-1].split("?")[0]
+                i = await upload_stream_to_s3(uploader, response.aiter_bytes())
+
+        await uploader.complete()
+        finished_ok = True
+    finally:
+        if not finished_ok:
+            try:
+                await uploader.abort()
+            except Exception:
+                pass
 
-    i = 0
-    buffer_size = 1024 * 1024 * 5
-    buff = b""
-
-    async with httpx.AsyncClient(
-        timeout=timeout or ayonconfig.http_timeout,
-        follow_redirects=True,
-    ) as client:
-        async with client.stream(
-            method,
-            url,
-            headers=headers,
-            params=params,
-        ) as response:
-            content_type = response.headers.get("content-type")
-            filename = get_file_name_from_headers(dict(response.headers))
-            filename = filename or path.split("/")[-1].split("?")[0]
-
-            async for chunk in response.aiter_bytes():
-                buff += chunk
-                if len(buff) >= buffer_size:
-                    await uploader.push_chunk(buff)
-                    i += len(buff)
-                    buff = b""
-
-            if buff:
-                await uploader.push_chunk(buff)
-                i += len(buff)
-
-    await uploader.complete()
     upload_time = time.monotonic() - start_time
-    logger.info(f"Uploaded {i} bytes to {path} in {upload_time:.2f} seconds")
+    with logger.contextualize(path=path):
+        log_upload_throughput("remote", i, upload_time)
     finfo_payload = {"size": i, "filename": filename}
     if content_type:
         finfo_payload["content_type"] = content_type
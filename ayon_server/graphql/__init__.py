@@ -9,6 +9,7 @@ from strawberry.fastapi import GraphQLRouter
 from strawberry.types import ExecutionContext
 
 from ayon_server.api.dependencies import CurrentUser
+from ayon_server.config import ayonconfig
 from ayon_server.exceptions import AyonException
 from ayon_server.graphql.connections import (
     ActivitiesConnection,
@@ -27,6 +28,7 @@ from ayon_server.graphql.dataloaders import (
     version_loader,
     workfile_loader,
 )
+from ayon_server.graphql.extensions import ResolverTimingExtension
 from ayon_server.graphql.nodes.common import ProductType
 from ayon_server.graphql.nodes.entity_list import entity_list_from_record
 from ayon_server.graphql.nodes.folder import folder_from_record
@@ -222,7 +224,10 @@ class AyonSchema(strawberry.Schema):
 
 
 router: GraphQLRouter[Any, Any] = GraphQLRouter(
-    schema=AyonSchema(query=Query),
+    schema=AyonSchema(
+        query=Query,
+        extensions=[ResolverTimingExtension] if ayonconfig.metrics_runtime else [],
+    ),
     graphiql=False,
     context_getter=graphql_get_context,
 )
@@ -8,7 +8,7 @@ from typing import Any, NewType
 
 from ayon_server.exceptions import AyonException
 from ayon_server.lib.postgres import Postgres
-from ayon_server.utils import SQLTool
+from ayon_server.utils import EntityID
 
 KeyType = NewType("KeyType", tuple[str, str])
 KeysType = NewType("KeysType", list[KeyType])
@@ -21,6 +21,11 @@ def get_project_name(keys: list[KeyType]) -> str:
     return project_names.pop()
 
 
+def get_entity_ids(keys: list[KeyType]) -> list[str]:
+    """Return entity IDs of the keys to be passed as a query argument."""
+    return [id for k in keys if (id := EntityID.parse(k[1], allow_nulls=True))]
+
+
 async def folder_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     """Load a list of folders by their ids (used as a dataloader).
     keys must be a list of tuples (project_name, folder_id) and project_name
@@ -61,13 +66,13 @@ async def folder_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
             public.projects AS pr
             ON pr.name ILIKE '{project_name}'
 
-        WHERE folders.id IN {SQLTool.id_array([k[1] for k in keys])}
+        WHERE folders.id = ANY($1::uuid[])
 
         GROUP BY
             folders.id, hierarchy.path, pr.attrib, ex.attrib
     """
 
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, get_entity_ids(keys)):
         key: KeyType = KeyType((project_name, str(record["id"])))
         result_dict[key] = record
     return [result_dict[k] for k in keys]
@@ -89,10 +94,10 @@ async def product_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
         FROM project_{project_name}.products AS products
         JOIN project_{project_name}.hierarchy AS hierarchy
         ON hierarchy.id = products.folder_id
-        WHERE products.id IN {SQLTool.id_array([k[1] for k in keys])}
+        WHERE products.id = ANY($1::uuid[])
         """
 
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, get_entity_ids(keys)):
         key: KeyType = KeyType((project_name, str(record["id"])))
         result_dict[key] = record
     return [result_dict[k] for k in keys]
@@ -134,10 +139,10 @@ async def task_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
         JOIN project_{project_name}.hierarchy AS hierarchy
         ON hierarchy.id = tasks.folder_id
 
-        WHERE tasks.id IN {SQLTool.id_array([k[1] for k in keys])}
+        WHERE tasks.id = ANY($1::uuid[])
         """
 
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, get_entity_ids(keys)):
         key: KeyType = KeyType((project_name, str(record["id"])))
         result_dict[key] = record
     return [result_dict[k] for k in keys]
@@ -167,10 +172,10 @@ async def workfile_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
         JOIN project_{project_name}.hierarchy AS hierarchy
         ON hierarchy.id = tasks.folder_id
 
-        WHERE workfiles.id IN {SQLTool.id_array([k[1] for k in keys])}
+        WHERE workfiles.id = ANY($1::uuid[])
         """
 
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, get_entity_ids(keys)):
         key: KeyType = KeyType((project_name, str(record["id"])))
         result_dict[key] = record
     return [result_dict[k] for k in keys]
@@ -222,10 +227,10 @@ async def version_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
         JOIN project_{project_name}.hierarchy AS hierarchy
         ON hierarchy.id = p.folder_id
 
-        WHERE v.id IN {SQLTool.id_array([k[1] for k in keys])}
+        WHERE v.id = ANY($1::uuid[])
         """
 
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, get_entity_ids(keys)):
         key: KeyType = KeyType((project_name, str(record["id"])))
         result_dict[key] = record
     return [result_dict[k] for k in keys]
@@ -275,11 +280,11 @@ async def latest_version_loader(keys: list[KeyType]) -> list[dict[str, Any] | No
         WHERE v.id IN (
             SELECT l.ids[array_upper(l.ids, 1)]
             FROM project_{project_name}.version_list as l
-            WHERE l.product_id IN {SQLTool.id_array([k[1] for k in keys])}
+            WHERE l.product_id = ANY($1::uuid[])
         )
         """
 
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, get_entity_ids(keys)):
         key: KeyType = KeyType((project_name, str(record["product_id"])))
         result_dict[key] = record
     return [result_dict[k] for k in keys]
@@ -313,10 +318,10 @@ async def representation_loader(keys: list[KeyType]) -> list[dict[str, Any] | No
         JOIN project_{project_name}.hierarchy AS hierarchy
         ON hierarchy.id = p.folder_id
 
-        WHERE r.id IN {SQLTool.id_array([k[1] for k in keys])}
+        WHERE r.id = ANY($1::uuid[])
         """
 
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, get_entity_ids(keys)):
         key: KeyType = KeyType((project_name, str(record["id"])))
         result_dict[key] = record
     return [result_dict[k] for k in keys]
@@ -326,7 +331,7 @@ async def user_loader(keys: list[str]) -> list[dict[str, Any] | None]:
     """Load a list of user records by their names."""
 
     result_dict = dict.fromkeys(keys)
-    query = f"SELECT * FROM public.users WHERE name IN {SQLTool.array(keys)}"
-    async for record in Postgres.iterate(query):
+    query = "SELECT * FROM public.users WHERE name = ANY($1)"
+    async for record in Postgres.iterate(query, keys):
         result_dict[record["name"]] = record
     return [result_dict[k] for k in keys]
@@ -0,0 +1,39 @@
+import inspect
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from graphql import GraphQLResolveInfo
+from strawberry.extensions import SchemaExtension
+
+from ayon_server.lib.runtime_metrics import graphql_resolver_duration
+
+
+class ResolverTimingExtension(SchemaExtension):
+    """Record execution times of asynchronous field resolvers.
+
+    Plain attribute access of the nodes is not measured,
+    so only the resolvers doing actual work (database queries,
+    dataloaders...) appear in the runtime metrics.
+    """
+
+    def resolve(
+        self,
+        _next: Callable[..., Any],
+        root: Any,
+        info: GraphQLResolveInfo[Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        result = _next(root, info, *args, **kwargs)
+        if not inspect.isawaitable(result):
+            return result
+        field = f"{info.parent_type.name}.{info.field_name}"
+        return self._measure(result, field)
+
+    async def _measure(self, awaitable: Awaitable[Any], field: str) -> Any:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            graphql_resolver_duration.observe(time.perf_counter() - start, field)
@@ -36,7 +36,7 @@ async def get_activities(
     changed_after: str | None = None,
 ) -> ActivitiesConnection:
     project_name = root.project_name
-    project = await ProjectEntity.load(project_name)
+    project = await ProjectEntity.load(project_name, readonly=True)
     info.context["project"] = project
 
     user = info.context["user"]
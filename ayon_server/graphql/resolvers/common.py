@@ -9,6 +9,7 @@ from ayon_server.access.utils import folder_access_list
 from ayon_server.exceptions import ForbiddenException
 from ayon_server.graphql.types import Info, PageInfo
 from ayon_server.lib.postgres import Postgres
+from ayon_server.utils import SQLArgs
 
 from .pagination import encode_cursor
 
@@ -138,8 +139,12 @@ async def resolve(
     last: int | None = None,
     context: dict[str, Any] | None = None,
     order_by: list[str] | None = None,
+    args: SQLArgs | None = None,
 ) -> R:
-    """Return a connection object from a query."""
+    """Return a connection object from a query.
+
+    `args` holds values of the query placeholders (see SQLArgs).
+    """
 
     if first is not None:
         count = first
@@ -149,7 +154,7 @@ async def resolve(
         count = first = DEFAULT_PAGE_SIZE
 
     edges: list[Any] = []
-    async for record in Postgres.iterate(query):
+    async for record in Postgres.iterate(query, *(args or ())):
         # Create a standard dictionary from the record
         record_dict = dict(record)
 
@@ -58,7 +58,7 @@ async def get_entity_lists(
     project_name = root.project_name
     sql_conditions = []
 
-    project = await ProjectEntity.load(project_name)
+    project = await ProjectEntity.load(project_name, readonly=True)
     user = info.context["user"]
     info.context["project"] = project
 
@@ -15,7 +15,7 @@ from ayon_server.types import (
     validate_status_list,
     validate_type_name_list,
 )
-from ayon_server.utils import EntityID, SQLTool, slugify
+from ayon_server.utils import EntityID, SQLArgs, SQLTool, slugify
 
 from .common import (
     ARGAfter,
@@ -106,7 +106,7 @@ async def get_folders(
     """Return a list of folders."""
 
     project_name = root.project_name
-    project = await ProjectEntity.load(project_name)
+    project = await ProjectEntity.load(project_name, readonly=True)
     fields = FieldInfo(info, ["folders.edges.node", "folder"])
 
     if info.context["user"].is_guest:
@@ -153,6 +153,7 @@ async def get_folders(
     ]
     sql_group_by = ["folders.id", "pr.attrib", "ex.attrib", "hierarchy.path"]
     sql_conditions = []
+    sql_args = SQLArgs()
     sql_having = []
 
     access_list = await create_folder_access_list(root, info)
@@ -260,14 +261,14 @@ async def get_folders(
     if ids is not None:
         if not ids:
             return FoldersConnection()
-        sql_conditions.append(f"folders.id IN {SQLTool.id_array(ids)}")
+        sql_conditions.append(f"folders.id = ANY({sql_args.ids(ids)})")
 
     if parent_id is not None:
         # Still used. do not remove!
         sql_conditions.append(
             "folders.parent_id IS NULL"
             if parent_id == "root"
-            else f" folders.parent_id = '{EntityID.parse(parent_id)}'"
+            else f"folders.parent_id = {sql_args.add(EntityID.parse(parent_id))}"
         )
 
     if parent_ids is not None:
@@ -281,7 +282,7 @@ async def get_folders(
             lconds.append("folders.parent_id IS NULL")
 
         if pids_set:
-            lconds.append(f"folders.parent_id IN {SQLTool.id_array(list(pids_set))}")
+            lconds.append(f"folders.parent_id = ANY({sql_args.ids(list(pids_set))})")
 
         if lconds:
             sql_conditions.append(f"({ ' OR '.join(lconds) })")
@@ -482,6 +483,7 @@ async def get_folders(
         last=last,
         order_by=order_by,
         context=info.context,
+        args=sql_args,
     )
 
 
@@ -27,7 +27,7 @@ from ayon_server.types import (
     validate_status_list,
     validate_type_name_list,
 )
-from ayon_server.utils import SQLTool, slugify
+from ayon_server.utils import SQLArgs, SQLTool, slugify
 
 SORT_OPTIONS = {
     "name": "products.name",
@@ -99,20 +99,21 @@ async def get_products(
         "products.creation_order AS creation_order",
     ]
     sql_conditions = []
+    sql_args = SQLArgs()
     sql_joins = []
 
     if ids is not None:
         if not ids:
             return ProductsConnection()
-        sql_conditions.append(f"products.id IN {SQLTool.id_array(ids)}")
+        sql_conditions.append(f"products.id = ANY({sql_args.ids(ids)})")
 
     if folder_ids is not None:
         if not folder_ids:
             return ProductsConnection()
-        sql_conditions.append(f"products.folder_id IN {SQLTool.id_array(folder_ids)}")
+        sql_conditions.append(f"products.folder_id = ANY({sql_args.ids(folder_ids)})")
     elif root.__class__.__name__ == "FolderNode":
         # cannot use isinstance here because of circular imports
-        sql_conditions.append(f"products.folder_id = '{root.id}'")
+        sql_conditions.append(f"products.folder_id = {sql_args.add(root.id)}")
 
     if names is not None:
         if not names:
@@ -347,6 +348,7 @@ async def get_products(
         last=last,
         order_by=order_by,
         context=info.context,
+        args=sql_args,
     )
 
 
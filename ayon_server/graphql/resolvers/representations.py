@@ -22,7 +22,7 @@ from ayon_server.graphql.resolvers.pagination import create_pagination
 from ayon_server.graphql.types import Info
 from ayon_server.sqlfilter import QueryFilter, build_filter
 from ayon_server.types import validate_name_list, validate_status_list
-from ayon_server.utils import SQLTool
+from ayon_server.utils import SQLArgs, SQLTool
 from ayon_server.utils.strings import slugify
 
 
@@ -78,21 +78,22 @@ async def get_representations(
 
     sql_joins = []
     sql_conditions = []
+    sql_args = SQLArgs()
 
     if ids is not None:
         if not ids:
             return RepresentationsConnection()
-        sql_conditions.append(f"representations.id IN {SQLTool.id_array(ids)}")
+        sql_conditions.append(f"representations.id = ANY({sql_args.ids(ids)})")
 
     if version_ids is not None:
         if not version_ids:
             return RepresentationsConnection()
         sql_conditions.append(
-            f"representations.version_id IN {SQLTool.id_array(version_ids)}"
+            f"representations.version_id = ANY({sql_args.ids(version_ids)})"
         )
     elif root.__class__.__name__ == "VersionNode":
         # cannot use isinstance here because of circular imports
-        sql_conditions.append(f"representations.version_id = '{root.id}'")
+        sql_conditions.append(f"representations.version_id = {sql_args.add(root.id)}")
 
     if names is not None:
         if not names:
@@ -237,6 +238,7 @@ async def get_representations(
         last=last,
         order_by=order_by,
         context=info.context,
+        args=sql_args,
     )
 
 
@@ -33,7 +33,7 @@ from ayon_server.types import (
     validate_type_name_list,
     validate_user_name_list,
 )
-from ayon_server.utils import SQLTool, slugify
+from ayon_server.utils import SQLArgs, SQLTool, slugify
 
 from .pagination import create_pagination
 from .sorting import (
@@ -171,7 +171,7 @@ async def get_tasks(
         return TasksConnection(edges=[])
 
     project_name = root.project_name
-    project = await ProjectEntity.load(project_name)
+    project = await ProjectEntity.load(project_name, readonly=True)
     fields = FieldInfo(info, ["tasks.edges.node", "task"])
     use_folder_query = False
 
@@ -181,6 +181,7 @@ async def get_tasks(
 
     sql_cte = []
     sql_conditions = []
+    sql_args = SQLArgs()
 
     sql_columns = [
         "tasks.id AS id",
@@ -234,7 +235,7 @@ async def get_tasks(
     if ids is not None:
         if not ids:
             return TasksConnection()
-        sql_conditions.append(f"tasks.id IN {SQLTool.id_array(ids)}")
+        sql_conditions.append(f"tasks.id = ANY({sql_args.ids(ids)})")
 
     if folder_ids is not None:
         if not folder_ids:
@@ -246,7 +247,7 @@ async def get_tasks(
                 f"""
                 top_folder_paths AS (
                     SELECT path FROM project_{project_name}.hierarchy
-                    WHERE id IN {SQLTool.id_array(folder_ids)}
+                    WHERE id = ANY({sql_args.ids(folder_ids)})
                 )
                 """
             )
@@ -272,11 +273,11 @@ async def get_tasks(
             )
 
         else:
-            sql_conditions.append(f"tasks.folder_id IN {SQLTool.id_array(folder_ids)}")
+            sql_conditions.append(f"tasks.folder_id = ANY({sql_args.ids(folder_ids)})")
 
     elif root.__class__.__name__ == "FolderNode":
         # cannot use isinstance here because of circular imports
-        sql_conditions.append(f"tasks.folder_id = '{root.id}'")
+        sql_conditions.append(f"tasks.folder_id = {sql_args.add(root.id)}")
 
     if names is not None:
         if not names:
@@ -549,6 +550,7 @@ FROM project_{project_name}.tasks AS tasks
         last=last,
         order_by=order_by,
         context=info.context,
+        args=sql_args,
     )
 
 
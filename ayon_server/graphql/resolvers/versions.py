@@ -27,7 +27,7 @@ from ayon_server.types import (
     validate_status_list,
     validate_user_name_list,
 )
-from ayon_server.utils import SQLTool, slugify
+from ayon_server.utils import SQLArgs, SQLTool, slugify
 
 SORT_OPTIONS = {
     "version": "versions.version",
@@ -132,6 +132,7 @@ async def get_versions(
         )
 
     sql_conditions = []
+    sql_args = SQLArgs()
     sql_joins = []
 
     needs_hierarchy = False
@@ -143,7 +144,7 @@ async def get_versions(
     if ids is not None:
         if not ids:
             return VersionsConnection()
-        sql_conditions.append(f"versions.id IN {SQLTool.id_array(ids)}")
+        sql_conditions.append(f"versions.id = ANY({sql_args.ids(ids)})")
     if version:
         sql_conditions.append(f"versions.version = {version}")
 
@@ -173,14 +174,14 @@ async def get_versions(
     if product_ids is not None:
         if not product_ids:
             return VersionsConnection()
-        sql_conditions.append(f"versions.product_id IN {SQLTool.id_array(product_ids)}")
+        sql_conditions.append(f"versions.product_id = ANY({sql_args.ids(product_ids)})")
     elif root.__class__.__name__ == "ProductNode":
-        sql_conditions.append(f"versions.product_id = '{root.id}'")
+        sql_conditions.append(f"versions.product_id = {sql_args.add(root.id)}")
 
     if task_ids:
-        sql_conditions.append(f"versions.task_id IN {SQLTool.id_array(task_ids)}")
+        sql_conditions.append(f"versions.task_id = ANY({sql_args.ids(task_ids)})")
     elif root.__class__.__name__ == "TaskNode":
-        sql_conditions.append(f"versions.task_id = '{root.id}'")
+        sql_conditions.append(f"versions.task_id = {sql_args.add(root.id)}")
 
     if latestOnly:
         sql_conditions.append(
@@ -359,6 +360,7 @@ async def get_versions(
         last=last,
         order_by=order_by,
         context=info.context,
+        args=sql_args,
     )
 
 
@@ -21,7 +21,7 @@ from ayon_server.graphql.resolvers.common import (
 from ayon_server.graphql.resolvers.pagination import create_pagination
 from ayon_server.graphql.types import Info
 from ayon_server.types import validate_name_list, validate_status_list
-from ayon_server.utils import SQLTool, slugify
+from ayon_server.utils import SQLArgs, SQLTool, slugify
 
 SORT_OPTIONS = {
     "name": "workfiles.name",
@@ -85,19 +85,20 @@ async def get_workfiles(
 
     # sql_joins = []
     sql_conditions = []
+    sql_args = SQLArgs()
     sql_joins = []
 
     if ids is not None:
         if not ids:
             return WorkfilesConnection()
-        sql_conditions.append(f"workfiles.id IN {SQLTool.id_array(ids)}")
+        sql_conditions.append(f"workfiles.id = ANY({sql_args.ids(ids)})")
 
     if task_ids is not None:
         if not task_ids:
             return WorkfilesConnection()
-        sql_conditions.append(f"workfiles.task_id IN {SQLTool.id_array(task_ids)}")
+        sql_conditions.append(f"workfiles.task_id = ANY({sql_args.ids(task_ids)})")
     elif root.__class__.__name__ == "TaskNode":
-        sql_conditions.append(f"workfiles.task_id = '{root.id}'")
+        sql_conditions.append(f"workfiles.task_id = {sql_args.add(root.id)}")
 
     if paths is not None:
         if not paths:
@@ -211,6 +212,7 @@ async def get_workfiles(
         last=last,
         order_by=order_by,
         context=info.context,
+        args=sql_args,
     )
 
 
@@ -1,15 +1,63 @@
+"""Project folder list cache
+
+The folder list of each project is cached in Redis as a set of
+per-folder records (see the Storage section below). It is used by
+the folder list endpoint and it is rebuilt when the cache does not exist.
+
+Instead of rebuilding the whole cache after every change, entity
+events created by operations may be applied to the cached structure
+using `update_hierarchy_cache`. Only the affected folders are queried
+from the database and patched in the cached list. When the cache
+does not exist, the affected set is too large, or the incremental
+update fails, the full rebuild is used as a fallback.
+
+`verify_hierarchy_cache` compares the cached structure with a fresh
+build and repairs the cache if they differ.
+"""
+
 import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
+from ayon_server.config import ayonconfig
+from ayon_server.exceptions import ServiceUnavailableException
 from ayon_server.lib.postgres import Postgres
 from ayon_server.lib.redis import Redis
-from ayon_server.logging import logger
-from ayon_server.utils import json_dumps
+from ayon_server.logging import log_traceback, logger
+from ayon_server.utils import camelize, create_hash, json_dumps, json_loads
 
+HIERARCHY_CACHE_TTL = 3600
 
-async def rebuild_hierarchy_cache(project_name: str) -> list[dict[str, Any]]:
-    start_time = time.monotonic()
-    query = f"""
+# Writers of the cache are serialized across all server processes,
+# so an incremental update never patches a list that is being replaced
+# by a rebuild (or by another update) at the same time.
+# The lock expires on its own if the holder dies.
+NS_LOCK = "project-folder-lock"
+HIERARCHY_CACHE_LOCK_TIMEOUT = 60
+
+
+def _build_query(project_name: str, partial: bool = False) -> str:
+    """Return the folder list query.
+
+    When `partial` is True, the query is limited to the folders
+    whose ids are passed as the first argument and it also
+    resolves `has_children` for the selected folders.
+    """
+
+    reviewables_cond = "WHERE p.folder_id = ANY($1)" if partial else ""
+    closure_cond = "WHERE id = ANY($1)" if partial else ""
+    folder_cond = "WHERE f.id = ANY($1)" if partial else ""
+    has_children_col = (
+        f""",
+            EXISTS (
+                SELECT 1 FROM project_{project_name}.folders c
+                WHERE c.parent_id = f.id
+            ) AS has_children"""
+        if partial
+        else ""
+    )
+
+    return f"""
         WITH RECURSIVE reviewables AS (
             SELECT p.folder_id AS folder_id
             FROM project_{project_name}.activity_feed af
@@ -19,11 +67,13 @@ async def rebuild_hierarchy_cache(project_name: str) -> list[dict[str, Any]]:
             AND  af.activity_type = 'reviewable'
             INNER JOIN project_{project_name}.products p
             ON p.id = v.product_id
+            {reviewables_cond}
         ),
 
         folder_closure AS (
             SELECT id AS ancestor_id, id AS descendant_id
             FROM project_{project_name}.folders
+            {closure_cond}
             UNION ALL
             SELECT fc.ancestor_id, f.id AS descendant_id
             FROM folder_closure fc
@@ -55,6 +105,7 @@ async def rebuild_hierarchy_cache(project_name: str) -> list[dict[str, Any]]:
             array_agg(tasks.name) AS task_names,
             (fwv.ancestor_id IS NOT NULL)::BOOLEAN AS has_versions,
             (r.folder_id IS NOT NULL)::BOOLEAN AS has_reviewables
+            {has_children_col}
 
         FROM project_{project_name}.folders f
 
@@ -70,50 +121,615 @@ async def rebuild_hierarchy_cache(project_name: str) -> list[dict[str, Any]]:
         LEFT JOIN reviewables r
         ON r.folder_id = f.id
 
+        {folder_cond}
+
         GROUP BY f.id, ea.attrib, ea.path, fwv.ancestor_id, r.folder_id
     """
 
+
+def _process_row(row: Any) -> dict[str, Any]:
+    return {
+        "id": row["id"],
+        "path": row["path"],
+        "parent_id": row["parent_id"],
+        "parents": row["path"].strip("/").split("/")[:-1],
+        "name": row["name"],
+        "label": row["label"],
+        "folder_type": row["folder_type"],
+        "has_tasks": row["task_count"] > 0,
+        "task_names": row["task_names"] if row["task_names"] != [None] else [],
+        "status": row["status"],
+        "attrib": row["all_attrib"],
+        "tags": row["tags"],
+        "own_attrib": list(row["attrib"].keys()),
+        "has_reviewables": row["has_reviewables"],
+        "has_versions": row["has_versions"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+    }
+
+
+async def _load_hierarchy(project_name: str) -> list[dict[str, Any]]:
+    """Load the complete folder list of the project from the database."""
     result = []
     ids_with_children = set()
     async with Postgres.transaction():
-        # Since this is ALWAYS called after rebuild_inherited_attributes,
-        # we don't need to refresh materialized views here.
-        stmt = await Postgres.prepare(query)
+        # Hierarchy table is maintained by triggers and this is
+        # ALWAYS called after rebuild_inherited_attributes,
+        # so both tables are up to date here.
+        stmt = await Postgres.prepare(_build_query(project_name))
         async for row in stmt.cursor():
-            result.append(
-                {
-                    "id": row["id"],
-                    "path": row["path"],
-                    "parent_id": row["parent_id"],
-                    "parents": row["path"].strip("/").split("/")[:-1],
-                    "name": row["name"],
-                    "label": row["label"],
-                    "folder_type": row["folder_type"],
-                    "has_tasks": row["task_count"] > 0,
-                    "task_names": row["task_names"]
-                    if row["task_names"] != [None]
-                    else [],
-                    "status": row["status"],
-                    "attrib": row["all_attrib"],
-                    "tags": row["tags"],
-                    "own_attrib": list(row["attrib"].keys()),
-                    "has_reviewables": row["has_reviewables"],
-                    "has_versions": row["has_versions"],
-                    "created_at": row["created_at"],
-                    "updated_at": row["updated_at"],
-                }
-            )
+            result.append(_process_row(row))
             if row["parent_id"] is not None:
                 ids_with_children.add(row["parent_id"])
 
     for folder in result:
         folder["has_children"] = folder["id"] in ids_with_children
+    return result
+
+
+async def _load_folders(
+    project_name: str,
+    folder_ids: set[str],
+) -> dict[str, dict[str, Any]]:
+    """Load the cache records of the given folders from the database."""
+    result = {}
+    query = _build_query(project_name, partial=True)
+    async for row in Postgres.iterate(query, list(folder_ids)):
+        record = _process_row(row)
+        record["has_children"] = row["has_children"]
+        result[record["id"]] = record
+    return result
+
+
+#
+# Storage
+#
+# Each folder is stored as a separate field of two Redis hashes keyed
+# by the folder id. `project-folder-list` contains the folder record
+# without attributes (in camelCase, as returned by the API) and
+# `project-folder-attrib` contains `attrib` and `ownAttrib` of the folder.
+# This allows readers to skip attributes when they don't need them
+# and writers to update individual folders.
+#
+# `project-folder-version` contains a unique stamp which changes after every
+# write, so readers keeping a parsed copy of the list can tell whether
+# it is still current. Its presence marks the cache as existing
+# (a project without folders has no hashes). All three keys are written
+# in a single transaction and always share the same expiration time.
+#
+
+NS_LIST = "project-folder-list"
+NS_ATTRIB = "project-folder-attrib"
+NS_VERSION = "project-folder-version"
+
+_camelized: dict[str, str] = {}
+
+
+def _serialize(record: dict[str, Any]) -> tuple[str, str]:
+    """Return serialized base record and attributes of a folder."""
+    base: dict[str, Any] = {}
+    for key, value in record.items():
+        if key in ("attrib", "own_attrib"):
+            continue
+        if key not in _camelized:
+            _camelized[key] = camelize(key)
+        base[_camelized[key]] = value
+    attrib = {"attrib": record["attrib"], "ownAttrib": record["own_attrib"]}
+    return json_dumps(base), json_dumps(attrib)
+
+
+async def _store(
+    project_name: str,
+    records: dict[str, dict[str, Any]],
+    removed: set[str] | None = None,
+) -> None:
+    """Write folder records to the cache and set a new version.
+
+    When `removed` is None, the whole cached folder list is replaced.
+    Otherwise the given records are updated and the removed folders
+    are deleted from the cached list.
+    """
+    base_map: dict[str, str | bytes] = {}
+    attrib_map: dict[str, str | bytes] = {}
+    for folder_id, record in records.items():
+        base_map[folder_id], attrib_map[folder_id] = _serialize(record)
+
+    # Version stamp is never reused (unlike a counter, which restarts
+    # when the key expires or is cleared), so an in-process copy
+    # of an older list never matches a newer cache.
+    version = create_hash()
+
+    async with Redis.transaction() as tx:
+        for ns, mapping in ((NS_LIST, base_map), (NS_ATTRIB, attrib_map)):
+            if removed is None:
+                tx.delete(ns, project_name)
+            else:
+                tx.hdel(ns, project_name, *removed)
+            tx.hset(ns, project_name, mapping)
+            tx.expire(ns, project_name, HIERARCHY_CACHE_TTL)
+        tx.set(NS_VERSION, project_name, version, ttl=HIERARCHY_CACHE_TTL)
+
+
+async def _store_hierarchy(project_name: str, records: list[dict[str, Any]]) -> None:
+    """Replace the cached folder list of the project."""
+    await _store(project_name, {record["id"]: record for record in records})
+
+
+async def _store_folders(
+    project_name: str,
+    records: dict[str, dict[str, Any]],
+    removed: set[str],
+) -> None:
+    """Update individual folders in the cached folder list."""
+    await _store(project_name, records, removed)
 
-    await Redis.set("project-folders", project_name, json_dumps(result), 3600)
+
+async def get_hierarchy_cache_version(project_name: str) -> str | None:
+    """Return the current version stamp of the cached folder list.
+
+    Returns None if the cache does not exist.
+    """
+    version = await Redis.get(NS_VERSION, project_name)
+    if version is None:
+        return None
+    return version.decode("ascii") if isinstance(version, bytes) else str(version)
+
+
+async def load_hierarchy_cache(
+    project_name: str,
+    *,
+    attrib: bool = True,
+    folder_ids: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Return cached folders of the project (camelCase).
+
+    When `attrib` is False, `attrib` and `ownAttrib` keys are not loaded.
+    When `folder_ids` is provided, only the given folders are returned.
+    """
+    if folder_ids is None:
+        base_map = await Redis.hgetall(NS_LIST, project_name)
+        ids = list(base_map.keys())
+        base_values = list(base_map.values())
+    else:
+        ids = folder_ids
+        base_values = await Redis.hmget(NS_LIST, project_name, ids)
+
+    if attrib:
+        attrib_values = await Redis.hmget(NS_ATTRIB, project_name, ids)
+    else:
+        attrib_values = [None] * len(ids)
+
+    result = []
+    for base_value, attrib_value in zip(base_values, attrib_values, strict=True):
+        if base_value is None:
+            continue
+        record = json_loads(base_value)
+        if attrib_value is not None:
+            record.update(json_loads(attrib_value))
+        result.append(record)
+    return result
+
+
+async def clear_hierarchy_cache(project_name: str) -> None:
+    """Remove the cached folder list of the project."""
+    async with Redis.transaction() as tx:
+        tx.delete(NS_VERSION, project_name)
+        tx.delete(NS_LIST, project_name)
+        tx.delete(NS_ATTRIB, project_name)
+
+
+async def _rebuild(project_name: str) -> None:
+    start_time = time.monotonic()
+    result = await _load_hierarchy(project_name)
+    await _store_hierarchy(project_name, result)
     elapsed_time = time.monotonic() - start_time
     logger.trace(
         f"Rebuilt hierarchy cache for {project_name} "
         f"with {len(result)} folders "
         f"in {elapsed_time:.2f}s"
     )
+
+
+async def _locked(
+    project_name: str,
+    func: Callable[..., Awaitable[None]],
+    *args: Any,
+) -> None:
+    """Run a cache writer while holding the project cache lock.
+
+    All reads of the writer are executed on the primary database.
+
+    If the lock cannot be held (another writer got stuck, or this one
+    took longer than the lock timeout), the cache is cleared instead,
+    so the next reader builds it from scratch.
+    """
+    try:
+        async with Redis.lock(
+            NS_LOCK,
+            project_name,
+            timeout=HIERARCHY_CACHE_LOCK_TIMEOUT,
+            blocking_timeout=HIERARCHY_CACHE_LOCK_TIMEOUT,
+        ):
+            with Postgres.primary():
+                await func(project_name, *args)
+    except ServiceUnavailableException:
+        logger.warning(f"Unable to lock hierarchy cache of {project_name}")
+        await clear_hierarchy_cache(project_name)
+
+
+async def rebuild_hierarchy_cache(project_name: str) -> None:
+    """Build the cached folder list of the project from the database."""
+    await _locked(project_name, _rebuild)
+
+
+#
+# Incremental maintenance
+#
+
+
+def _ancestors(folder_id: str | None, folders: dict[str, dict[str, Any]]) -> set[str]:
+    """Return the ids of the folder and all its cached ancestors."""
+    result: set[str] = set()
+    while folder_id and folder_id not in result:
+        result.add(folder_id)
+        folder = folders.get(folder_id)
+        if folder is None:
+            break
+        folder_id = folder["parentId"]
+    return result
+
+
+def _descendants(folder_id: str, folders: dict[str, dict[str, Any]]) -> set[str]:
+    """Return the ids of the folder and all its cached descendants."""
+    if (folder := folders.get(folder_id)) is None:
+        return {folder_id}
+    prefix = f"{folder['path'].strip('/')}/"
+    result = {folder_id}
+    for fid, f in folders.items():
+        if f["path"].strip("/").startswith(prefix):
+            result.add(fid)
     return result
+
+
+async def _entity_folder_ids(
+    project_name: str,
+    entity_type: str,
+    entity_ids: set[str],
+) -> set[str]:
+    """Resolve ids of folders the given tasks, products or versions belong to."""
+    if not entity_ids:
+        return set()
+
+    if entity_type in ("task", "product"):
+        query = f"""
+            SELECT folder_id FROM project_{project_name}.{entity_type}s
+            WHERE id = ANY($1)
+        """
+    elif entity_type == "version":
+        query = f"""
+            SELECT p.folder_id FROM project_{project_name}.versions v
+            INNER JOIN project_{project_name}.products p ON p.id = v.product_id
+            WHERE v.id = ANY($1)
+        """
+    else:
+        return set()
+
+    res = await Postgres.fetch(query, list(entity_ids))
+    return {row["folder_id"] for row in res}
+
+
+# Folder change events that affect the path or inherited attributes
+# of the whole subtree
+
+SUBTREE_TOPICS = ("renamed", "parent_changed", "attrib_changed")
+
+
+async def _collect_changes(
+    project_name: str,
+    events: list[dict[str, Any]],
+    folders: dict[str, dict[str, Any]],
+) -> tuple[set[str], set[str], set[str]]:
+    """Translate entity events into per-folder deltas.
+
+    Returns a tuple of:
+    - ids of folders that need to be reloaded
+    - ids of folders whose ancestors need to be reloaded as well
+    - ids of folders that were removed from the project
+    """
+
+    refresh: set[str] = set()
+    refresh_with_ancestors: set[str] = set()
+    removed: set[str] = set()
+    resolve: dict[str, set[str]] = {"task": set(), "product": set(), "version": set()}
+
+    for event in events:
+        try:
+            _, entity_type, action = event["topic"].split(".", 2)
+        except ValueError:
+            continue
+        summary = event.get("summary") or {}
+        entity_id = summary.get("entityId")
+        parent_id = summary.get("parentId")
+        if not entity_id:
+            continue
+
+        if entity_type == "folder":
+            if action == "created":
+                refresh.add(entity_id)
+                if parent_id:
+                    refresh.add(parent_id)
+            elif action == "deleted":
+                removed |= _descendants(entity_id, folders)
+                if parent_id:
+                    refresh_with_ancestors.add(parent_id)
+            elif action in SUBTREE_TOPICS:
+                refresh |= _descendants(entity_id, folders)
+                if action == "parent_changed":
+                    # has_children and has_versions of the original parent
+                    if parent_id:
+                        refresh_with_ancestors.add(parent_id)
+            else:
+                refresh.add(entity_id)
+
+        elif entity_type == "task":
+            # tasks parentId is the folder id
+            if parent_id:
+                refresh.add(parent_id)
+            if action != "deleted":
+                resolve["task"].add(entity_id)
+
+        elif entity_type == "product":
+            if action not in ("created", "deleted", "folder_changed"):
+                continue
+            if parent_id:
+                refresh_with_ancestors.add(parent_id)
+            if action != "deleted":
+                resolve["product"].add(entity_id)
+
+        elif entity_type == "version":
+            if action not in ("created", "deleted"):
+                continue
+            if action == "deleted":
+                if parent_id:
+                    resolve["product"].add(parent_id)
+            else:
+                resolve["version"].add(entity_id)
+
+    for entity_type, entity_ids in resolve.items():
+        folder_ids = await _entity_folder_ids(project_name, entity_type, entity_ids)
+        if entity_type == "task":
+            refresh |= folder_ids
+        else:
+            refresh_with_ancestors |= folder_ids
+
+    return refresh - removed, refresh_with_ancestors - removed, removed
+
+
+async def _apply_changes(
+    project_name: str,
+    folders: dict[str, dict[str, Any]],
+    refresh: set[str],
+    refresh_with_ancestors: set[str],
+    removed: set[str],
+) -> bool:
+    """Patch the cached folder list.
+
+    `folders` is a map of the cached folders (without attributes).
+    Returns False if the change is too large and the cache
+    should be rebuilt instead.
+    """
+
+    for folder_id in refresh_with_ancestors:
+        refresh |= _ancestors(folder_id, folders)
+
+    if len(refresh) > ayonconfig.hierarchy_cache_rebuild_threshold:
+        return False
+
+    reloaded = await _load_folders(project_name, refresh) if refresh else {}
+
+    # When a folder was moved, its new parent and all the new ancestors
+    # need to be reloaded too (has_children, has_versions).
+
+    moved: set[str] = set()
+    for folder_id, record in reloaded.items():
+        if (original := folders.get(folder_id)) is None:
+            continue
+        if original["parentId"] != record["parent_id"]:
+            moved |= _ancestors(record["parent_id"], folders)
+            moved |= _ancestors(original["parentId"], folders)
+
+    if moved := moved - set(reloaded) - removed:
+        reloaded.update(await _load_folders(project_name, moved))
+
+    # Folders that were requested but no longer exist
+
+    for folder_id in refresh | moved:
+        if folder_id not in reloaded:
+            removed.add(folder_id)
+
+    await _store_folders(project_name, reloaded, removed & set(folders))
+    return True
+
+
+async def _update(
+    project_name: str,
+    events: list[dict[str, Any]] | None,
+    folder_ids: set[str] | None,
+) -> None:
+    start_time = time.monotonic()
+    if await get_hierarchy_cache_version(project_name) is None:
+        # nothing to update. it will be built by the next reader
+        return
+
+    try:
+        folders = {
+            f["id"]: f for f in await load_hierarchy_cache(project_name, attrib=False)
+        }
+        if events is not None:
+            refresh, with_ancestors, removed = await _collect_changes(
+                project_name, events, folders
+            )
+        else:
+            refresh, with_ancestors, removed = folder_ids or set(), set(), set()
+
+        if not (refresh or with_ancestors or removed):
+            return
+
+        success = await _apply_changes(
+            project_name,
+            folders,
+            refresh,
+            with_ancestors,
+            removed,
+        )
+    except Exception:
+        log_traceback("Unable to update hierarchy cache incrementally")
+        success = False
+
+    if not success:
+        # we already hold the lock
+        await _rebuild(project_name)
+        return
+
+    elapsed_time = time.monotonic() - start_time
+    logger.trace(
+        f"Updated hierarchy cache for {project_name} "
+        f"({len(refresh)} updated, {len(removed)} removed) "
+        f"in {elapsed_time:.2f}s"
+    )
+
+
+async def _update_cache(
+    project_name: str,
+    events: list[dict[str, Any]] | None = None,
+    folder_ids: set[str] | None = None,
+) -> None:
+    await _locked(project_name, _update, events, folder_ids)
+
+
+async def update_hierarchy_cache(
+    project_name: str,
+    events: list[dict[str, Any]],
+) -> None:
+    """Apply entity events to the cached folder list of the project.
+
+    Events are dicts with `topic` and `summary` keys, as created by
+    the operations layer (entity.*.created/changed/deleted).
+    If the cache does not exist, nothing happens - it will be built
+    on demand by the next reader.
+    """
+    if not events:
+        return
+
+    if not ayonconfig.hierarchy_cache_incremental:
+        await rebuild_hierarchy_cache(project_name)
+        return
+
+    await _update_cache(project_name, events=events)
+
+
+async def refresh_hierarchy_cache_entities(
+    project_name: str,
+    entity_type: str,
+    entity_ids: list[str],
+) -> None:
+    """Reload cached folders affected by the given entities.
+
+    Used when a change does not originate in an entity event
+    (for example a new reviewable is attached to a version).
+    """
+    if not ayonconfig.hierarchy_cache_incremental:
+        await rebuild_hierarchy_cache(project_name)
+        return
+
+    if entity_type == "folder":
+        folder_ids = set(entity_ids)
+    else:
+        folder_ids = await _entity_folder_ids(
+            project_name, entity_type, set(entity_ids)
+        )
+
+    await _update_cache(project_name, folder_ids=folder_ids)
+
+
+# Fields bumped by folder writes which do not produce a handled event
+# (the cache is not refreshed after them, so they are not compared)
+VOLATILE_FIELDS = ("updatedAt",)
+
+
+def _comparable(base: str) -> dict[str, Any]:
+    record = json_loads(base)
+    for key in VOLATILE_FIELDS:
+        record.pop(key, None)
+    return record
+
+
+async def _find_mismatches(
+    project_name: str,
+    fresh: list[dict[str, Any]],
+) -> set[str]:
+    """Return ids of folders whose cached records differ from `fresh`."""
+    fresh_map: dict[str, tuple[dict[str, Any], Any]] = {}
+    for folder in fresh:
+        base, attrib = _serialize(folder)
+        fresh_map[folder["id"]] = (_comparable(base), json_loads(attrib))
+
+    cached_base = await Redis.hgetall(NS_LIST, project_name)
+    cached_attrib = await Redis.hgetall(NS_ATTRIB, project_name)
+    cached_map = {
+        folder_id: (
+            _comparable(value),
+            json_loads(cached_attrib[folder_id])
+            if folder_id in cached_attrib
+            else None,
+        )
+        for folder_id, value in cached_base.items()
+    }
+
+    return {
+        folder_id
+        for folder_id in set(fresh_map) | set(cached_map)
+        if fresh_map.get(folder_id) != cached_map.get(folder_id)
+    }
+
+
+async def verify_hierarchy_cache(project_name: str, repair: bool = True) -> bool:
+    """Compare the cached folder list with a fresh build.
+
+    Returns True if the cache is consistent (or does not exist).
+    If `repair` is True, an inconsistent cache is replaced with
+    the fresh build.
+    """
+    if await get_hierarchy_cache_version(project_name) is None:
+        return True
+
+    fresh = await _load_hierarchy(project_name)
+    if not await _find_mismatches(project_name, fresh):
+        return True
+
+    # The difference may be caused by a writer updating the cache
+    # in the meantime. Check again while holding the cache lock,
+    # so the repair never overwrites a newer update.
+
+    # Stays False if the lock cannot be held (the cache is cleared then)
+    consistent = False
+
+    async def check(project_name: str) -> None:
+        nonlocal consistent
+        if await get_hierarchy_cache_version(project_name) is None:
+            consistent = True
+            return
+        fresh = await _load_hierarchy(project_name)
+        if not (mismatched := await _find_mismatches(project_name, fresh)):
+            consistent = True
+            return
+        logger.warning(
+            f"Hierarchy cache of {project_name} is inconsistent: "
+            f"{len(mismatched)} of {len(fresh)} folders differ"
+        )
+        if repair:
+            await _store_hierarchy(project_name, fresh)
+
+    await _locked(project_name, check)
+    return consistent
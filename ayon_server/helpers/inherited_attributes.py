@@ -5,8 +5,97 @@ from ayon_server.entities.core import attribute_library
 from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import logger
 
+# Folder events that require updating exported attributes of the subtree
+# (inherited attributes or paths of the folder and its descendants change)
+
+SUBTREE_TOPICS = (
+    "entity.folder.created",
+    "entity.folder.attrib_changed",
+    "entity.folder.renamed",
+    "entity.folder.parent_changed",
+)
+
+
+async def _get_project_attrib(project_name: str) -> dict[str, Any]:
+    project_attrib = attribute_library.project_defaults
+    res = await Postgres.fetch(
+        "SELECT attrib FROM public.projects WHERE name = $1", project_name
+    )
+    project_attrib.update(res[0]["attrib"])
+    return project_attrib
+
+
+def _filter_inheritable(project_attrib: dict[str, Any]) -> dict[str, Any]:
+    # Filter out non-inheritable and non-folder attributes
+    for attr_type in attribute_library["folder"]:
+        if attr_type["name"] not in project_attrib:
+            continue
+        if not attr_type.get("inherit", True):
+            del project_attrib[attr_type["name"]]
+    return project_attrib
+
+
+async def _rebuild_from(
+    project_name: str,
+    project_attrib: dict[str, Any],
+    root_ids: list[str] | None = None,
+) -> tuple[int, int]:
+    """Crawl the hierarchy and upsert changed exported attributes.
+
+    When `root_ids` are provided, only the given folders and their
+    descendants are crawled.
+
+    Returns a tuple of (crawled folders count, updated folders count)
+    """
+
+    # path: attrib_set cache to use when returning from child to parent
+    caching: dict[tuple[str, ...], dict[str, Any]] = {}
+
+    if root_ids is not None:
+        # Seed the cache with the exported attributes of the parents
+        # of the subtree roots, so the crawl can start in the middle
+        # of the hierarchy
+
+        res = await Postgres.fetch(
+            f"""
+            SELECT ph.path, pe.attrib
+            FROM project_{project_name}.folders f
+            INNER JOIN project_{project_name}.hierarchy ph
+            ON ph.id = f.parent_id
+            LEFT JOIN project_{project_name}.exported_attributes pe
+            ON pe.folder_id = f.parent_id
+            WHERE f.id = ANY($1)
+            """,
+            root_ids,
+        )
+        for row in res:
+            if row["attrib"] is None:
+                # Parent of the subtree is not exported yet.
+                # This shouldn't happen, but if it does, crawl everything.
+                logger.warning(
+                    f"Missing exported attributes of {row['path']} "
+                    f"in {project_name}. Rebuilding all inherited attributes."
+                )
+                root_ids = None
+                break
+            caching[tuple(row["path"].split("/"))] = row["attrib"]
+
+    if root_ids is None:
+        crawl_cond = ""
+    else:
+        crawl_cond = f"""
+            WHERE h.id IN (
+                WITH RECURSIVE descendants AS (
+                    SELECT id FROM project_{project_name}.folders
+                    WHERE id = ANY($1)
+                    UNION
+                    SELECT f.id FROM project_{project_name}.folders f
+                    INNER JOIN descendants d ON f.parent_id = d.id
+                )
+                SELECT id FROM descendants
+            )
+        """
 
-async def _rebuild_from(project_name: str, project_attrib: dict[str, Any]) -> None:
     st_crawl = await Postgres.prepare(
         f"""
         SELECT
@@ -17,6 +106,7 @@ async def _rebuild_from(project_name: str, project_attrib: dict[str, Any]) -> No
         ON h.id = f.id
         LEFT JOIN project_{project_name}.exported_attributes e
         ON h.id = e.folder_id
+        {crawl_cond}
         ORDER BY h.path ASC
         """
     )
@@ -32,13 +122,14 @@ async def _rebuild_from(project_name: str, project_attrib: dict[str, Any]) -> No
          """
     )
 
-    # path: attrib_set cache to use when returning from child to parent
-    caching: dict[tuple[str, ...], dict[str, Any]] = {}
-
     current_attrib_set: dict[str, Any] = {}
     buff: list[tuple[str, str, dict[str, Any]]] = []
+    crawled = 0
+    updated = 0
 
-    async for record in st_crawl.cursor():
+    crawl_args = [] if root_ids is None else [root_ids]
+    async for record in st_crawl.cursor(*crawl_args):
+        crawled += 1
         path_elements = tuple(record["path"].split("/"))
         if len(path_elements) == 1:
             current_attrib_set = project_attrib.copy()
@@ -62,6 +153,7 @@ async def _rebuild_from(project_name: str, project_attrib: dict[str, Any]) -> No
                     new_attrib_set,
                 )
             )
+            updated += 1
 
         if len(buff) > 100:
             await st_upsert.executemany(buff)
@@ -72,6 +164,8 @@ async def _rebuild_from(project_name: str, project_attrib: dict[str, Any]) -> No
     if buff:
         await st_upsert.executemany(buff)
 
+    return crawled, updated
+
 
 async def rebuild_inherited_attributes(
     project_name: str,
@@ -82,27 +176,68 @@ async def rebuild_inherited_attributes(
     start = time.monotonic()
 
     async with Postgres.transaction():
-        await Postgres.execute(
-            f"REFRESH MATERIALIZED VIEW project_{project_name}.hierarchy"
-        )
-
         if pattr is None:
-            project_attrib = attribute_library.project_defaults
-            res = await Postgres.fetch(
-                "SELECT attrib FROM public.projects WHERE name = $1", project_name
-            )
-            project_attrib.update(res[0]["attrib"])
+            project_attrib = await _get_project_attrib(project_name)
         else:
             project_attrib = pattr.copy()
 
-        # Filter out non-inheritable and non-folder attributes
-        for attr_type in attribute_library["folder"]:
-            if attr_type["name"] not in project_attrib:
-                continue
-            if not attr_type.get("inherit", True):
-                del project_attrib[attr_type["name"]]
+        _filter_inheritable(project_attrib)
+        crawled, updated = await _rebuild_from(project_name, project_attrib)
 
-        await _rebuild_from(project_name, project_attrib)
+    elapsed = time.monotonic() - start
+    logger.trace(
+        f"Rebuilt inherited attributes for {project_name} in {elapsed:.2f}s "
+        f"({updated} of {crawled} folders updated)"
+    )
+
+
+async def rebuild_inherited_attributes_subtree(
+    project_name: str,
+    folder_ids: list[str],
+) -> None:
+    """Rebuild inherited attributes of the given folders and their descendants.
+
+    Use this instead of rebuild_inherited_attributes when only a part
+    of the hierarchy has changed.
+    """
+    if not folder_ids:
+        return
+
+    start = time.monotonic()
+
+    async with Postgres.transaction():
+        project_attrib = await _get_project_attrib(project_name)
+        _filter_inheritable(project_attrib)
+        crawled, updated = await _rebuild_from(
+            project_name,
+            project_attrib,
+            root_ids=folder_ids,
+        )
 
     elapsed = time.monotonic() - start
-    logger.trace(f"Rebuilt inherited attributes for {project_name} in {elapsed:.2f}s")
+    logger.trace(
+        f"Rebuilt inherited attributes of {len(folder_ids)} subtrees "
+        f"in {project_name} in {elapsed:.2f}s "
+        f"({updated} of {crawled} folders updated)"
+    )
+
+
+async def update_inherited_attributes(
+    project_name: str,
+    events: list[dict[str, Any]],
+) -> None:
+    """Update exported attributes affected by the given folder events.
+
+    Events are dicts with `topic` and `summary` keys, as created by
+    the operations layer. Only subtrees of created, moved, renamed
+    or folders with changed attributes are crawled.
+    """
+    root_ids: list[str] = []
+    for event in events:
+        if event["topic"] not in SUBTREE_TOPICS:
+            continue
+        entity_id = (event.get("summary") or {}).get("entityId")
+        if entity_id and entity_id not in root_ids:
+            root_ids.append(entity_id)
+
+    await rebuild_inherited_attributes_subtree(project_name, root_ids)
@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING, Any
 
+from ayon_server.addons.settings_caching import clear_resolved_settings
 from ayon_server.config import ayonconfig
 from ayon_server.helpers.project_list import get_project_list
 from ayon_server.lib.postgres import Postgres
@@ -284,10 +285,12 @@ async def migrate_addon_settings(
     """
 
     async with Postgres.transaction():
-        return await _migrate_addon_settings(
+        events = await _migrate_addon_settings(
             source_addon,
             target_addon,
             source_variant,
             target_variant,
             with_projects,
         )
+    await clear_resolved_settings()
+    return events
@@ -1,18 +1,25 @@
 import asyncio
+import functools
+import io
 import os
+from collections.abc import Callable, Coroutine
+from typing import Any
 
 import aiofiles
 from fastapi import Response
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
 
 from ayon_server.api.files import image_response_from_bytes
+from ayon_server.config import ayonconfig
 from ayon_server.exceptions import (
     AyonException,
     NotFoundException,
-    ServiceUnavailableException,
     UnsupportedMediaException,
 )
 from ayon_server.files import Storages
 from ayon_server.helpers.mimetypes import is_image_mime_type, is_video_mime_type
+from ayon_server.helpers.thumbnails import calculate_scaled_size
 from ayon_server.lib.postgres import Postgres
 from ayon_server.lib.redis import Redis
 from ayon_server.logging import logger
@@ -21,8 +28,52 @@ REDIS_NS = "project.file_preview"
 FILE_PREVIEW_SIZE = (600, None)
 PREVIEW_CACHE_TTL = 3600 * 24
 
+# Image formats Pillow cannot decode. Previews are created by ffmpeg
+FFMPEG_IMAGE_MIME_TYPES = {"image/x-exr", "image/exr", "image/x-dpx", "image/dpx"}
 
-VIDEO_THUMBNAIL_STATUS = set()
+# Larger images on S3 are not downloaded to memory, but processed by ffmpeg
+# reading the file from a signed URL
+MAX_IN_MEMORY_IMAGE_SIZE = 100 * 1024 * 1024
+
+
+class SingleFlight:
+    """Run at most one coroutine per key at a time.
+
+    Concurrent callers requesting the same key wait for the running
+    coroutine and share its result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, asyncio.Task[bytes]] = {}
+
+    async def run(
+        self,
+        key: str,
+        factory: Callable[[], Coroutine[Any, Any, bytes]],
+    ) -> bytes:
+        if (task := self._tasks.get(key)) is None:
+            task = asyncio.create_task(factory())
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+        # Cancelling one of the callers (client disconnected)
+        # must not cancel the generation for the others
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Task[bytes]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when all callers are gone
+            task.exception()
+
+
+preview_flights = SingleFlight()
+
+# Limits the number of ffmpeg processes running at once
+preview_workers = asyncio.Semaphore(max(1, ayonconfig.preview_workers))
+
+# References to the running pre-generation tasks
+_pregeneration_tasks: set[asyncio.Task[None]] = set()
 
 
 async def create_video_thumbnail(
@@ -32,16 +83,22 @@ async def create_video_thumbnail(
 ) -> bytes:
     """Create a thumbnail image for a video file.
 
-    Returns the thumbnail image as bytes.
+    Returns the thumbnail image as bytes (empty if ffmpeg failed).
+    Requests for the same thumbnail share a single ffmpeg process.
     """
-    global VIDEO_THUMBNAIL_STATUS
 
-    if video_path in VIDEO_THUMBNAIL_STATUS:
-        print("Video thumbnail generation is in progress")
-        raise ServiceUnavailableException("Video thumbnail generation is in progress")
+    key = f"ffmpeg:{video_path}:{size}:{timestamp}"
+    return await preview_flights.run(
+        key, lambda: _run_ffmpeg(video_path, size, timestamp)
+    )
 
-    VIDEO_THUMBNAIL_STATUS.add(video_path)
-    try:
+
+async def _run_ffmpeg(
+    video_path: str,
+    size: tuple[int | None, int | None] | None = None,
+    timestamp: float | None = None,
+) -> bytes:
+    async with preview_workers:
         async with aiofiles.tempfile.NamedTemporaryFile(
             suffix=".jpg", delete=True
         ) as temp_file:
@@ -81,21 +138,58 @@ async def create_video_thumbnail(
             _, stderr = await proc.communicate()
 
             if proc.returncode != 0:
-                stderr_str = stderr.decode()
-                print(stderr_str, flush=True)
+                logger.warning(f"Failed to create a thumbnail: {stderr.decode()}")
                 return b""
 
             async with aiofiles.open(temp_path, "rb") as f:
                 image_bytes = await f.read()
 
         return image_bytes
-    finally:
-        VIDEO_THUMBNAIL_STATUS.remove(video_path)
+
+
+def _create_image_preview(
+    source: str | bytes,
+    size: tuple[int | None, int | None],
+) -> bytes:
+    with Image.open(io.BytesIO(source) if isinstance(source, bytes) else source) as img:
+        width, height = calculate_scaled_size(*img.size, *size)
+
+        # JPEG images are decoded at a reduced DCT scale
+        # which is still larger than the preview
+        img.draft("RGB", (width, height))
+
+        resampling = Image.LANCZOS  # type: ignore
+        preview = img.resize((width, height), resampling, reducing_gap=3.0)
+        if preview.mode != "RGB":
+            preview = preview.convert("RGB")
+
+        result = io.BytesIO()
+        preview.save(result, format="JPEG", quality=85)
+        return result.getvalue()
+
+
+async def create_image_preview(
+    source: str | bytes,
+    size: tuple[int | None, int | None] = FILE_PREVIEW_SIZE,
+) -> bytes:
+    """Create a JPEG preview of an image using Pillow.
+
+    `source` is either a path to a local file or the image bytes.
+    Raises `UnsupportedMediaException` if Pillow cannot decode the image.
+    """
+    async with preview_workers:
+        try:
+            return await run_in_threadpool(_create_image_preview, source, size)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise UnsupportedMediaException(f"Unable to decode the image: {e}") from e
 
 
 async def obtain_file_preview(project_name: str, file_id: str) -> bytes:
     """Return a preview image for a file as bytes.
 
+    Images are processed by Pillow; ffmpeg is used for videos
+    and for images Pillow is unable to decode.
+
     Raises:
         - UnsupportedMediaException if the mimetype is not supported
         for preview generation.
@@ -115,7 +209,15 @@ async def obtain_file_preview(project_name: str, file_id: str) -> bytes:
     file_record = res[0]
     file_data = file_record["data"] or {}
     expected_size = res[0]["size"]
-    mime_type = file_data.get("mime", "application/octet-stream")
+    mime_type = file_data.get("mime", "application/octet-stream").lower()
+
+    is_image = is_image_mime_type(mime_type)
+    if not (is_image or is_video_mime_type(mime_type)):
+        if mime_type not in FFMPEG_IMAGE_MIME_TYPES:
+            # TODO: return a generic preview image for other file types
+            raise UnsupportedMediaException(
+                "Preview mode is not supported for this file"
+            )
 
     # Get the file location
 
@@ -130,37 +232,61 @@ async def obtain_file_preview(project_name: str, file_id: str) -> bytes:
         if os.path.getsize(path) != expected_size:
             logger.warning(f"File size mismatch: {path}")
 
+        if is_image:
+            try:
+                return await create_image_preview(path)
+            except UnsupportedMediaException as e:
+                logger.debug(f"{e}. Using ffmpeg for {file_id}")
+
     elif storage.storage_type == "s3":
+        if is_image and expected_size <= MAX_IN_MEMORY_IMAGE_SIZE:
+            try:
+                image_bytes = await storage.read_file(file_id)
+            except FileNotFoundError as e:
+                raise NotFoundException("File not found") from e
+            try:
+                return await create_image_preview(image_bytes)
+            except UnsupportedMediaException as e:
+                logger.debug(f"{e}. Using ffmpeg for {file_id}")
+
         path = await storage.get_signed_url(file_id)
 
     else:
         raise AyonException("Unsupported storage type. This should not happen")
 
-    if is_video_mime_type(mime_type):
-        pvw_bytes = await create_video_thumbnail(path, FILE_PREVIEW_SIZE)
-        return pvw_bytes
+    return await create_video_thumbnail(path, FILE_PREVIEW_SIZE)
 
-    if is_image_mime_type(mime_type):
-        # async with aiofiles.open(path, "rb") as f:
-        #     image_bytes = await f.read()
-        #     pvw_bytes = await process_thumbnail(
-        #         image_bytes,
-        #         FILE_PREVIEW_SIZE,
-        #         format="JPEG",
-        #     )
-        #     return pvw_bytes
 
-        # TODO: unify. for now use ffmpeg for images as well (since it handles s3
-        pvw_bytes = await create_video_thumbnail(path, FILE_PREVIEW_SIZE)
-        return pvw_bytes
+async def load_file_preview(project_name: str, file_id: str) -> bytes:
+    """Return a preview image of a file from the project storage
 
-    # TODO: return a generic preview image for other file types
-    raise UnsupportedMediaException("Preview mode is not supported for this file")
+    or generate a new one (and store it). The result is cached in Redis.
+    """
+    storage = await Storages.project(project_name)
+    pvw_bytes: bytes | None = None
+
+    if ayonconfig.preview_persistent_cache:
+        try:
+            pvw_bytes = await storage.get_preview(file_id)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load preview of {file_id}: {e}")
 
+    if pvw_bytes is None:
+        pvw_bytes = await obtain_file_preview(project_name, file_id)
+        if pvw_bytes and ayonconfig.preview_persistent_cache:
+            try:
+                await storage.store_preview(file_id, pvw_bytes)
+            except Exception as e:
+                logger.warning(f"Failed to store preview of {file_id}: {e}")
+
+    key = f"{project_name}.{file_id}"
+    await Redis.set(REDIS_NS, key, pvw_bytes, ttl=PREVIEW_CACHE_TTL)
+    return pvw_bytes
 
-async def get_file_preview(
-    project_name: str, file_id: str, retries: int = 0
-) -> Response:
+
+async def get_file_preview(project_name: str, file_id: str) -> Response:
     """Return a preview image for a file.
 
     Uses the cache if available, otherwise generates a new preview and caches it.
@@ -173,13 +299,9 @@ async def get_file_preview(
     pvw_bytes = await Redis.get(REDIS_NS, key)
 
     if pvw_bytes is None:
-        try:
-            pvw_bytes = await obtain_file_preview(project_name, file_id)
-            await Redis.set(REDIS_NS, key, pvw_bytes, ttl=PREVIEW_CACHE_TTL)
-        except ServiceUnavailableException:
-            await asyncio.sleep(0.2)
-            if retries < 5:
-                return await get_file_preview(project_name, file_id, retries + 1)
+        pvw_bytes = await preview_flights.run(
+            key, lambda: load_file_preview(project_name, file_id)
+        )
 
     if pvw_bytes == b"":
         raise NotFoundException("File preview not available")
@@ -187,8 +309,33 @@ async def get_file_preview(
     return image_response_from_bytes(pvw_bytes)
 
 
+def schedule_file_preview(project_name: str, file_id: str, content_type: str) -> None:
+    """Generate the preview of a newly uploaded file in the background.
+
+    Only images and videos are processed. Errors are logged and ignored,
+    the preview is then generated when it is requested for the first time.
+    """
+    if not ayonconfig.preview_pregenerate:
+        return
+    if not (is_image_mime_type(content_type) or is_video_mime_type(content_type)):
+        return
+
+    task = asyncio.create_task(_pregenerate_file_preview(project_name, file_id))
+    _pregeneration_tasks.add(task)
+    task.add_done_callback(_pregeneration_tasks.discard)
+
+
+async def _pregenerate_file_preview(project_name: str, file_id: str) -> None:
+    file_id = file_id.replace("-", "")
+    key = f"{project_name}.{file_id}"
+    try:
+        await preview_flights.run(key, lambda: load_file_preview(project_name, file_id))
+    except Exception as e:
+        logger.debug(f"Failed to pregenerate preview of {file_id}: {e}")
+
+
 async def uncache_file_preview(project_name: str, file_id: str) -> None:
-    """Remove the preview image from the cache.
+    """Remove the preview image from the cache and the project storage.
 
     Silently ignore if the file is not found in the cache.
     """
@@ -197,3 +344,5 @@ async def uncache_file_preview(project_name: str, file_id: str) -> None:
         raise ValueError("Invalid file ID")
     key = f"{project_name}.{file_id}"
     await Redis.delete(REDIS_NS, key)
+    storage = await Storages.project(project_name)
+    await storage.delete_preview(file_id)
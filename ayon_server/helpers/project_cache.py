@@ -0,0 +1,97 @@
+"""In-process cache of project data
+
+Project data (ProjectEntity payload, anatomy...) is cached in Redis,
+but loading it still costs a Redis round-trip, parsing the JSON and
+validating the model on every request.
+
+This module adds the first cache tier in front of Redis: the most
+recently used entries are kept in the server process for
+`ayonconfig.project_cache_ttl` seconds. Along with the serialized
+payload, an entry may hold a parsed object shared by all readers
+(see ProjectEntity.load(readonly=True)).
+
+When a project is saved or deleted, `invalidate_project_cache` drops
+the local entries and publishes `server.project_changed` message,
+so the messaging worker of every server process drops its entries too.
+"""
+
+import collections
+import time
+from typing import Any
+
+from ayon_server.config import ayonconfig
+from ayon_server.lib.redis import Redis
+from ayon_server.logging import logger
+from ayon_server.utils import json_dumps
+
+
+class ProjectCacheEntry:
+    __slots__ = ("data", "shared", "created_at")
+
+    def __init__(self, data: str) -> None:
+        self.data = data
+        self.shared: Any = None
+        self.created_at = time.monotonic()
+
+
+class ProjectCache:
+    def __init__(self) -> None:
+        # (kind, project_name): entry
+        self.entries: collections.OrderedDict[tuple[str, str], ProjectCacheEntry] = (
+            collections.OrderedDict()
+        )
+        # incremented on every invalidation, so data loaded
+        # before the invalidation are not cached
+        self.generation: int = 0
+
+    def get(self, kind: str, project_name: str) -> ProjectCacheEntry | None:
+        key = (kind, project_name.lower())
+        if (entry := self.entries.get(key)) is None:
+            return None
+        if time.monotonic() - entry.created_at > ayonconfig.project_cache_ttl:
+            self.entries.pop(key, None)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        kind: str,
+        project_name: str,
+        data: str,
+        generation: int,
+    ) -> ProjectCacheEntry | None:
+        """Store serialized data loaded while the cache was at `generation`"""
+        if not ayonconfig.project_cache_ttl or generation != self.generation:
+            return None
+        entry = ProjectCacheEntry(data)
+        key = (kind, project_name.lower())
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > ayonconfig.project_cache_size:
+            self.entries.popitem(last=False)
+        return entry
+
+    def drop(self, project_name: str | None = None) -> None:
+        """Drop entries of the given project or all entries"""
+        self.generation += 1
+        if project_name is None:
+            self.entries.clear()
+            return
+        project_name = project_name.lower()
+        for key in list(self.entries):
+            if key[1] == project_name:
+                self.entries.pop(key, None)
+
+
+project_cache = ProjectCache()
+
+
+async def invalidate_project_cache(project_name: str) -> None:
+    """Drop cached data of the project in all server processes"""
+    project_cache.drop(project_name)
+    message = {"topic": "server.project_changed", "project": project_name}
+    try:
+        await Redis.publish(json_dumps(message))
+    except Exception as e:
+        logger.warning(f"Unable to publish project cache invalidation: {e}")
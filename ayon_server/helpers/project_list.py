@@ -1,3 +1,5 @@
+import asyncio
+import time
 from datetime import datetime
 from typing import Any
 
@@ -5,7 +7,7 @@ from ayon_server.exceptions import NotFoundException
 from ayon_server.lib.postgres import Postgres
 from ayon_server.lib.redis import Redis
 from ayon_server.types import OPModel
-from ayon_server.utils import get_nickname, json_dumps, json_loads
+from ayon_server.utils import create_hash, get_nickname, json_dumps, json_loads
 
 
 class ProjectListItem(OPModel):
@@ -17,6 +19,78 @@ class ProjectListItem(OPModel):
     role: str | None = None
 
 
+class ProjectIndex:
+    """In-process index of the project list.
+
+    The project list is stored in Redis along with a version stamp,
+    which changes every time the list is rebuilt. The index keeps
+    a parsed copy of the list with a case-insensitive lookup table,
+    so resolving a project name does not need to load and parse
+    the whole list.
+
+    The index is marked stale when the project list changes
+    (the messaging worker receives `server.project_list_changed`
+    message), and the version stamp is re-checked at least every
+    `check_interval` seconds, in case the message was missed or
+    the messaging worker does not run in this process.
+    """
+
+    check_interval = 5
+
+    def __init__(self) -> None:
+        self.version: str | None = None
+        self.projects: list[ProjectListItem] = []
+        self.by_name: dict[str, ProjectListItem] = {}
+        self.checked_at: float = 0
+        self.lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Force checking the version on the next access"""
+        self.checked_at = 0
+
+    def load(self, version: str, project_list: list[dict[str, Any]]) -> None:
+        self.projects = [ProjectListItem(**item) for item in project_list]
+        self.by_name = {project.name.lower(): project for project in self.projects}
+        self.version = version
+        self.checked_at = time.monotonic()
+
+    async def refresh(self, force: bool = False) -> None:
+        if not force and time.monotonic() - self.checked_at < self.check_interval:
+            return
+
+        async with self.lock:
+            if not force and time.monotonic() - self.checked_at < self.check_interval:
+                # refreshed by another task while waiting for the lock
+                return
+
+            version = await Redis.get("global", "project-list-version")
+            if version is not None:
+                version = version.decode("ascii")
+                if version == self.version:
+                    self.checked_at = time.monotonic()
+                    return
+                data = await Redis.get("global", "project-list")
+                if data is not None:
+                    self.load(version, json_loads(data))
+                    return
+
+            # Project list is not cached in Redis
+            await build_project_list()
+
+    async def get(self, project_name: str) -> ProjectListItem | None:
+        await self.refresh()
+        if (project := self.by_name.get(project_name.lower())) is not None:
+            return project
+
+        # Not found. The project might have been just created
+        # and the index has not been notified yet
+        await self.refresh(force=True)
+        return self.by_name.get(project_name.lower())
+
+
+project_index = ProjectIndex()
+
+
 async def build_project_list() -> list[ProjectListItem]:
     q = """
         SELECT
@@ -44,28 +118,28 @@ async def build_project_list() -> list[ProjectListItem]:
         # No projects table, return an empty list
         pass
     else:
+        # Store the list first, so the new version
+        # is never paired with the old list
+        version = create_hash()
         await Redis.set("global", "project-list", json_dumps(result))
+        await Redis.set("global", "project-list-version", version)
+        project_index.load(version, result)
+        message = {"topic": "server.project_list_changed", "version": version}
+        await Redis.publish(json_dumps(message))
+        return list(project_index.projects)
     return [ProjectListItem(**item) for item in result]
 
 
 async def get_project_list() -> list[ProjectListItem]:
-    project_list = await Redis.get("global", "project-list")
-    if project_list is None:
-        project_list = await build_project_list()
-        return project_list
-    else:
-        project_list = json_loads(project_list)
-        return [ProjectListItem(**item) for item in project_list]
+    await project_index.refresh()
+    return list(project_index.projects)
 
 
 async def get_project_info(project_name: str) -> ProjectListItem:
     """Return a single project info"""
-    project_list = await get_project_list()
-    project_name = project_name.lower()
-    for project in project_list:
-        if project.name.lower() == project_name:
-            return project
-    raise NotFoundException(f"Project {project_name} not found")
+    if (project := await project_index.get(project_name)) is None:
+        raise NotFoundException(f"Project {project_name} not found")
+    return project
 
 
 async def normalize_project_name(project_name: str) -> str:
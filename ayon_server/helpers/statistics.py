@@ -1,5 +1,6 @@
 from typing import Literal
 
+from ayon_server.background.traffic_stats import traffic_stats
 from ayon_server.lib.postgres import Postgres
 
 UsageType = Literal["ingress", "egress"]
@@ -12,6 +13,16 @@ async def update_traffic_stats(
 ) -> None:
     if usage_type not in ["ingress", "egress"]:
         raise ValueError("Invalid usage type")
+
+    if traffic_stats.is_collecting:
+        # Aggregated in memory and stored periodically by the collector
+        if usage_type == "ingress":
+            traffic_stats.add(service, ingress=value)
+        else:
+            traffic_stats.add(service, egress=value)
+        return
+
+    # Background workers are not running (cli tools, shutdown...)
     query = f"""
        INSERT INTO public.traffic_stats (date, service, {usage_type})
        VALUES (current_date, $1, $2)
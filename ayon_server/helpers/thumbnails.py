@@ -1,15 +1,25 @@
 import base64
 import functools
+import hashlib
+import hmac
 import io
+import time
+from collections.abc import Mapping
+from typing import Any
+from urllib.parse import urlencode
 
 from PIL import Image, UnidentifiedImageError
 from starlette.concurrency import run_in_threadpool
 
-from ayon_server.exceptions import UnsupportedMediaException
+from ayon_server.config import ayonconfig
+from ayon_server.exceptions import ForbiddenException, UnsupportedMediaException
 from ayon_server.files import Storages
+from ayon_server.files.common import SCALED_THUMBNAIL_VARIANT
+from ayon_server.helpers.crypto import get_fernet_key
 from ayon_server.helpers.mimetypes import guess_mime_type
 from ayon_server.lib.postgres import Postgres
 from ayon_server.logging import logger
+from ayon_server.utils import hash_data
 
 
 class ThumbnailProcessNoop(Exception):
@@ -116,18 +126,29 @@ async def process_thumbnail(
                 logger.debug(
                     f"Resizing image from {img.size} to {(new_width, new_height)}"
                 )
-                img = img.resize((new_width, new_height), Image.LANCZOS)  # type: ignore
+
+                # JPEG images are decoded at the smallest DCT scale
+                # (1/2, 1/4, 1/8) still larger than the target size,
+                # so the full resolution image is never decoded
+                img.draft(img.mode, (new_width, new_height))
+
+                # Shrink the image by an integer factor (fast box reduce)
+                # first and use the Lanczos filter only for the rest
+                resampling = Image.LANCZOS  # type: ignore
+                scaled = img.resize(
+                    (new_width, new_height), resampling, reducing_gap=3.0
+                )
                 img_byte_arr = io.BytesIO()
 
                 # Adjustments for specific formats
                 if target_format == "JPEG":
-                    if img.mode != "RGB":
-                        img = img.convert("RGB")
-                    img.save(
+                    if scaled.mode != "RGB":
+                        scaled = scaled.convert("RGB")
+                    scaled.save(
                         img_byte_arr, format=target_format, optimize=True, quality=85
                     )
                 else:
-                    img.save(img_byte_arr, format=target_format)
+                    scaled.save(img_byte_arr, format=target_format)
 
                 return img_byte_arr.getvalue()
         except UnidentifiedImageError:
@@ -138,6 +159,97 @@ async def process_thumbnail(
     return normalized_bytes
 
 
+async def load_thumbnail(
+    project_name: str,
+    thumbnail_id: str,
+    record: Mapping[str, Any],
+    original: bool = False,
+) -> bytes | None:
+    """Return the thumbnail image of the thumbnails table record.
+
+    Images stored in the project storage are loaded from there.
+    Returns None if the image is not available.
+    """
+    meta = record["meta"] or {}
+    in_storage = meta.get("storage") == "project"
+    if original or in_storage:
+        variant = None
+        if in_storage and not original and meta.get("scaled"):
+            variant = SCALED_THUMBNAIL_VARIANT
+        storage = await Storages.project(project_name)
+        try:
+            return await storage.get_thumbnail(thumbnail_id, variant=variant)
+        except FileNotFoundError:
+            pass
+    return record["data"] or None
+
+
+def get_thumbnail_version(record: Mapping[str, Any]) -> str:
+    """Return a token identifying the content of the thumbnail record.
+
+    The token is used as the ETag and in signed thumbnail URLs.
+    Records stored before the content hash was kept in the metadata
+    use the creation time instead.
+    """
+    meta = record["meta"] or {}
+    if content_hash := meta.get("hash"):
+        return content_hash
+    return hash_data(f"{record['id']}:{record['created_at']}")[:32]
+
+
+_signing_key: bytes | None = None
+
+
+async def _get_signing_key() -> bytes:
+    global _signing_key
+    if _signing_key is None:
+        _signing_key = await get_fernet_key()
+    return _signing_key
+
+
+def _thumbnail_signature(key: bytes, *parts: str) -> str:
+    message = ":".join(parts).encode()
+    return hmac.new(key, message, hashlib.sha256).hexdigest()[:32]
+
+
+async def get_signed_thumbnail_url(
+    project_name: str,
+    thumbnail_id: str,
+    version: str,
+) -> str:
+    """Return a URL of the thumbnail usable without authentication.
+
+    The expiration time is rounded up to a whole day, so the URL
+    of a thumbnail does not change during the day and the image
+    may be cached by the browser until the URL expires.
+    """
+    expires = (int(time.time()) // 86400 + 1) * 86400 + ayonconfig.thumbnail_url_ttl
+    key = await _get_signing_key()
+    signature = _thumbnail_signature(
+        key, project_name, thumbnail_id, version, str(expires)
+    )
+    query = urlencode({"v": version, "exp": expires, "sig": signature})
+    return f"/api/projects/{project_name}/thumbnails/{thumbnail_id}/signed?{query}"
+
+
+async def verify_thumbnail_signature(
+    project_name: str,
+    thumbnail_id: str,
+    version: str,
+    expires: int,
+    signature: str,
+) -> None:
+    """Raise ForbiddenException if the signed thumbnail URL is not valid"""
+    if expires < time.time():
+        raise ForbiddenException("Thumbnail URL expired")
+    key = await _get_signing_key()
+    expected = _thumbnail_signature(
+        key, project_name, thumbnail_id, version, str(expires)
+    )
+    if not hmac.compare_digest(expected, signature):
+        raise ForbiddenException("Invalid thumbnail URL signature")
+
+
 @functools.cache
 def get_fake_thumbnail() -> bytes:
     """Returns a fake thumbnail image as a byte stream.
@@ -194,18 +306,38 @@ async def store_thumbnail(
 
     except ThumbnailProcessNoop:
         thumbnail = payload
+        scaled = False
     else:
-        storage = await Storages.project(project_name)
-        await storage.store_thumbnail(thumbnail_id, payload)
+        scaled = True
 
-    meta = {
+    meta: dict[str, Any] = {
         "originalSize": len(payload),
         "thumbnailSize": len(thumbnail),
         "mime": mime,  # eventually, we'll drop the column
+        "hash": hashlib.sha256(payload).hexdigest()[:32],
     }
     if user_name:
         meta["author"] = user_name
 
+    # The original image is kept in the project storage when it was scaled.
+    # With the "project" thumbnail storage, the scaled image is stored
+    # there as well and the database only keeps the metadata.
+
+    data = thumbnail
+    if ayonconfig.thumbnail_storage == "project":
+        storage = await Storages.project(project_name)
+        await storage.store_thumbnail(thumbnail_id, payload)
+        if scaled:
+            await storage.store_thumbnail(
+                thumbnail_id, thumbnail, variant=SCALED_THUMBNAIL_VARIANT
+            )
+        meta["storage"] = "project"
+        meta["scaled"] = scaled
+        data = b""
+    elif scaled:
+        storage = await Storages.project(project_name)
+        await storage.store_thumbnail(thumbnail_id, payload)
+
     query = f"""
         INSERT INTO project_{project_name}.thumbnails (id, mime, data, meta)
         VALUES ($1, $2, $3, $4)
@@ -213,7 +345,7 @@ async def store_thumbnail(
         DO UPDATE SET data = EXCLUDED.data, meta = EXCLUDED.meta
         RETURNING id
     """
-    await Postgres.execute(query, thumbnail_id, mime, thumbnail, meta)
+    await Postgres.execute(query, thumbnail_id, mime, data, meta)
     for entity_type in ["workfiles", "versions", "folders", "tasks"]:
         await Postgres.execute(
             f"""
@@ -1,6 +1,7 @@
 import asyncio
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+import time
+from collections.abc import AsyncGenerator, Generator, MutableMapping
+from contextlib import asynccontextmanager, contextmanager
 from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any, TypedDict
 from urllib.parse import urlparse
@@ -14,7 +15,10 @@ from ayon_server.config import ayonconfig
 from ayon_server.exceptions import ServiceUnavailableException
 from ayon_server.logging import logger
 
+from .postgres_pool import pool_monitor
+from .postgres_routing import is_read_only_query, replica_router
 from .postgres_setup import postgres_setup
+from .postgres_stats import query_stats
 
 if TYPE_CHECKING:
     Connection = PoolConnectionProxy[Any]
@@ -61,6 +65,18 @@ _current_connection: ContextVar["PoolConnectionProxy | None"] = ContextVar(  # t
     "_current_connection", default=None
 )
 
+# Errors of a replica, on which a read is retried on the primary
+REPLICA_ERRORS = (
+    OSError,
+    TimeoutError,
+    asyncpg.exceptions.InterfaceError,
+    asyncpg.exceptions.PostgresConnectionError,
+    asyncpg.exceptions.CannotConnectNowError,
+    asyncpg.exceptions.TooManyConnectionsError,
+    asyncpg.exceptions.SerializationError,  # conflict with recovery
+    asyncpg.exceptions.ReadOnlySQLTransactionError,
+)
+
 #
 # Postgres acccess
 #
@@ -113,11 +129,44 @@ class Postgres:
             return
         cls.pool = await asyncpg.create_pool(
             ayonconfig.postgres_url,
-            min_size=10,
+            min_size=min(
+                ayonconfig.postgres_pool_min_size, ayonconfig.postgres_pool_size
+            ),
             max_size=ayonconfig.postgres_pool_size,
-            max_inactive_connection_lifetime=20,
+            max_inactive_connection_lifetime=ayonconfig.postgres_pool_max_inactive_lifetime,
+            statement_cache_size=ayonconfig.postgres_statement_cache_size,
             init=postgres_setup,
         )
+        await cls.connect_replicas()
+
+    @classmethod
+    async def connect_replicas(cls) -> None:
+        """Create connection pools of the read replicas (if configured)"""
+        for pool in replica_router.clear():
+            pool.terminate()
+        if not ayonconfig.postgres_replica_urls:
+            return
+        for url in ayonconfig.postgres_replica_urls.split(","):
+            if not (url := url.strip()):
+                continue
+            try:
+                pool = await asyncpg.create_pool(
+                    url,
+                    min_size=1,
+                    max_size=ayonconfig.postgres_replica_pool_size,
+                    max_inactive_connection_lifetime=(
+                        ayonconfig.postgres_pool_max_inactive_lifetime
+                    ),
+                    statement_cache_size=ayonconfig.postgres_statement_cache_size,
+                    init=postgres_setup,
+                )
+            except Exception as e:
+                # Do not log the url - it may contain a password
+                logger.warning(f"Unable to connect to a Postgres replica: {e}")
+                continue
+            replica_router.add_pool(url, pool)
+        if replica_router.enabled:
+            logger.debug(f"Connected to {len(replica_router.pools)} Postgres replicas")
 
     @classmethod
     async def shutdown(cls) -> None:
@@ -131,6 +180,11 @@ class Postgres:
             finally:
                 cls.pool = None
                 cls.shutting_down = True
+        for pool in replica_router.clear():
+            try:
+                await asyncio.wait_for(pool.close(), timeout=5)
+            except TimeoutError:
+                pool.terminate()
 
     #
     # Get connection / transaction
@@ -150,25 +204,55 @@ class Postgres:
             yield conn
             return
 
+        connection_proxy = await cls._acquire_primary(timeout)
+        acquired_at = time.perf_counter()
+        token = _current_connection.set(connection_proxy)
+
+        try:
+            yield connection_proxy
+        finally:
+            _current_connection.reset(token)
+            await cls._release_primary(connection_proxy, acquired_at)
+
+    @classmethod
+    async def _acquire_primary(cls, timeout: float | None = None) -> Connection:
+        """Acquire a connection from the primary pool and record the wait time"""
         assert cls.pool is not None, "Connection pool is not initialized."
 
         if timeout is None:
             timeout = ayonconfig.postgres_pool_timeout
 
+        start = time.perf_counter()
         try:
-            connection_proxy = await cls.pool.acquire(timeout=timeout)
+            if not pool_monitor.try_reserve():
+                # Adaptive pool limit reached.
+                # The wait counts towards the timeout
+                await asyncio.wait_for(pool_monitor.reserve(), timeout=timeout)
+            try:
+                remaining = max(0.0, timeout - (time.perf_counter() - start))
+                connection_proxy = await cls.pool.acquire(timeout=remaining)
+            except BaseException:
+                pool_monitor.unreserve()
+                raise
         except TimeoutError:
+            pool_monitor.record_timeout()
             raise ServiceUnavailableException("Database pool timeout")
         except TooManyConnectionsError:
+            pool_monitor.record_timeout()
             raise ServiceUnavailableException("Database pool is full")
 
-        token = _current_connection.set(connection_proxy)
+        pool_monitor.record_wait(time.perf_counter() - start)
+        return connection_proxy
 
+    @classmethod
+    async def _release_primary(cls, conn: Connection, acquired_at: float) -> None:
+        """Return a connection to the primary pool and record the hold time"""
+        assert cls.pool is not None, "Connection pool is not initialized."
         try:
-            yield connection_proxy
+            await cls.pool.release(conn)
         finally:
-            _current_connection.reset(token)
-            await cls.pool.release(connection_proxy)
+            pool_monitor.unreserve()
+            pool_monitor.record_hold(time.perf_counter() - acquired_at)
 
     @classmethod
     @asynccontextmanager
@@ -189,6 +273,61 @@ class Postgres:
                 async with connection.transaction():
                     with logger.contextualize(transaction_id=id(connection)):
                         yield connection
+                    if replica_router.enabled:
+                        # A transaction id is assigned only on the first write,
+                        # so read-only transactions don't trigger the guard
+                        xid = "SELECT txid_current_if_assigned()"
+                        if await connection.fetchval(xid) is not None:
+                            replica_router.mark_write()
+
+    @classmethod
+    @contextmanager
+    def primary(cls) -> Generator[None, None, None]:
+        """Execute all reads of the code block on the primary.
+
+        Use when the loaded data is stored in a shared cache.
+        """
+        with replica_router.primary():
+            yield
+
+    @classmethod
+    @contextmanager
+    def session(
+        cls,
+        key: str | None,
+        scope: MutableMapping[str, Any] | None = None,
+    ) -> Generator[None, None, None]:
+        """Bind the request to a session (user name) for replica routing.
+
+        Reads executed after a write of the same session are routed
+        to the primary (see postgres_routing). When the ASGI scope
+        of the request is provided, connection hold times are recorded
+        per route (see postgres_pool).
+        """
+        with replica_router.session(key), pool_monitor.request(scope):
+            yield
+
+    @classmethod
+    def get_pool_stats(cls) -> list[dict[str, Any]]:
+        """Return a usage summary of the connection pools"""
+        result: list[dict[str, Any]] = []
+        if cls.pool is not None:
+            primary = {
+                "pool": "primary",
+                "size": cls.pool.get_size(),
+                "idle": cls.pool.get_idle_size(),
+                "max_size": cls.pool.get_max_size(),
+                "in_use": pool_monitor.in_use,
+                "limit": pool_monitor.limit,
+                "timeouts": pool_monitor.timeouts,
+            }
+            if replica_router.enabled:
+                # read-only queries the primary served instead of a replica
+                primary["guarded_reads"] = replica_router.guarded
+                primary["fallback_reads"] = replica_router.fallbacks
+            result.append(primary)
+        result.extend(replica_router.stats())
+        return result
 
     @classmethod
     async def is_in_transaction(cls) -> bool:
@@ -202,29 +341,101 @@ class Postgres:
     # Postgres query wrappers
     #
 
+    # Queries are executed using asyncpg connection methods, which
+    # keep prepared statements in a per-connection LRU cache, so
+    # a query with the same text is planned only once per connection.
+    # Build queries with SQLArgs rather than inlining values to benefit.
+
+    @classmethod
+    def _get_replica(cls, query: str) -> "asyncpg.pool.Pool | None":
+        """Return a replica pool to run the query on, or None for the primary"""
+        if _current_connection.get() is not None:
+            if not is_read_only_query(query):
+                replica_router.mark_write()
+            return None
+        if (index := replica_router.select(query)) is None:
+            if not is_read_only_query(query):
+                replica_router.mark_write()
+            return None
+        return replica_router.pools[index]
+
+    @classmethod
+    async def _read_replica(
+        cls,
+        pool: "asyncpg.pool.Pool",
+        method: str,
+        query: str,
+        *args: Any,
+        timeout: float,
+    ) -> tuple[bool, Any]:
+        """Run a read-only query on a replica.
+
+        Returns (False, None) if the replica failed
+        and the query should be executed on the primary.
+        """
+        try:
+            async with pool.acquire(timeout=ayonconfig.postgres_pool_timeout) as conn:
+                with query_stats.measure(query) as timer:
+                    result = await getattr(conn, method)(query, *args, timeout=timeout)
+                    if method == "fetch":
+                        timer.rows = len(result)
+                    else:
+                        timer.rows = 0 if result is None else 1
+                return True, result
+        except REPLICA_ERRORS as e:
+            replica_router.fallbacks += 1
+            logger.debug(f"Replica read failed, using primary: {e}", nodb=True)
+            return False, None
+
     @classmethod
     async def execute(cls, query: str, *args: Any, timeout: float = 60) -> str:
         """Execute a SQL query and return a status (e.g. 'INSERT 0 2')"""
+        replica_router.mark_write()
         async with cls.acquire() as connection:
-            return await connection.execute(query, *args, timeout=timeout)
+            with query_stats.measure(query) as timer:
+                status = await connection.execute(query, *args, timeout=timeout)
+                count = status.rsplit(" ", 1)[-1]
+                timer.rows = int(count) if count.isdigit() else 0
+            return status
 
     @classmethod
     async def executemany(cls, query: str, *args: Any, timeout: float = 60) -> None:
         """Execute a SQL query with multiple parameters."""
+        replica_router.mark_write()
         async with cls.acquire() as connection:
-            return await connection.executemany(query, *args, timeout=timeout)
+            with query_stats.measure(query) as timer:
+                timer.rows = len(args[0]) if args else 0
+                return await connection.executemany(query, *args, timeout=timeout)
 
     @classmethod
     async def fetch(cls, query: str, *args: Any, timeout: float = 60):
         """Run a query and return the results as a list of Record."""
+        if (pool := cls._get_replica(query)) is not None:
+            done, result = await cls._read_replica(
+                pool, "fetch", query, *args, timeout=timeout
+            )
+            if done:
+                return result
         async with cls.acquire() as connection:
-            return await connection.fetch(query, *args, timeout=timeout)
+            with query_stats.measure(query) as timer:
+                result = await connection.fetch(query, *args, timeout=timeout)
+                timer.rows = len(result)
+            return result
 
     @classmethod
     async def fetchrow(cls, query: str, *args: Any, timeout: float = 60):
         """Run a query and return the first row as a Record."""
+        if (pool := cls._get_replica(query)) is not None:
+            done, result = await cls._read_replica(
+                pool, "fetchrow", query, *args, timeout=timeout
+            )
+            if done:
+                return result
         async with cls.acquire() as connection:
-            return await connection.fetchrow(query, *args, timeout=timeout)
+            with query_stats.measure(query) as timer:
+                result = await connection.fetchrow(query, *args, timeout=timeout)
+                timer.rows = 0 if result is None else 1
+            return result
 
     @classmethod
     async def prepare(
@@ -261,17 +472,47 @@ class Postgres:
         # Never set() a ContextVar in a context that may yield to caller
         # and then try to reset() it as async context may change
 
-        conn = await cls.pool.acquire()
-
+        pool: asyncpg.pool.Pool | None = None
+        if (replica := cls._get_replica(query)) is not None:
+            try:
+                conn = await replica.acquire(timeout=ayonconfig.postgres_pool_timeout)
+                pool = replica
+            except REPLICA_ERRORS as e:
+                replica_router.fallbacks += 1
+                logger.debug(f"Replica read failed, using primary: {e}", nodb=True)
+        if pool is None:
+            conn = await cls._acquire_primary()
+        acquired_at = time.perf_counter()
+
+        # Connection.cursor uses the statement cache of the connection
+        # (unlike Connection.prepare). Only the time spent waiting
+        # for the database is counted in the query stats.
+
+        rows = 0
+        elapsed = 0.0
+        failed = False
+        start = time.perf_counter()
         try:
             if not conn.is_in_transaction():
                 async with conn.transaction():
-                    statement = await conn.prepare(query)
-                    async for record in statement.cursor(*args):
+                    async for record in conn.cursor(query, *args):
+                        elapsed += time.perf_counter() - start
+                        rows += 1
                         yield dict(record)
+                        start = time.perf_counter()
             else:
-                statement = await conn.prepare(query)
-                async for record in statement.cursor(*args):
+                async for record in conn.cursor(query, *args):
+                    elapsed += time.perf_counter() - start
+                    rows += 1
                     yield dict(record)
+                    start = time.perf_counter()
+            elapsed += time.perf_counter() - start
+        except Exception:
+            failed = True
+            raise
         finally:
-            await cls.pool.release(conn)
+            if pool is None:
+                await cls._release_primary(conn, acquired_at)
+            else:
+                await pool.release(conn)
+            query_stats.record(query, rows=rows, elapsed=elapsed, failed=failed)
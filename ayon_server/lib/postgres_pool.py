@@ -0,0 +1,175 @@
+"""Instrumentation and adaptive sizing of the Postgres connection pool
+
+The monitor records how long requests wait for a connection
+of the primary pool, acquire timeouts and how long connections
+are held by each API route (see runtime_metrics).
+
+In the adaptive mode (`ayonconfig.postgres_pool_adaptive`) the number
+of connections used at once is limited to a value between
+`postgres_pool_min_size` and `postgres_pool_size`. The limit grows when
+acquiring a connection takes longer than the target wait time and
+shrinks when most of the connections are not used. Connections above
+the limit become idle and are closed by the pool after
+`postgres_pool_max_inactive_lifetime` seconds.
+"""
+
+import asyncio
+import collections
+import contextlib
+import time
+from collections.abc import Generator, MutableMapping
+from contextvars import ContextVar
+from typing import Any
+
+from ayon_server.config import ayonconfig
+from ayon_server.lib.runtime_metrics import (
+    db_pool_acquire_duration,
+    db_pool_hold_duration,
+)
+from ayon_server.logging import logger
+
+ADJUST_INTERVAL = 5.0
+
+# ASGI scope of the current request. The matched route is stored
+# in the scope during routing, so it is resolved when a connection
+# is released.
+_request_scope: ContextVar[MutableMapping[str, Any] | None] = ContextVar(
+    "_request_scope", default=None
+)
+
+
+def get_holder() -> str:
+    """Return a name of the route using the connection"""
+    if (scope := _request_scope.get()) is None:
+        return "background"
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class PoolMonitor:
+    def __init__(self) -> None:
+        self.timeouts: int = 0
+        self.in_use: int = 0
+
+        # Adaptive limit
+        self.limit: int = ayonconfig.postgres_pool_size
+        self._waiters: collections.deque[asyncio.Future[None]] = collections.deque()
+        self._window_start = time.monotonic()
+        self._window_waits = 0
+        self._window_wait_sum = 0.0
+        self._window_timeouts = 0
+        self._window_peak = 0
+
+    @contextlib.contextmanager
+    def request(
+        self, scope: MutableMapping[str, Any] | None
+    ) -> Generator[None, None, None]:
+        """Attribute connections used in the block to the request"""
+        token = _request_scope.set(scope)
+        try:
+            yield
+        finally:
+            _request_scope.reset(token)
+
+    #
+    # Adaptive limit
+    #
+
+    def try_reserve(self) -> bool:
+        """Take a connection slot if it is available without waiting"""
+        if ayonconfig.postgres_pool_adaptive and (
+            self.in_use >= self.limit or self._waiters
+        ):
+            return False
+        self.in_use += 1
+        if self.in_use > self._window_peak:
+            self._window_peak = self.in_use
+        return True
+
+    async def reserve(self) -> None:
+        """Wait until a connection slot is available and take it"""
+        if self.try_reserve():
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # a slot was handed over to us - pass it on
+                self.unreserve()
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(future)
+            raise
+        if self.in_use > self._window_peak:
+            self._window_peak = self.in_use
+
+    def unreserve(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and (
+            self.in_use < self.limit or not ayonconfig.postgres_pool_adaptive
+        ):
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+    def _adjust(self) -> None:
+        now = time.monotonic()
+        if now - self._window_start < ADJUST_INTERVAL:
+            return
+
+        min_size = min(ayonconfig.postgres_pool_min_size, ayonconfig.postgres_pool_size)
+        max_size = ayonconfig.postgres_pool_size
+        mean_wait = (
+            self._window_wait_sum / self._window_waits if self._window_waits else 0
+        )
+        limit = self.limit
+
+        if self._window_timeouts or mean_wait > ayonconfig.postgres_pool_target_wait:
+            limit = min(max_size, limit + max(1, limit // 4))
+        elif self._window_peak < limit // 2:
+            limit = max(min_size, limit - max(1, limit // 8))
+
+        if limit != self.limit:
+            logger.debug(
+                f"Adjusting Postgres pool limit {self.limit} -> {limit} "
+                f"(mean wait {mean_wait * 1000:.1f} ms, peak {self._window_peak})",
+                nodb=True,
+            )
+            self.limit = limit
+            self._wake()
+
+        self._window_start = now
+        self._window_waits = 0
+        self._window_wait_sum = 0.0
+        self._window_timeouts = 0
+        self._window_peak = self.in_use
+
+    #
+    # Telemetry
+    #
+
+    def record_wait(self, elapsed: float) -> None:
+        db_pool_acquire_duration.observe(elapsed)
+        self._window_waits += 1
+        self._window_wait_sum += elapsed
+        if ayonconfig.postgres_pool_adaptive:
+            self._adjust()
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+        self._window_timeouts += 1
+        if ayonconfig.postgres_pool_adaptive:
+            self._adjust()
+
+    def record_hold(self, elapsed: float) -> None:
+        db_pool_hold_duration.observe(elapsed, get_holder())
+
+
+pool_monitor = PoolMonitor()
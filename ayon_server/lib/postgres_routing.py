@@ -0,0 +1,173 @@
+"""Routing of read-only queries to Postgres read replicas
+
+When `ayonconfig.postgres_replica_urls` is set, `Postgres.fetch`,
+`Postgres.fetchrow` and `Postgres.iterate` send read-only queries
+executed outside of a connection acquired by the caller (transaction)
+to one of the replica pools.
+
+Read-your-writes guard: after a write, reads of the same request are
+always routed to the primary and reads of the same session (user) are
+routed to the primary for `ayonconfig.postgres_replica_lag_window`
+seconds, so users never see data older than their own changes.
+The session guard is kept per server process.
+
+Reads which fill shared caches must use `replica_router.primary()`
+(`Postgres.primary()`), so a lagging replica never stores outdated
+data in a cache used by everyone.
+"""
+
+import contextlib
+import re
+import time
+from collections.abc import Generator
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from ayon_server.config import ayonconfig
+
+if TYPE_CHECKING:
+    import asyncpg.pool
+
+MAX_CLASSIFIED_QUERIES = 2000
+MAX_TRACKED_SESSIONS = 10000
+
+RE_READ_ONLY = re.compile(r"^\s*\(?\s*(SELECT|WITH)\b", re.IGNORECASE)
+RE_WRITE = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|CREATE|DROP|ALTER|COPY"
+    r"|NEXTVAL|SETVAL|SET_CONFIG|PG_NOTIFY|PG_\w*ADVISORY\w*)\b"
+    r"|\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|SHARE|KEY\s+SHARE)\b",
+    re.IGNORECASE,
+)
+
+_classified: dict[str, bool] = {}
+
+
+def is_read_only_query(query: str) -> bool:
+    """Return True if the query may be executed on a read replica"""
+    if (result := _classified.get(query)) is not None:
+        return result
+    result = bool(RE_READ_ONLY.match(query)) and not RE_WRITE.search(query)
+    if len(_classified) >= MAX_CLASSIFIED_QUERIES:
+        _classified.clear()
+    _classified[query] = result
+    return result
+
+
+# Session (user) of the current request
+_session_key: ContextVar[str | None] = ContextVar("_session_key", default=None)
+
+# Set to True after a write in the current request
+_request_written: ContextVar[bool] = ContextVar("_request_written", default=False)
+
+# Set to True to route all reads of the code block to the primary
+_primary_reads: ContextVar[bool] = ContextVar("_primary_reads", default=False)
+
+
+class ReplicaRouter:
+    def __init__(self) -> None:
+        self.pools: list[asyncpg.pool.Pool[Any]] = []
+        self.urls: list[str] = []
+        self._next: int = 0
+        # session key: monotonic time of the last write
+        self._writes: dict[str, float] = {}
+
+        # Counters
+        self.replica_reads: list[int] = []
+        self.guarded: int = 0  # reads routed to the primary by the guard
+        self.fallbacks: int = 0  # reads moved to the primary on replica errors
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.pools)
+
+    def add_pool(self, url: str, pool: "asyncpg.pool.Pool[Any]") -> None:
+        self.urls.append(url)
+        self.pools.append(pool)
+        self.replica_reads.append(0)
+
+    def clear(self) -> list["asyncpg.pool.Pool[Any]"]:
+        pools, self.pools, self.urls, self.replica_reads = self.pools, [], [], []
+        return pools
+
+    #
+    # Read-your-writes guard
+    #
+
+    @contextlib.contextmanager
+    def session(self, key: str | None) -> Generator[None, None, None]:
+        """Bind the code block (request) to the given session"""
+        token = _session_key.set(key)
+        request_token = _request_written.set(False)
+        try:
+            yield
+        finally:
+            _request_written.reset(request_token)
+            _session_key.reset(token)
+
+    @contextlib.contextmanager
+    def primary(self) -> Generator[None, None, None]:
+        """Route all reads of the code block to the primary"""
+        token = _primary_reads.set(True)
+        try:
+            yield
+        finally:
+            _primary_reads.reset(token)
+
+    def mark_write(self) -> None:
+        """Record a (possible) write of the current request and session"""
+        if not self.pools:
+            return
+        _request_written.set(True)
+        if (key := _session_key.get()) is None:
+            return
+        now = time.monotonic()
+        if len(self._writes) >= MAX_TRACKED_SESSIONS:
+            window = ayonconfig.postgres_replica_lag_window
+            self._writes = {k: v for k, v in self._writes.items() if now - v < window}
+        self._writes[key] = now
+
+    def is_guarded(self) -> bool:
+        """Return True if reads must be routed to the primary"""
+        if _request_written.get():
+            return True
+        if (key := _session_key.get()) is None:
+            return False
+        if (last_write := self._writes.get(key)) is None:
+            return False
+        return time.monotonic() - last_write < ayonconfig.postgres_replica_lag_window
+
+    #
+    # Routing
+    #
+
+    def select(self, query: str) -> int | None:
+        """Return the index of the replica pool to run the query on
+
+        or None if the query should be executed on the primary.
+        """
+        if not self.pools or _primary_reads.get() or not is_read_only_query(query):
+            return None
+        if self.is_guarded():
+            self.guarded += 1
+            return None
+        index = self._next % len(self.pools)
+        self._next = index + 1
+        self.replica_reads[index] += 1
+        return index
+
+    def stats(self) -> list[dict[str, Any]]:
+        result = []
+        for i, pool in enumerate(self.pools):
+            result.append(
+                {
+                    "pool": f"replica{i}",
+                    "size": pool.get_size(),
+                    "idle": pool.get_idle_size(),
+                    "max_size": pool.get_max_size(),
+                    "reads": self.replica_reads[i],
+                }
+            )
+        return result
+
+
+replica_router = ReplicaRouter()
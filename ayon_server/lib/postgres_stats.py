@@ -0,0 +1,166 @@
+"""Per-query statistics of the Postgres wrapper
+
+Queries are grouped by a fingerprint of their normalized text:
+string and numeric literals are replaced with `?`, lists of values
+are collapsed and project schema names are replaced with `project_?`,
+so queries generated from the same template with different inlined
+values (and for different projects) are counted together.
+
+Statistics are collected per server process.
+"""
+
+import re
+import time
+from typing import Any
+
+from ayon_server.config import ayonconfig
+from ayon_server.lib.runtime_metrics import db_query_duration
+from ayon_server.utils import hash_data
+
+MAX_ENTRIES = 1000
+MAX_NORMALIZED_CACHE = 2000
+
+RE_STRING = re.compile(r"'(?:[^']|'')*'")
+RE_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+RE_LIST = re.compile(r"([(\[])\s*\?(?:\s*,\s*\?)+\s*([)\]])")
+RE_PROJECT = re.compile(r"\bproject_\w+", re.IGNORECASE)
+RE_WHITESPACE = re.compile(r"\s+")
+
+STATEMENT_TYPES = {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "COPY"}
+
+
+def normalize_query(query: str) -> str:
+    """Return the query text with literals replaced with placeholders"""
+    query = RE_STRING.sub("?", query)
+    query = RE_NUMBER.sub("?", query)
+    query = RE_LIST.sub(r"\1?\2", query)
+    query = RE_PROJECT.sub("project_?", query)
+    return RE_WHITESPACE.sub(" ", query).strip()
+
+
+def statement_type(query: str) -> str:
+    """Return the leading keyword of the query (SELECT, INSERT...)"""
+    keyword = query[:32].split(None, 1)
+    if not keyword:
+        return "OTHER"
+    keyword_name = keyword[0].lstrip("(").upper()
+    return keyword_name if keyword_name in STATEMENT_TYPES else "OTHER"
+
+
+class QueryStats:
+    __slots__ = ("query", "calls", "rows", "errors", "total_time", "max_time")
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.calls = 0
+        self.rows = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def dict(self) -> dict[str, Any]:
+        return {
+            "query": self.query,
+            "calls": self.calls,
+            "rows": self.rows,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0,
+            "max_time": self.max_time,
+        }
+
+
+class QueryTimer:
+    """Measure a query execution. Set `rows` before leaving the block."""
+
+    __slots__ = ("collector", "query", "rows", "start")
+
+    def __init__(self, collector: "QueryStatsCollector", query: str) -> None:
+        self.collector = collector
+        self.query = query
+        self.rows = 0
+        self.start = 0.0
+
+    def __enter__(self) -> "QueryTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.collector.record(
+            self.query,
+            rows=self.rows,
+            elapsed=time.perf_counter() - self.start,
+            failed=exc_type is not None,
+        )
+
+
+class QueryStatsCollector:
+    def __init__(self) -> None:
+        self.stats: dict[str, QueryStats] = {}
+        self.since = time.time()
+        # raw query text: fingerprint
+        self._fingerprints: dict[str, str] = {}
+
+    def measure(self, query: str) -> QueryTimer:
+        return QueryTimer(self, query)
+
+    def _fingerprint(self, query: str) -> tuple[str, str | None]:
+        """Return the fingerprint and the normalized query if it is new"""
+        if (fingerprint := self._fingerprints.get(query)) is not None:
+            return fingerprint, None
+        normalized = normalize_query(query)
+        fingerprint = hash_data(normalized)
+        if len(self._fingerprints) >= MAX_NORMALIZED_CACHE:
+            self._fingerprints.clear()
+        self._fingerprints[query] = fingerprint
+        return fingerprint, normalized
+
+    def record(
+        self,
+        query: str,
+        *,
+        rows: int = 0,
+        elapsed: float = 0,
+        failed: bool = False,
+    ) -> None:
+        db_query_duration.observe(elapsed, statement_type(query))
+        if not ayonconfig.postgres_query_stats:
+            return
+
+        fingerprint, normalized = self._fingerprint(query)
+        if (stats := self.stats.get(fingerprint)) is None:
+            if len(self.stats) >= MAX_ENTRIES:
+                self._evict()
+            stats = QueryStats(normalized or normalize_query(query))
+            self.stats[fingerprint] = stats
+
+        stats.calls += 1
+        stats.rows += rows
+        stats.total_time += elapsed
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        if failed:
+            stats.errors += 1
+
+    def _evict(self) -> None:
+        """Drop the half of the entries with the lowest total time"""
+        ranked = sorted(self.stats.items(), key=lambda x: x[1].total_time)
+        for fingerprint, _ in ranked[: len(ranked) // 2]:
+            del self.stats[fingerprint]
+
+    def top(
+        self,
+        limit: int = 50,
+        order_by: str = "total_time",
+    ) -> list[dict[str, Any]]:
+        """Return statistics of the queries sorted by the given key"""
+        result = [{"fingerprint": k, **v.dict()} for k, v in self.stats.items()]
+        result.sort(key=lambda x: x[order_by], reverse=True)
+        return result[:limit]
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self.since = time.time()
+
+
+query_stats = QueryStatsCollector()
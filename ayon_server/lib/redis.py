@@ -1,10 +1,15 @@
-from collections.abc import Awaitable
+import contextlib
+import time
+from collections.abc import AsyncGenerator, Awaitable
 from typing import Any
 
 from redis import asyncio as aioredis
 from redis.asyncio.client import PubSub
+from redis.exceptions import LockError
 
 from ayon_server.config import ayonconfig
+from ayon_server.exceptions import ServiceUnavailableException
+from ayon_server.lib.runtime_metrics import redis_command_duration
 from ayon_server.utils import json_dumps, json_loads
 
 GET_SIZE_SCRIPT = """
@@ -26,6 +31,50 @@ return total_size
 """
 
 
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client recording command execution times"""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            command = str(args[0]).upper() if args else "OTHER"
+            redis_command_duration.observe(time.perf_counter() - start, command)
+
+
+class RedisTransaction:
+    """Commands queued in a MULTI/EXEC block.
+
+    Created by `Redis.transaction`. The commands are executed atomically
+    when the block exits without an exception.
+    """
+
+    def __init__(self, pipe: Any, prefix: str) -> None:
+        self._pipe = pipe
+        self._prefix = prefix
+
+    def _name(self, namespace: str, key: str) -> str:
+        return f"{self._prefix}{namespace}-{key}"
+
+    def set(self, namespace: str, key: str, value: str | bytes, ttl: int = 0) -> None:
+        self._pipe.set(self._name(namespace, key), value, ex=ttl or None)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._pipe.delete(self._name(namespace, key))
+
+    def expire(self, namespace: str, key: str, ttl: int) -> None:
+        self._pipe.expire(self._name(namespace, key), ttl)
+
+    def hset(self, namespace: str, key: str, mapping: dict[str, str | bytes]) -> None:
+        if mapping:
+            self._pipe.hset(self._name(namespace, key), mapping=mapping)
+
+    def hdel(self, namespace: str, key: str, *fields: str) -> None:
+        if fields:
+            self._pipe.hdel(self._name(namespace, key), *fields)
+
+
 class Redis:
     connected: bool = False
     redis_pool: aioredis.Redis
@@ -34,7 +83,7 @@ class Redis:
     @classmethod
     async def connect(cls) -> None:
         """Create a Redis connection pool"""
-        cls.redis_pool = aioredis.from_url(ayonconfig.redis_url)
+        cls.redis_pool = InstrumentedRedis.from_url(ayonconfig.redis_url)
 
         try:
             res = await cls.redis_pool.ping()
@@ -106,6 +155,18 @@ class Redis:
         res = await cls.redis_pool.incr(f"{cls.prefix}{namespace}-{key}")
         return res
 
+    @classmethod
+    async def incr_many(cls, namespace: str, amounts: dict[str, int]) -> None:
+        """Increment multiple values in Redis using a pipeline"""
+        if not amounts:
+            return
+        if not cls.connected:
+            await cls.connect()
+        async with cls.redis_pool.pipeline(transaction=False) as pipe:
+            for key, amount in amounts.items():
+                pipe.incrby(f"{cls.prefix}{namespace}-{key}", amount)
+            await pipe.execute()
+
     @classmethod
     async def expire(cls, namespace: str, key: str, ttl: int) -> None:
         """Set a TTL for a key in Redis"""
@@ -113,6 +174,124 @@ class Redis:
             await cls.connect()
         await cls.redis_pool.expire(f"{cls.prefix}{namespace}-{key}", ttl)
 
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def transaction(cls) -> AsyncGenerator[RedisTransaction, None]:
+        """Queue commands and execute them atomically (MULTI/EXEC)
+
+        ```
+        async with Redis.transaction() as tx:
+            tx.hset("namespace", "key", {"field": "value"})
+            tx.expire("namespace", "key", 3600)
+        ```
+        """
+        if not cls.connected:
+            await cls.connect()
+        async with cls.redis_pool.pipeline(transaction=True) as pipe:
+            yield RedisTransaction(pipe, cls.prefix)
+            await pipe.execute()
+
+    @classmethod
+    @contextlib.asynccontextmanager
+    async def lock(
+        cls,
+        namespace: str,
+        key: str,
+        timeout: float,
+        blocking_timeout: float | None = None,
+    ) -> AsyncGenerator[None, None]:
+        """Hold a lock shared by all server processes
+
+        The lock expires after `timeout` seconds, so a crashed holder
+        does not block others forever. ServiceUnavailableException is raised
+        when the lock cannot be acquired within `blocking_timeout` seconds,
+        or when it expired before the block finished.
+        """
+        if not cls.connected:
+            await cls.connect()
+        lock = cls.redis_pool.lock(
+            f"{cls.prefix}{namespace}-{key}",
+            timeout=timeout,
+            blocking_timeout=blocking_timeout,
+        )
+        try:
+            async with lock:
+                yield
+        except LockError as e:
+            raise ServiceUnavailableException(f"Unable to hold lock {key}") from e
+
+    #
+    # Hashes
+    #
+
+    @classmethod
+    async def hmget(cls, namespace: str, key: str, fields: list[str]) -> list[Any]:
+        """Get multiple fields of a hash stored in Redis.
+
+        Returns a list of values in the same order as the requested fields.
+        Missing fields are returned as None.
+        """
+        if not cls.connected:
+            await cls.connect()
+        if not fields:
+            return []
+        return await cls.redis_pool.hmget(f"{cls.prefix}{namespace}-{key}", fields)
+
+    @classmethod
+    async def hgetall(cls, namespace: str, key: str) -> dict[str, Any]:
+        """Get all fields of a hash stored in Redis"""
+        if not cls.connected:
+            await cls.connect()
+        res = await cls.redis_pool.hgetall(f"{cls.prefix}{namespace}-{key}")
+        return {
+            (k.decode("ascii") if isinstance(k, bytes) else k): v
+            for k, v in res.items()
+        }
+
+    @classmethod
+    async def hset(
+        cls,
+        namespace: str,
+        key: str,
+        mapping: dict[str, str | bytes],
+        ttl: int = 0,
+    ) -> None:
+        """Create/update fields of a hash stored in Redis.
+
+        Optional ttl argument may be provided to (re)set expiration time
+        of the whole hash.
+        """
+        if not cls.connected:
+            await cls.connect()
+        if not mapping:
+            return
+        name = f"{cls.prefix}{namespace}-{key}"
+        async with cls.redis_pool.pipeline(transaction=True) as pipe:
+            pipe.hset(name, mapping=mapping)  # type: ignore[arg-type]
+            if ttl:
+                pipe.expire(name, ttl)
+            await pipe.execute()
+
+    @classmethod
+    async def hreplace(
+        cls,
+        namespace: str,
+        key: str,
+        mapping: dict[str, str | bytes],
+        ttl: int = 0,
+    ) -> None:
+        """Atomically replace the whole content of a hash stored in Redis"""
+        if not cls.connected:
+            await cls.connect()
+        name = f"{cls.prefix}{namespace}-{key}"
+        async with cls.redis_pool.pipeline(transaction=True) as pipe:
+            pipe.delete(name)
+            if mapping:
+                pipe.hset(name, mapping=mapping)  # type: ignore[arg-type]
+                if ttl:
+                    pipe.expire(name, ttl)
+            await pipe.execute()
+
     @classmethod
     async def pubsub(cls) -> PubSub:
         """Create a Redis pubsub connection"""
@@ -129,6 +308,24 @@ class Redis:
             channel = ayonconfig.redis_channel
         await cls.redis_pool.publish(channel, message)
 
+    @classmethod
+    async def publish_many(
+        cls,
+        messages: list[str],
+        channel: str | None = None,
+    ) -> None:
+        """Publish multiple messages to a Redis channel using a pipeline"""
+        if not messages:
+            return
+        if not cls.connected:
+            await cls.connect()
+        if channel is None:
+            channel = ayonconfig.redis_channel
+        async with cls.redis_pool.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.publish(channel, message)
+            await pipe.execute()
+
     @classmethod
     async def keys(cls, namespace: str) -> list[str]:
         if not cls.connected:
@@ -0,0 +1,221 @@
+"""Runtime performance metrics
+
+In-memory counters and histograms of the server process
+(request latencies, database and Redis operations, websocket fan-out...)
+rendered in the Prometheus text format by the system metrics endpoint.
+
+Observing a value only updates a few numbers in memory,
+so it is cheap enough to be done on every request.
+"""
+
+import bisect
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any
+
+from ayon_server.config import ayonconfig
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+
+# Maximum number of label combinations of a single metric.
+# Observations with new labels above the limit are counted as "other"
+MAX_SERIES = 1000
+
+
+def _render_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    labels = ",".join(f'{k}="{v}"' for k, v in zip(names, values, strict=True))
+    return f"{{{labels}}}"
+
+
+class _Metric(ABC):
+    kind: str = "untyped"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+
+    def _series_key(
+        self, series: dict[Any, Any], labels: tuple[str, ...]
+    ) -> tuple[str, ...]:
+        if labels in series or len(series) < MAX_SERIES:
+            return labels
+        return ("other",) * len(self.labels)
+
+    def render(self, prefix: str) -> str:
+        header = f"# HELP {prefix}_{self.name} {self.description}\n"
+        header += f"# TYPE {prefix}_{self.name} {self.kind}\n"
+        return header + self._render_values(f"{prefix}_{self.name}")
+
+    @abstractmethod
+    def _render_values(self, name: str) -> str:
+        """Return sample lines of the metric"""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        if not ayonconfig.metrics_runtime:
+            return
+        key = self._series_key(self.values, labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def _render_values(self, name: str) -> str:
+        result = ""
+        for labels, value in self.values.items():
+            result += f"{name}{_render_labels(self.labels, labels)} {value}\n"
+        return result
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels: [bucket counts..., +Inf count], sum
+        self.series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        if not ayonconfig.metrics_runtime:
+            return
+        key = self._series_key(self.series, labels)
+        if (series := self.series.get(key)) is None:
+            series = self.series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def _render_values(self, name: str) -> str:
+        result = ""
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        for labels, (counts, total) in self.series.items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                tags = _render_labels((*self.labels, "le"), (*labels, bound))
+                result += f"{name}_bucket{tags} {cumulative}\n"
+            tags = _render_labels(self.labels, labels)
+            result += f"{name}_sum{tags} {total[0]}\n"
+            result += f"{name}_count{tags} {cumulative}\n"
+        return result
+
+
+class RuntimeMetrics:
+    def __init__(self) -> None:
+        self.metrics: list[_Metric] = []
+
+    def counter(
+        self, name: str, description: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        metric = Counter(name, description, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, description, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render_prometheus(self, prefix: str = "ayon") -> str:
+        return "".join(metric.render(prefix) for metric in self.metrics)
+
+
+runtime_metrics = RuntimeMetrics()
+
+#
+# Metrics of the server components
+#
+
+http_requests = runtime_metrics.counter(
+    "http_requests_total",
+    "Number of HTTP requests",
+    ("method", "route", "status"),
+)
+
+http_request_duration = runtime_metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request processing time",
+    ("method", "route"),
+)
+
+graphql_resolver_duration = runtime_metrics.histogram(
+    "graphql_resolver_duration_seconds",
+    "Execution time of asynchronous GraphQL field resolvers",
+    ("field",),
+)
+
+db_query_duration = runtime_metrics.histogram(
+    "db_query_duration_seconds",
+    "Database query execution time",
+    ("statement",),
+    buckets=FAST_BUCKETS,
+)
+
+db_pool_acquire_duration = runtime_metrics.histogram(
+    "db_pool_acquire_seconds",
+    "Time spent waiting for a connection of the primary database pool",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+db_pool_hold_duration = runtime_metrics.histogram(
+    "db_pool_hold_seconds",
+    "Time a connection of the primary database pool is held by a route",
+    ("route",),
+)
+
+redis_command_duration = runtime_metrics.histogram(
+    "redis_command_duration_seconds",
+    "Redis command execution time",
+    ("command",),
+    buckets=FAST_BUCKETS,
+)
+
+websocket_fanout_duration = runtime_metrics.histogram(
+    "websocket_fanout_duration_seconds",
+    "Time spent queuing a message for all subscribed websocket clients",
+    buckets=FAST_BUCKETS,
+)
+
+event_loop_lag = runtime_metrics.histogram(
+    "event_loop_lag_seconds",
+    "Delay of scheduled background tasks caused by a busy event loop",
+    buckets=FAST_BUCKETS,
+)
+
+s3_upload_bytes = runtime_metrics.counter(
+    "s3_upload_bytes_total",
+    "Number of bytes uploaded to S3 project storages",
+    ("source",),
+)
+
+s3_upload_duration = runtime_metrics.histogram(
+    "s3_upload_duration_seconds",
+    "Duration of file uploads to S3 project storages",
+    ("source",),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0),
+)
+
+s3_part_upload_duration = runtime_metrics.histogram(
+    "s3_part_upload_duration_seconds",
+    "Duration of a single multipart upload part request to S3",
+)
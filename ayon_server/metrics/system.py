@@ -4,8 +4,11 @@ from typing import Any
 import aiocache
 import psutil
 
+from ayon_server.api.messaging import messaging
+from ayon_server.background.log_collector import log_collector
 from ayon_server.lib.postgres import Postgres
 from ayon_server.lib.redis import Redis
+from ayon_server.lib.runtime_metrics import runtime_metrics
 from ayon_server.types import Field, OPModel
 
 
@@ -121,6 +124,20 @@ class SystemMetrics:
         )
         result += db_avail.render_prometheus()
 
+        for pool_stats in Postgres.get_pool_stats():
+            pool_tags = {"pool": pool_stats.pop("pool")}
+            for key, value in pool_stats.items():
+                metric = Metric(f"db_pool_{key}", value, pool_tags)
+                result += metric.render_prometheus()
+
+        for key, value in log_collector.stats().items():
+            result += Metric(f"log_collector_{key}", value).render_prometheus()
+
+        for key, value in messaging.stats().items():
+            result += Metric(f"websocket_{key}", value).render_prometheus()
+
+        result += runtime_metrics.render_prometheus()
+
         return result
 
     @aiocache.cached(ttl=120)
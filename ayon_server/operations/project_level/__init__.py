@@ -7,11 +7,13 @@ __all__ = [
 
 import asyncio
 import random
+import sys
 from typing import Any
 
 from asyncpg.exceptions import DeadlockDetectedError, IntegrityConstraintViolationError
 from pydantic.error_wrappers import ValidationError
 
+from ayon_server.config import ayonconfig
 from ayon_server.entities import UserEntity
 from ayon_server.events import EventStream
 from ayon_server.exceptions import (
@@ -29,6 +31,7 @@ from ayon_server.types import ProjectLevelEntityType
 from ayon_server.utils import create_uuid
 
 from ..common import OperationType, RollbackException
+from .batch import OperationBatch, PendingWrite, is_batchable
 from .entity_create import create_project_level_entity
 from .entity_delete import delete_project_level_entity
 from .entity_update import update_project_level_entity
@@ -42,12 +45,11 @@ async def _process_events(
     sender_type: str | None = None,
 ) -> None:
     """Process a list of events and dispatch them to the event stream."""
-    for event in events:
-        await EventStream.dispatch(
-            sender=sender,
-            sender_type=sender_type,
-            **event,
-        )
+    await EventStream.dispatch_many(
+        events,
+        sender=sender,
+        sender_type=sender_type,
+    )
 
 
 async def _process_operation(
@@ -110,6 +112,80 @@ async def _process_operation(
     )
 
 
+def _failed_response(
+    project_name: str,
+    operation: OperationModel,
+    e: Exception,
+) -> tuple[OperationResponseModel, Exception]:
+    """Create a response for a failed operation.
+
+    Must be called from an exception handler. Returns the response
+    and the exception that should be raised if the processing
+    cannot continue.
+    """
+    op_tag = f"[{operation.entity_type.upper()} {operation.type.upper()}]"
+
+    status: int = 500
+    detail: str = str(e)
+    error_code: str | None = None
+    exc = e
+
+    if isinstance(e, AyonException):
+        logger.debug(
+            f"{op_tag} failed: {e.detail}",
+            project=project_name,
+            operation_id=operation.id,
+        )
+        status = e.status
+        detail = e.detail
+        error_code = e.code
+
+    elif isinstance(e, ValidationError):
+        logger.debug(
+            f"{op_tag} failed: {e}",
+            project=project_name,
+            operation_id=operation.id,
+        )
+        status = 400
+        detail = f"Invalid data provided: {e}"
+        error_code = "invalid_data"
+
+    elif isinstance(e, IntegrityConstraintViolationError):
+        parsed = parse_postgres_exception(e)
+        logger.debug(
+            f"{op_tag} failed: {parsed['detail']}",
+            project=project_name,
+            operation_id=operation.id,
+        )
+        status = parsed["code"]
+        detail = parsed["detail"]
+        error_code = parsed.get("error")
+        exc = ConflictException(parsed["detail"])
+
+    elif isinstance(e, DeadlockDetectedError):
+        exc = DeadlockException()
+        status = exc.status
+        detail = exc.detail
+        error_code = exc.code
+
+    else:
+        log_traceback(f"{op_tag} Unhandled exception")
+
+    return (
+        OperationResponseModel(
+            success=False,
+            id=operation.id,
+            type=operation.type,
+            status=status,
+            detail=detail,
+            error_code=error_code,
+            entity_id=operation.entity_id,
+            entity_type=operation.entity_type,
+        ),
+        exc,
+    )
+
+
 async def _process_operations(
     project_name: str,
     operations: list[OperationModel],
@@ -123,6 +199,9 @@ async def _process_operations(
     This function should not raise an exception. If an operation
     fails, success=False is returned.
 
+    Consecutive creates and updates of the same entity type
+    are written to the database in batches (see batch.py).
+
     Returns a tuple of:
      - list of events to dispatch
      - list of operation responses
@@ -132,6 +211,36 @@ async def _process_operations(
     result: list[OperationResponseModel] = []
     events: list[dict[str, Any]] = []
     entity_types: set[ProjectLevelEntityType] = set()
+    batch = OperationBatch(project_name, ayonconfig.operations_batch_size)
+
+    def on_failure(operation: OperationModel, e: Exception) -> bool:
+        """Handle a failed operation. Return False to stop processing"""
+        response, exc = _failed_response(project_name, operation, e)
+        result.append(response)
+        if can_fail:
+            return True
+        if raise_on_error:
+            raise exc
+        return False
+
+    def on_batch_success(item: PendingWrite) -> None:
+        events.extend(item.events)
+        entity_types.add(item.operation.entity_type)
+        result.append(
+            OperationResponseModel(
+                id=item.operation.id,
+                type=item.operation.type,
+                entity_id=item.entity_id,
+                entity_type=item.operation.entity_type,
+                success=True,
+                status=item.status,
+            )
+        )
+
+    def on_batch_error(item: PendingWrite) -> bool:
+        e = sys.exc_info()[1]
+        assert isinstance(e, Exception)
+        return on_failure(item.operation, e)
 
     logger.debug(f"[OPS] {len(operations)} project {project_name} operations")
     for operation in operations:
@@ -148,6 +257,12 @@ async def _process_operations(
             operation_id=operation.id,
         )
 
+        batchable = batch.max_size > 1 and is_batchable(operation)
+        if batch and not (batchable and batch.accepts(operation)):
+            # Preceding operations must be written first
+            if not await batch.flush(on_batch_success, on_batch_error):
+                break
+
         try:
             # This is a neat trick. transaction() will try
             # to reuse the current transaction if it exists,
@@ -158,6 +273,11 @@ async def _process_operations(
             # to commit all operations at once.
 
             async with Postgres.transaction():
+                if batchable:
+                    # Write is deferred until the batch is flushed
+                    await batch.prepare(operation, user)
+                    continue
+
                 evt, response = await _process_operation(
                     project_name,
                     user,
@@ -177,95 +297,16 @@ async def _process_operations(
             # anyways.
             raise e
 
-        except AyonException as e:
-            logger.debug(
-                f"{op_tag} failed: {e.detail}",
-                project=project_name,
-                operation_id=operation.id,
-            )
-            result.append(
-                OperationResponseModel(
-                    success=False,
-                    id=operation.id,
-                    type=operation.type,
-                    status=e.status,
-                    detail=e.detail,
-                    error_code=e.code,
-                    entity_id=operation.entity_id,
-                    entity_type=operation.entity_type,
-                )
-            )
-            if not can_fail:
-                if raise_on_error:
-                    raise e
-                break
-
-        except ValidationError as e:
-            logger.debug(
-                f"{op_tag} failed: {e}",
-                project=project_name,
-                operation_id=operation.id,
-            )
-            result.append(
-                OperationResponseModel(
-                    success=False,
-                    id=operation.id,
-                    type=operation.type,
-                    status=400,
-                    detail=f"Invalid data provided: {e}",
-                    error_code="invalid_data",
-                    entity_id=operation.entity_id,
-                    entity_type=operation.entity_type,
-                )
-            )
-            if not can_fail:
-                if raise_on_error:
-                    raise e
+        except Exception as e:
+            # Operations prepared before the failed one
+            # must be reported first
+            if not await batch.flush(on_batch_success, on_batch_error):
                 break
-
-        except IntegrityConstraintViolationError as e:
-            parsed = parse_postgres_exception(e)
-            logger.debug(
-                f"{op_tag} failed: {parsed['detail']}",
-                project=project_name,
-                operation_id=operation.id,
-            )
-            result.append(
-                OperationResponseModel(
-                    success=False,
-                    id=operation.id,
-                    type=operation.type,
-                    status=parsed["code"],
-                    detail=parsed["detail"],
-                    error_code=parsed.get("error"),
-                    entity_id=operation.entity_id,
-                    entity_type=operation.entity_type,
-                )
-            )
-
-            if not can_fail:
-                if raise_on_error:
-                    raise ConflictException(parsed["detail"])
+            if not on_failure(operation, e):
                 break
 
-        except Exception as e:
-            log_traceback(f"{op_tag} Unhandled exception")
-            result.append(
-                OperationResponseModel(
-                    success=False,
-                    id=operation.id,
-                    type=operation.type,
-                    status=500,
-                    detail=str(e),
-                    entity_id=operation.entity_id,
-                    entity_type=operation.entity_type,
-                )
-            )
-
-            if not can_fail:
-                if raise_on_error:
-                    raise e
-                break
+    else:
+        await batch.flush(on_batch_success, on_batch_error)
 
     # Create overall success value
     success = all(op.success for op in result)
@@ -483,9 +524,15 @@ class ProjectLevelOperations:
             affected_entity_types = {op.entity_type for op in self.operations}
             for entity_type in affected_entity_types:
                 entity_class = get_entity_class(entity_type)
+                topic_prefix = f"entity.{entity_type}."
+                entity_events = [
+                    event for event in events if event["topic"].startswith(topic_prefix)
+                ]
                 try:
                     logger.trace(f"[OPS] Refreshing views for {entity_type}")
-                    await entity_class.refresh_views(self.project_name)
+                    await entity_class.refresh_views(
+                        self.project_name, events=entity_events
+                    )
                 except DeadlockDetectedError:
                     logger.debug("[OPS] View refresh deadlock. Skipping refresh.")
 
@@ -0,0 +1,270 @@
+"""Batched execution of project-level operations.
+
+Consecutive creates or updates of the same entity type are validated
+one by one (access checks, pre_save hooks and events work exactly as
+in the single operation path), but their writes are deferred and
+executed together: creates as multi-row INSERT statements, updates
+as a pipelined executemany of identical UPDATE statements.
+
+If a batched write fails, it is rolled back to a savepoint and the
+operations are written one by one, so every operation still gets
+its own success/failure response.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ayon_server.entities import UserEntity
+from ayon_server.helpers.get_entity_class import get_entity_class
+from ayon_server.lib.postgres import Postgres
+from ayon_server.types import ProjectLevelEntityType
+
+from .entity_create import build_project_level_entity
+from .entity_update import prepare_project_level_entity_update
+from .models import OperationModel
+
+# Entity types with the default save method and no pre_save hooks
+# that depend on other rows of the same table being already written.
+# Folders are never batched, because validation of folder operations
+# depends on the current state of the hierarchy. Tasks are batched
+# only for updates, as their save method resolves the default task type.
+
+BATCH_CREATE_TYPES: tuple[ProjectLevelEntityType, ...] = (
+    "product",
+    "version",
+    "representation",
+    "workfile",
+)
+
+BATCH_UPDATE_TYPES: tuple[ProjectLevelEntityType, ...] = (
+    "task",
+    "product",
+    "version",
+    "representation",
+    "workfile",
+)
+
+# Postgres limits the number of query parameters to 32767
+MAX_QUERY_ARGS = 32767
+
+
+def is_batchable(operation: OperationModel) -> bool:
+    """Return True if the operation may be written as a part of a batch."""
+    data = operation.data or {}
+
+    if operation.type == "create":
+        if operation.entity_type not in BATCH_CREATE_TYPES:
+            return False
+        if operation.entity_type == "version":
+            # hero version uniqueness is checked in pre_save
+            # against versions already written to the database
+            version = data.get("version")
+            if isinstance(version, int) and version < 0:
+                return False
+        return True
+
+    if operation.type == "update":
+        if operation.entity_type not in BATCH_UPDATE_TYPES:
+            return False
+        if operation.entity_type == "version" and "version" in data:
+            return False
+        return True
+
+    return False
+
+
+@dataclass
+class PendingWrite:
+    operation: OperationModel
+    entity_id: str
+    events: list[dict[str, Any]]
+    status: int
+    query: str | None = None
+    args: list[Any] = field(default_factory=list)
+    columns: tuple[str, ...] = ()
+
+
+class OperationBatch:
+    """Consecutive batchable operations waiting to be written."""
+
+    def __init__(self, project_name: str, max_size: int) -> None:
+        self.project_name = project_name
+        self.max_size = max_size
+        self.items: list[PendingWrite] = []
+        self._default_statuses: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def accepts(self, operation: OperationModel) -> bool:
+        """Return True if the operation may be added to the current batch."""
+        if not self.items:
+            return True
+        if len(self.items) >= self.max_size:
+            return False
+        last = self.items[-1].operation
+        if (operation.type, operation.entity_type) != (last.type, last.entity_type):
+            return False
+        # Operations are validated against the current database row,
+        # so an entity may be written only once per batch
+        if operation.entity_id:
+            entity_id = operation.entity_id.replace("-", "").lower()
+            if any(item.entity_id == entity_id for item in self.items):
+                return False
+        return True
+
+    async def prepare(
+        self,
+        operation: OperationModel,
+        user: UserEntity | None,
+    ) -> None:
+        """Validate the operation and enqueue its write.
+
+        Raises the same exceptions as the non-batched path,
+        in which case nothing is enqueued.
+        """
+        entity_class = get_entity_class(operation.entity_type)
+
+        if operation.type == "create":
+            entity, events = await build_project_level_entity(
+                entity_class,
+                self.project_name,
+                operation,
+                user,
+            )
+            if entity.status is None:
+                # resolve the default status once per entity type
+                entity_type = operation.entity_type
+                if entity_type not in self._default_statuses:
+                    status = await entity.get_default_status()
+                    self._default_statuses[entity_type] = status
+                entity.status = self._default_statuses[entity_type]
+            fields = await entity.prepare_insert()
+            pending = PendingWrite(
+                operation=operation,
+                entity_id=entity.id,
+                events=events,
+                status=201,
+                args=list(fields.values()),
+                columns=tuple(fields.keys()),
+            )
+
+        else:
+            (
+                entity_id,
+                events,
+                query,
+                params,
+            ) = await prepare_project_level_entity_update(
+                entity_class,
+                self.project_name,
+                operation,
+                user,
+            )
+            pending = PendingWrite(
+                operation=operation,
+                entity_id=entity_id,
+                events=events,
+                status=204,
+                query=query,
+                args=params,
+            )
+
+        self.items.append(pending)
+
+    #
+    # Writing
+    #
+
+    def _insert_query(
+        self,
+        entity_type: str,
+        columns: tuple[str, ...],
+        rows: int,
+    ) -> str:
+        ncols = len(columns)
+        values = ", ".join(
+            "(" + ", ".join(f"${r * ncols + c + 1}" for c in range(ncols)) + ")"
+            for r in range(rows)
+        )
+        return f"""
+            INSERT INTO project_{self.project_name}.{entity_type}s
+            ({', '.join(columns)})
+            VALUES {values}
+        """
+
+    async def _write_one(self, item: PendingWrite) -> None:
+        if item.query is not None:
+            await Postgres.execute(item.query, *item.args)
+            return
+        query = self._insert_query(item.operation.entity_type, item.columns, 1)
+        await Postgres.execute(query, *item.args)
+
+    async def _write_all(self, items: list[PendingWrite]) -> None:
+        inserts: dict[tuple[str, ...], list[PendingWrite]] = {}
+        # Updates are written in the request order. Only adjacent
+        # updates with the same query are executed together
+        updates: list[tuple[str, list[PendingWrite]]] = []
+        for item in items:
+            if item.query is None:
+                inserts.setdefault(item.columns, []).append(item)
+            elif updates and updates[-1][0] == item.query:
+                updates[-1][1].append(item)
+            else:
+                updates.append((item.query, [item]))
+
+        for columns, group in inserts.items():
+            entity_type = group[0].operation.entity_type
+            chunk_size = max(1, MAX_QUERY_ARGS // len(columns))
+            for i in range(0, len(group), chunk_size):
+                chunk = group[i : i + chunk_size]
+                query = self._insert_query(entity_type, columns, len(chunk))
+                args = [arg for item in chunk for arg in item.args]
+                await Postgres.execute(query, *args)
+
+        for query, group in updates:
+            await Postgres.executemany(query, [item.args for item in group])
+
+    async def flush(
+        self,
+        on_success: Callable[[PendingWrite], None],
+        on_error: Callable[[PendingWrite], bool],
+    ) -> bool:
+        """Write all pending operations.
+
+        `on_success` is called for every written operation.
+        `on_error` is called from the exception handler of a failed
+        operation and returns False if processing should stop.
+
+        Returns False if processing was stopped.
+        """
+        items, self.items = self.items, []
+        if not items:
+            return True
+
+        async with Postgres.transaction() as conn:
+            try:
+                async with conn.transaction():
+                    await self._write_all(items)
+            except Exception:
+                pass
+            else:
+                for item in items:
+                    on_success(item)
+                return True
+
+            # Batch failed. Write the operations one by one
+            # to find out which of them caused the failure.
+
+            for item in items:
+                try:
+                    async with conn.transaction():
+                        await self._write_one(item)
+                except Exception:
+                    if not on_error(item):
+                        return False
+                else:
+                    on_success(item)
+
+        return True
@@ -7,12 +7,16 @@ from ayon_server.exceptions import BadRequestException, ForbiddenException
 from .models import OperationModel
 
 
-async def create_project_level_entity(
+async def build_project_level_entity(
     entity_class: type[ProjectLevelEntity],
     project_name: str,
     operation: OperationModel,
     user: UserEntity | None,
-) -> tuple[str, list[dict[str, Any]], int]:
+) -> tuple[ProjectLevelEntity, list[dict[str, Any]]]:
+    """Validate a create operation and build the new (unsaved) entity.
+
+    Returns the entity and the list of events to dispatch after it is saved.
+    """
     assert operation.data is not None, "data is required for create"
 
     payload = entity_class.model.post_model(**operation.data)
@@ -57,5 +61,20 @@ async def create_project_level_entity(
             "user": user.name if user else None,
         }
     ]
+    return entity, events
+
+
+async def create_project_level_entity(
+    entity_class: type[ProjectLevelEntity],
+    project_name: str,
+    operation: OperationModel,
+    user: UserEntity | None,
+) -> tuple[str, list[dict[str, Any]], int]:
+    entity, events = await build_project_level_entity(
+        entity_class,
+        project_name,
+        operation,
+        user,
+    )
     await entity.save(auto_commit=False)
     return entity.id, events, 201
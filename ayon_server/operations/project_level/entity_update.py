@@ -96,12 +96,17 @@ async def sanitize_folder_update(
             )
 
 
-async def update_project_level_entity(
+async def prepare_project_level_entity_update(
     entity_class: type[ProjectLevelEntity],
     project_name: str,
     operation: OperationModel,
     user: UserEntity | None,
-) -> tuple[str, list[dict[str, Any]], int]:
+) -> tuple[str, list[dict[str, Any]], str, list[Any]]:
+    """Validate an update operation and build the update query.
+
+    Returns a tuple of entity id, list of events to dispatch,
+    and the query with its parameters, that is not executed.
+    """
     assert operation.data is not None, "data is required for update"
     assert operation.entity_id is not None, "entity_id is required for update"
 
@@ -165,6 +170,20 @@ async def update_project_level_entity(
     )
 
     await entity.pre_save(False)
-    await Postgres.execute(query, *params)
+    return entity.id, events, query, params
+
 
-    return entity.id, events, 204
+async def update_project_level_entity(
+    entity_class: type[ProjectLevelEntity],
+    project_name: str,
+    operation: OperationModel,
+    user: UserEntity | None,
+) -> tuple[str, list[dict[str, Any]], int]:
+    entity_id, events, query, params = await prepare_project_level_entity_update(
+        entity_class,
+        project_name,
+        operation,
+        user,
+    )
+    await Postgres.execute(query, *params)
+    return entity_id, events, 204
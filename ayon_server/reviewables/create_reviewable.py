@@ -5,6 +5,7 @@ from ayon_server.events import EventStream
 from ayon_server.exceptions import BadRequestException
 from ayon_server.files import Storages, create_project_file_record
 from ayon_server.helpers.ffprobe import availability_from_media_info
+from ayon_server.helpers.preview import schedule_file_preview
 from ayon_server.logging import logger
 from ayon_server.reviewables.models import ReviewableAuthor, ReviewableModel
 
@@ -69,6 +70,8 @@ async def create_reviewable(
         user_name=user_name,
     )
 
+    schedule_file_preview(project_name, file_id, content_type)
+
     # Create activity
 
     body = f"""Uploaded a reviewable '{label or file_name}'"""
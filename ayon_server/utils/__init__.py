@@ -8,6 +8,7 @@ __all__ = [
     "json_dumps",
     "json_print",
     "RequestCoalescer",
+    "SQLArgs",
     "SQLTool",
     "camelize",
     "get_base_name",
@@ -32,7 +33,7 @@ from .hashing import create_hash, create_uuid, hash_data
 from .json import json_dumps, json_loads, json_print
 from .request_coalescer import RequestCoalescer
 from .server import server_url_from_request
-from .sqltool import SQLTool
+from .sqltool import SQLArgs, SQLTool
 from .strings import (
     camelize,
     format_filesize,
@@ -1,4 +1,4 @@
-__all__ = ["SQLTool"]
+__all__ = ["SQLTool", "SQLArgs"]
 
 import uuid
 from typing import Any
@@ -132,3 +132,39 @@ class SQLTool:
         for key in keys:
             result.append(kwargs[key])
         return result
+
+
+class SQLArgs:
+    """Query arguments collector.
+
+    Values are passed to the query as arguments instead of being inlined
+    to the SQL, so queries built for different values have the same text
+    and their prepared statements are reused from the connection cache.
+
+        args = SQLArgs()
+        conditions = [f"id = ANY({args.ids(ids)})"]
+        query = f"SELECT * FROM folders {SQLTool.conditions(conditions)}"
+        await Postgres.fetch(query, *args)
+    """
+
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def add(self, value: Any) -> str:
+        """Add a value and return its placeholder"""
+        self.values.append(value)
+        return f"${len(self.values)}"
+
+    def ids(self, ids: list[str] | list[uuid.UUID]) -> str:
+        """Add a list of entity IDs and return an uuid[] placeholder
+
+        Null values will be ignored.
+        """
+        parsed = [EntityID.parse(id, allow_nulls=True) for id in ids]
+        return f"{self.add([id for id in parsed if id is not None])}::uuid[]"
@@ -0,0 +1,3 @@
+__all__ = ["benchmark_previews"]
+
+from .benchmark_previews import benchmark_previews
@@ -0,0 +1,58 @@
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from ayon_server.cli import app
+from ayon_server.exceptions import AyonException
+from ayon_server.helpers.preview import (
+    FILE_PREVIEW_SIZE,
+    create_image_preview,
+    create_video_thumbnail,
+)
+from ayon_server.logging import logger
+
+
+async def measure(
+    name: str,
+    func: Callable[[], Awaitable[bytes]],
+    iterations: int,
+) -> None:
+    timings: list[float] = []
+    size = 0
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        try:
+            size = len(await func())
+        except (FileNotFoundError, AyonException) as e:
+            # Pillow path raises UnsupportedMediaException
+            # for missing and undecodable files
+            logger.error(f"{name}: {e}")
+            return
+        if not size:
+            # ffmpeg returns an empty payload when it fails
+            logger.error(f"{name}: no preview was created")
+            return
+        timings.append(time.perf_counter() - start_time)
+
+    logger.info(
+        f"{name}: median {statistics.median(timings) * 1000:.1f} ms, "
+        f"min {min(timings) * 1000:.1f} ms, "
+        f"max {max(timings) * 1000:.1f} ms, "
+        f"preview size {size} bytes"
+    )
+
+
+@app.command()
+async def benchmark_previews(path: str, iterations: int = 10) -> None:
+    """Compare preview generation of an image using Pillow and ffmpeg."""
+
+    await measure(
+        "Pillow",
+        lambda: create_image_preview(path, FILE_PREVIEW_SIZE),
+        iterations,
+    )
+    await measure(
+        "ffmpeg",
+        lambda: create_video_thumbnail(path, FILE_PREVIEW_SIZE),
+        iterations,
+    )
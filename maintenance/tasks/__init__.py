@@ -10,6 +10,7 @@ from .remove_unused_activities import RemoveUnusedActivities
 from .remove_unused_files import RemoveUnusedFiles
 from .remove_unused_settings import RemoveUnusedSettings
 from .remove_unused_thumbnails import RemoveUnusedThumbnails
+from .verify_hierarchy_cache import VerifyHierarchyCache
 
 # from .vacuum_db import VacuumDB
 
@@ -23,6 +24,7 @@ task_sequence = [
     RemoveUnusedFiles,
     RemoveUnusedSettings,
     RemoveUnusedThumbnails,
+    VerifyHierarchyCache,
     # VacuumDB, -- too expensive. maybe run it manually?
     PushMetrics,
 ]
@@ -0,0 +1,9 @@
+from ayon_server.helpers.hierarchy_cache import verify_hierarchy_cache
+from maintenance.maintenance_task import ProjectMaintenanceTask
+
+
+class VerifyHierarchyCache(ProjectMaintenanceTask):
+    description = "Verifying hierarchy cache"
+
+    async def main(self, project_name: str):
+        await verify_hierarchy_cache(project_name)
@@ -0,0 +1,108 @@
+-----------------
+-- Ayon 1.12.4 --
+-----------------
+
+-- Replace the hierarchy materialized view with a regular table
+-- maintained by triggers on the folders table, so folder writes
+-- only touch affected rows and the view never needs to be refreshed.
+
+DO $$
+DECLARE rec RECORD;
+BEGIN
+    FOR rec IN SELECT schemaname FROM pg_matviews
+    WHERE matviewname = 'hierarchy'
+    AND schemaname LIKE 'project_%'
+
+    LOOP
+        BEGIN
+          EXECUTE 'SET LOCAL search_path TO ' || quote_ident(rec.schemaname);
+
+          DROP MATERIALIZED VIEW hierarchy;
+
+          CREATE TABLE hierarchy(
+            id UUID NOT NULL PRIMARY KEY REFERENCES folders(id) ON DELETE CASCADE,
+            path VARCHAR NOT NULL
+          );
+
+          WITH RECURSIVE h AS (
+              SELECT id, name, parent_id, 1 as pos, id as base_id
+              FROM folders
+              UNION
+              SELECT e.id, e.name, e.parent_id, pos + 1, base_id
+              FROM folders e
+              INNER JOIN h s ON s.parent_id = e.id
+          )
+          INSERT INTO hierarchy (id, path)
+          SELECT base_id, string_agg(name, '/' ORDER BY pos DESC)
+          FROM h GROUP BY base_id;
+
+          CREATE INDEX hierarchy_path_idx ON hierarchy (path varchar_pattern_ops);
+
+          CREATE OR REPLACE FUNCTION update_hierarchy() RETURNS TRIGGER AS $fn$
+          DECLARE
+            parent_path VARCHAR;
+            old_path VARCHAR;
+            new_path VARCHAR;
+          BEGIN
+            IF NEW.parent_id IS NULL THEN
+              new_path := NEW.name;
+            ELSE
+              SELECT path INTO parent_path FROM hierarchy WHERE id = NEW.parent_id;
+              IF parent_path IS NULL THEN
+                -- parent path is not known yet (e.g. parent is created
+                -- later in the same statement). resolve it from folders
+                WITH RECURSIVE parents AS (
+                  SELECT id, name, parent_id, 1 AS pos FROM folders WHERE id = NEW.parent_id
+                  UNION ALL
+                  SELECT f.id, f.name, f.parent_id, p.pos + 1
+                  FROM folders f INNER JOIN parents p ON f.id = p.parent_id
+                ) SELECT string_agg(name, '/' ORDER BY pos DESC) INTO parent_path FROM parents;
+              END IF;
+              new_path := parent_path || '/' || NEW.name;
+            END IF;
+
+            IF TG_OP = 'INSERT' THEN
+              INSERT INTO hierarchy (id, path) VALUES (NEW.id, new_path)
+              ON CONFLICT (id) DO UPDATE SET path = EXCLUDED.path;
+              RETURN NULL;
+            END IF;
+
+            SELECT path INTO old_path FROM hierarchy WHERE id = NEW.id;
+            IF old_path IS NULL THEN
+              INSERT INTO hierarchy (id, path) VALUES (NEW.id, new_path);
+              RETURN NULL;
+            END IF;
+
+            WITH RECURSIVE subtree AS (
+              SELECT NEW.id AS id
+              UNION ALL
+              SELECT f.id FROM folders f INNER JOIN subtree s ON f.parent_id = s.id
+            )
+            UPDATE hierarchy h
+            SET path = new_path || substr(h.path, length(old_path) + 1)
+            FROM subtree s WHERE h.id = s.id;
+
+            RETURN NULL;
+          END;
+          $fn$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+          CREATE TRIGGER folder_hierarchy_insert
+            AFTER INSERT ON folders
+            FOR EACH ROW EXECUTE FUNCTION update_hierarchy();
+
+          CREATE TRIGGER folder_hierarchy_update
+            AFTER UPDATE OF name, parent_id ON folders
+            FOR EACH ROW
+            WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.parent_id IS DISTINCT FROM NEW.parent_id)
+            EXECUTE FUNCTION update_hierarchy();
+
+        EXCEPTION
+          WHEN OTHERS THEN
+             -- Nothing refreshes the old materialized view anymore,
+             -- so the migration must not leave any project unconverted
+             RAISE WARNING 'Unable to convert hierarchy of schema %: %', rec.schemaname, SQLERRM;
+             RAISE;
+        END;
+    END LOOP;
+    RETURN;
+END $$;
@@ -191,30 +191,76 @@ CREATE UNIQUE INDEX folder_root_unique_name ON folders (LOWER(name))
     WHERE (active IS TRUE AND parent_id IS NULL);
 
 
--- Hierarchy view
--- Materialized view used as a shorthand to get folder parents/full path
+-- Hierarchy table
+-- Used as a shorthand to get folder parents/full path.
+-- Maintained by triggers on the folders table: creating a folder
+-- inserts its path, renaming or moving a folder updates paths
+-- of the folder and its descendants. Deleting cascades.
+
+CREATE TABLE hierarchy(
+  id UUID NOT NULL PRIMARY KEY REFERENCES folders(id) ON DELETE CASCADE,
+  path VARCHAR NOT NULL
+);
 
-CREATE MATERIALIZED VIEW hierarchy
-AS
-    WITH htable AS (
-        WITH RECURSIVE hierarchy AS (
-            SELECT id, name, parent_id, 1 as pos, id as base_id
-            FROM
-                folders
-            UNION
-                SELECT e.id, e.name, e.parent_id, pos + 1, base_id
-                FROM folders e
-                INNER JOIN hierarchy s ON s.parent_id = e.id
-        ) SELECT
-            base_id,
-            string_agg(name, '/' ORDER BY pos DESC) as path
-        FROM
-            hierarchy
-        GROUP BY base_id
-   )
-   SELECT base_id AS id, path FROM htable;
-
-CREATE UNIQUE INDEX hierarchy_id ON hierarchy (id);
+CREATE INDEX hierarchy_path_idx ON hierarchy (path varchar_pattern_ops);
+
+CREATE OR REPLACE FUNCTION update_hierarchy() RETURNS TRIGGER AS $$
+DECLARE
+  parent_path VARCHAR;
+  old_path VARCHAR;
+  new_path VARCHAR;
+BEGIN
+  IF NEW.parent_id IS NULL THEN
+    new_path := NEW.name;
+  ELSE
+    SELECT path INTO parent_path FROM hierarchy WHERE id = NEW.parent_id;
+    IF parent_path IS NULL THEN
+      -- parent path is not known yet (e.g. parent is created
+      -- later in the same statement). resolve it from folders
+      WITH RECURSIVE parents AS (
+        SELECT id, name, parent_id, 1 AS pos FROM folders WHERE id = NEW.parent_id
+        UNION ALL
+        SELECT f.id, f.name, f.parent_id, p.pos + 1
+        FROM folders f INNER JOIN parents p ON f.id = p.parent_id
+      ) SELECT string_agg(name, '/' ORDER BY pos DESC) INTO parent_path FROM parents;
+    END IF;
+    new_path := parent_path || '/' || NEW.name;
+  END IF;
+
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO hierarchy (id, path) VALUES (NEW.id, new_path)
+    ON CONFLICT (id) DO UPDATE SET path = EXCLUDED.path;
+    RETURN NULL;
+  END IF;
+
+  SELECT path INTO old_path FROM hierarchy WHERE id = NEW.id;
+  IF old_path IS NULL THEN
+    INSERT INTO hierarchy (id, path) VALUES (NEW.id, new_path);
+    RETURN NULL;
+  END IF;
+
+  WITH RECURSIVE subtree AS (
+    SELECT NEW.id AS id
+    UNION ALL
+    SELECT f.id FROM folders f INNER JOIN subtree s ON f.parent_id = s.id
+  )
+  UPDATE hierarchy h
+  SET path = new_path || substr(h.path, length(old_path) + 1)
+  FROM subtree s WHERE h.id = s.id;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SET search_path FROM CURRENT;
+
+CREATE TRIGGER folder_hierarchy_insert
+  AFTER INSERT ON folders
+  FOR EACH ROW EXECUTE FUNCTION update_hierarchy();
+
+CREATE TRIGGER folder_hierarchy_update
+  AFTER UPDATE OF name, parent_id ON folders
+  FOR EACH ROW
+  WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.parent_id IS DISTINCT FROM NEW.parent_id)
+  EXECUTE FUNCTION update_hierarchy();
 
 
 CREATE TABLE exported_attributes(
@@ -0,0 +1,103 @@
+import fnmatch
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from redis.exceptions import LockError
+
+from ayon_server.lib.redis import Redis
+
+
+class FakePipeline:
+    def __init__(self, store: dict):
+        self.store = store
+        self.commands: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        for name, args, kwargs in self.commands:
+            key = args[0]
+            if name == "set":
+                self.store[key] = args[1].encode()
+            elif name == "delete":
+                self.store.pop(key, None)
+            elif name == "hset":
+                mapping = {k.encode(): v.encode() for k, v in kwargs["mapping"].items()}
+                self.store.setdefault(key, {}).update(mapping)
+            elif name == "hdel":
+                for field in args[1:]:
+                    self.store.get(key, {}).pop(field.encode(), None)
+        self.commands = []
+
+
+class FakeLock:
+    def __init__(self, pool: "FakeRedisPool", name: str):
+        self.pool = pool
+        self.name = name
+
+    async def __aenter__(self):
+        if self.name in self.pool.locks:
+            raise LockError("Unable to acquire lock")
+        self.pool.locks.add(self.name)
+
+    async def __aexit__(self, *args):
+        self.pool.locks.discard(self.name)
+
+
+class FakeRedisPool:
+    """Minimal in-memory replacement of the commands used by the cache"""
+
+    def __init__(self):
+        self.store: dict = {}
+        self.locks: set[str] = set()
+        self.published: list[tuple[str, str]] = []
+
+    def lock(self, name: str, **kwargs) -> FakeLock:
+        return FakeLock(self, name)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self.store)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def execute_command(self, command, key, value, *args):
+        assert command == "set", f"Unsupported command {command}"
+        self.store[key] = value.encode() if isinstance(value, str) else value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    async def keys(self, pattern):
+        return [key for key in self.store if fnmatch.fnmatchcase(key, pattern)]
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    async def hgetall(self, key):
+        return dict(self.store.get(key, {}))
+
+    async def hmget(self, key, fields):
+        values = self.store.get(key, {})
+        return [values.get(field.encode()) for field in fields]
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    pool = FakeRedisPool()
+    monkeypatch.setattr(Redis, "redis_pool", pool, raising=False)
+    monkeypatch.setattr(Redis, "connected", True)
+    return pool
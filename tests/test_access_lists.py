@@ -0,0 +1,93 @@
+import asyncio
+import os
+import sys
+import types
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+# Load entities first, the access modules import each other through them
+import ayon_server.entities  # noqa: F401
+from ayon_server.access.permissions import FolderAccess, FolderAccessList
+from ayon_server.access.utils import invalidate_folder_access_lists, parse_permset
+from ayon_server.lib.postgres import Postgres
+
+PROJECT_NAME = "demo"
+
+ALICE = types.SimpleNamespace(name="alice")
+ASSIGNED = FolderAccessList(
+    enabled=True,
+    access_list=[FolderAccess(access_type="assigned")],
+)
+
+
+@pytest.fixture
+def assignments(redis, monkeypatch):
+    """Paths of folders with tasks assigned to the user and executed queries"""
+
+    state = {"paths": ["shots/sh010"], "queries": 0, "during_query": None}
+
+    async def iterate(query, *args, **kwargs):
+        state["queries"] += 1
+        if state["during_query"] is not None:
+            await state["during_query"]()
+        for path in state["paths"]:
+            yield {"path": path}
+
+    monkeypatch.setattr(Postgres, "iterate", staticmethod(iterate))
+    return state
+
+
+def parse(permset: FolderAccessList = ASSIGNED) -> list[str] | None:
+    result = asyncio.run(parse_permset(ALICE, PROJECT_NAME, "update", permset))  # type: ignore
+    return sorted(result) if result is not None else None
+
+
+def test_cached_until_invalidated(assignments):
+    assert parse() == ['"shots/sh010"', '"shots/sh010/%"']
+    assignments["paths"] = ["shots/sh020"]
+    assert parse() == ['"shots/sh010"', '"shots/sh010/%"']
+    assert assignments["queries"] == 1
+
+    status_changed = [{"topic": "entity.task.status_changed"}]
+    asyncio.run(invalidate_folder_access_lists(PROJECT_NAME, status_changed))
+    assert parse() == ['"shots/sh010"', '"shots/sh010/%"']
+    assert assignments["queries"] == 1
+
+    assignees_changed = [{"topic": "entity.task.assignees_changed"}]
+    asyncio.run(invalidate_folder_access_lists(PROJECT_NAME, assignees_changed))
+    assert parse() == ['"shots/sh020"', '"shots/sh020/%"']
+    assert assignments["queries"] == 2
+
+
+def test_permission_change_is_not_served_from_cache(assignments):
+    parse()
+    permset = FolderAccessList(
+        enabled=True,
+        access_list=[
+            FolderAccess(access_type="assigned"),
+            FolderAccess(access_type="hierarchy", path="assets"),
+        ],
+    )
+    assert parse(permset) == [
+        '"assets"',
+        '"assets/%"',
+        '"shots/sh010"',
+        '"shots/sh010/%"',
+    ]
+    assert assignments["queries"] == 2
+
+
+def test_list_built_during_invalidation_is_not_used(assignments):
+    """A list loaded before an invalidation must not be served after it"""
+
+    async def invalidate():
+        assignments["during_query"] = None
+        await invalidate_folder_access_lists(PROJECT_NAME)
+
+    assignments["during_query"] = invalidate
+    parse()
+    assignments["paths"] = ["shots/sh020"]
+    assert parse() == ['"shots/sh020"', '"shots/sh020/%"']
+    assert assignments["queries"] == 2
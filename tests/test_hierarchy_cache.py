@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import ayon_server.helpers.hierarchy_cache as hierarchy_cache
+from api.folders.list_folders import FolderListLoader
+from ayon_server.lib.redis import Redis
+
+PROJECT_NAME = "demo"
+
+
+def folder(folder_id: str, name: str) -> dict:
+    return {
+        "id": folder_id,
+        "name": name,
+        "parent_id": None,
+        "attrib": {},
+        "own_attrib": [],
+    }
+
+
+def test_version_changes_after_every_write(redis):
+    async def run():
+        await hierarchy_cache._store_hierarchy(PROJECT_NAME, [folder("a", "a")])
+        v1 = await hierarchy_cache.get_hierarchy_cache_version(PROJECT_NAME)
+        await hierarchy_cache._store_folders(PROJECT_NAME, {}, {"a"})
+        v2 = await hierarchy_cache.get_hierarchy_cache_version(PROJECT_NAME)
+        await hierarchy_cache.clear_hierarchy_cache(PROJECT_NAME)
+        assert await hierarchy_cache.get_hierarchy_cache_version(PROJECT_NAME) is None
+        await hierarchy_cache._store_hierarchy(PROJECT_NAME, [folder("a", "a")])
+        v3 = await hierarchy_cache.get_hierarchy_cache_version(PROJECT_NAME)
+        return v1, v2, v3
+
+    v1, v2, v3 = asyncio.run(run())
+    assert None not in (v1, v2, v3)
+    assert len({v1, v2, v3}) == 3
+
+
+def test_folder_list_not_stale_after_clear(redis, monkeypatch):
+    """A list cached in memory must not survive clearing the cache"""
+
+    folders = [folder("a", "before")]
+
+    async def load_hierarchy(project_name):
+        return folders
+
+    monkeypatch.setattr(hierarchy_cache, "_load_hierarchy", load_hierarchy)
+
+    async def run():
+        loader = FolderListLoader()
+        first = await loader.get_folder_list(PROJECT_NAME)
+        await hierarchy_cache.clear_hierarchy_cache(PROJECT_NAME)
+        folders[0] = folder("a", "after")
+        second = await loader.get_folder_list(PROJECT_NAME)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first[0]["name"] == "before"
+    assert second[0]["name"] == "after"
+
+
+def test_update_clears_cache_when_locked(redis, monkeypatch):
+    """Writers of another process hold the lock: the cache is dropped"""
+
+    async def load_hierarchy(project_name):
+        return [folder("a", "a")]
+
+    monkeypatch.setattr(hierarchy_cache, "_load_hierarchy", load_hierarchy)
+
+    async def run():
+        await hierarchy_cache.rebuild_hierarchy_cache(PROJECT_NAME)
+        assert await hierarchy_cache.get_hierarchy_cache_version(PROJECT_NAME)
+        redis.locks.add(f"{Redis.prefix}{hierarchy_cache.NS_LOCK}-{PROJECT_NAME}")
+        await hierarchy_cache.refresh_hierarchy_cache_entities(
+            PROJECT_NAME, "folder", ["a"]
+        )
+        return await hierarchy_cache.get_hierarchy_cache_version(PROJECT_NAME)
+
+    assert asyncio.run(run()) is None
+
+
+def test_verify_ignores_updated_at(redis, monkeypatch):
+    folders = [folder("a", "a") | {"updated_at": "2024-01-01T00:00:00"}]
+
+    async def load_hierarchy(project_name):
+        return [dict(f) for f in folders]
+
+    monkeypatch.setattr(hierarchy_cache, "_load_hierarchy", load_hierarchy)
+
+    async def run():
+        await hierarchy_cache.rebuild_hierarchy_cache(PROJECT_NAME)
+        folders[0]["updated_at"] = "2024-01-02T00:00:00"
+        return await hierarchy_cache.verify_hierarchy_cache(PROJECT_NAME)
+
+    assert asyncio.run(run())
+
+
+def test_verify_repairs_under_lock(redis, monkeypatch):
+    folders = [folder("a", "before")]
+
+    async def load_hierarchy(project_name):
+        return [dict(f) for f in folders]
+
+    monkeypatch.setattr(hierarchy_cache, "_load_hierarchy", load_hierarchy)
+    lock_name = f"{Redis.prefix}{hierarchy_cache.NS_LOCK}-{PROJECT_NAME}"
+
+    async def run():
+        await hierarchy_cache.rebuild_hierarchy_cache(PROJECT_NAME)
+        folders[0] = folder("a", "after")
+
+        # another writer holds the lock: the cache is not overwritten
+        redis.locks.add(lock_name)
+        assert not await hierarchy_cache.verify_hierarchy_cache(PROJECT_NAME)
+        redis.locks.discard(lock_name)
+        assert await hierarchy_cache.get_hierarchy_cache_version(PROJECT_NAME) is None
+
+        await hierarchy_cache.rebuild_hierarchy_cache(PROJECT_NAME)
+        folders[0] = folder("a", "repaired")
+        assert not await hierarchy_cache.verify_hierarchy_cache(PROJECT_NAME)
+        return await hierarchy_cache.load_hierarchy_cache(PROJECT_NAME)
+
+    assert asyncio.run(run())[0]["name"] == "repaired"
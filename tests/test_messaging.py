@@ -0,0 +1,96 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ayon_server.api.messaging import SubscriptionIndex
+
+
+class FakeClient:
+    def __init__(
+        self,
+        client_id: str,
+        topics: list[str],
+        project_name: str | None = None,
+        user_name: str | None = None,
+        projects: set[str] | None = None,
+    ):
+        self.id = client_id
+        self.topics = topics
+        self.project_name = project_name
+        self.user_name = user_name
+        self.projects = projects
+
+    def can_access_project(self, project_name: str) -> bool:
+        return self.projects is None or project_name in self.projects
+
+
+def match(index: SubscriptionIndex, **message) -> set[str]:
+    return {client.id for client in index.match(message)}
+
+
+@pytest.fixture
+def index():
+    index = SubscriptionIndex()
+    index.add(FakeClient("all", ["*"]))  # type: ignore
+    index.add(FakeClient("entity", ["entity."]))  # type: ignore
+    index.add(FakeClient("folder", ["entity.folder"], user_name="alice"))  # type: ignore
+    index.add(FakeClient("demo", ["entity"], project_name="demo"))  # type: ignore
+    index.add(FakeClient("limited", ["entity"], projects={"other"}))  # type: ignore
+    return index
+
+
+def test_topic_prefixes(index):
+    assert match(index, topic="entity.folder.created") == {
+        "all",
+        "entity",
+        "folder",
+        "demo",
+        "limited",
+    }
+    assert match(index, topic="entity.task.created") == {
+        "all",
+        "entity",
+        "demo",
+        "limited",
+    }
+    assert match(index, topic="server.update") == {"all"}
+    assert match(index, topic="entity") == {"all", "demo", "limited"}
+
+
+def test_project_filter(index):
+    assert match(index, topic="entity.task.created", project="other") == {
+        "all",
+        "entity",
+        "limited",
+    }
+    assert match(index, topic="entity.task.created", project="demo") == {
+        "all",
+        "entity",
+        "demo",
+    }
+
+
+def test_recipients(index):
+    message = {"topic": "entity.folder.created", "recipients": ["alice"]}
+    assert match(index, **message) == {"folder"}
+    message["recipients"] = []
+    assert match(index, **message) == set()
+
+
+def test_remove_prunes_index(index):
+    for client_id in ("all", "entity", "folder", "demo", "limited"):
+        index.remove(client_id)
+    assert len(index) == 0
+    assert index.topics == {}
+    assert index.projects == {}
+    assert index.recipients == {}
+    assert not index.wildcard
+
+
+def test_resubscribe(index):
+    index.add(FakeClient("entity", ["server."]))  # type: ignore
+    assert "entity" not in match(index, topic="entity.task.created")
+    assert match(index, topic="server.update") == {"all", "entity"}
@@ -0,0 +1,143 @@
+import asyncio
+import contextlib
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+import ayon_server.operations.project_level.batch as batch_module
+from ayon_server.lib.postgres import Postgres
+from ayon_server.operations.project_level import _process_operations
+from ayon_server.operations.project_level.batch import OperationBatch
+from ayon_server.operations.project_level.models import OperationModel
+
+PROJECT_NAME = "demo"
+TASK_X = "af10c8f0e9b111e9b8f90242ac130003"
+TASK_Y = "bf10c8f0e9b111e9b8f90242ac130003"
+TASK_Z = "cf10c8f0e9b111e9b8f90242ac130003"
+
+
+class FakeConnection:
+    def transaction(self):
+        return contextlib.AsyncExitStack()
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """In-memory task rows updated by queries built as `UPDATE col1,col2`"""
+
+    rows = {
+        TASK_X: {"status": "New", "name": "x"},
+        TASK_Y: {"status": "New", "name": "y"},
+        TASK_Z: {"status": "New", "name": "z"},
+    }
+    written: list[str] = []
+
+    def apply(query: str, args) -> None:
+        columns = query.removeprefix("UPDATE ").split(",")
+        *values, entity_id = args
+        rows[entity_id].update(zip(columns, values, strict=True))
+
+    async def prepare(entity_class, project_name, operation, user):
+        row = rows[operation.entity_id]
+        columns = sorted(operation.data)
+        events = [
+            {
+                "topic": f"entity.task.{column}_changed",
+                "summary": {"entityId": operation.entity_id},
+                "payload": {"old": row[column], "new": operation.data[column]},
+            }
+            for column in columns
+        ]
+        query = f"UPDATE {','.join(columns)}"
+        params = [operation.data[c] for c in columns] + [operation.entity_id]
+        return operation.entity_id, events, query, params
+
+    async def execute(query, *args, **kwargs):
+        written.append(query)
+        apply(query, args)
+        return "UPDATE 1"
+
+    async def executemany(query, args_list, **kwargs):
+        written.append(query)
+        for args in args_list:
+            apply(query, args)
+
+    @contextlib.asynccontextmanager
+    async def transaction(**kwargs):
+        yield FakeConnection()
+
+    monkeypatch.setattr(batch_module, "prepare_project_level_entity_update", prepare)
+    monkeypatch.setattr(Postgres, "execute", staticmethod(execute))
+    monkeypatch.setattr(Postgres, "executemany", staticmethod(executemany))
+    monkeypatch.setattr(Postgres, "transaction", staticmethod(transaction))
+    return rows, written
+
+
+def update(entity_id: str, **data) -> OperationModel:
+    return OperationModel(
+        type="update",
+        entity_type="task",
+        entity_id=entity_id,
+        data=data,
+    )
+
+
+def process(operations: list[OperationModel]):
+    return asyncio.run(_process_operations(PROJECT_NAME, operations, {}))
+
+
+def test_updates_of_the_same_entity(database):
+    """Later updates of an entity see the row written by the earlier ones"""
+    rows, _ = database
+    events, response = process(
+        [
+            update(TASK_X, status="A", name="x1"),
+            update(TASK_X, status="B"),
+            update(TASK_X, status="C", name="x2"),
+        ]
+    )
+
+    assert response.success
+    assert rows[TASK_X] == {"status": "C", "name": "x2"}
+    status_changes = [
+        (e["payload"]["old"], e["payload"]["new"])
+        for e in events
+        if e["topic"] == "entity.task.status_changed"
+    ]
+    assert status_changes == [("New", "A"), ("A", "B"), ("B", "C")]
+
+
+def test_updates_are_written_in_request_order(database):
+    rows, written = database
+    _, response = process(
+        [
+            update(TASK_X, status="A", name="x1"),
+            update(TASK_Y, status="B"),
+            update(TASK_Z, status="C", name="z1"),
+            update(TASK_Y, name="y1"),
+        ]
+    )
+
+    assert response.success
+    assert rows[TASK_X] == {"status": "A", "name": "x1"}
+    assert rows[TASK_Y] == {"status": "B", "name": "y1"}
+    assert rows[TASK_Z] == {"status": "C", "name": "z1"}
+    assert written == [
+        "UPDATE name,status",
+        "UPDATE status",
+        "UPDATE name,status",
+        "UPDATE name",
+    ]
+
+
+def test_batch_does_not_accept_entity_twice(database):
+    batch = OperationBatch(PROJECT_NAME, max_size=10)
+
+    asyncio.run(batch.prepare(update(TASK_X, status="A"), None))
+    assert batch.accepts(update(TASK_Y, status="A"))
+    assert not batch.accepts(update(TASK_X, status="B"))
+    dashed = "af10c8f0-e9b1-11e9-b8f9-0242ac130003".upper()
+    assert not batch.accepts(update(dashed, status="B"))
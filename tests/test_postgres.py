@@ -0,0 +1,145 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ayon_server.lib.postgres_routing import ReplicaRouter, is_read_only_query
+from ayon_server.lib.postgres_stats import normalize_query
+from ayon_server.utils.sqltool import SQLArgs
+
+FOLDER_ID = "af10c8f0e9b111e9b8f90242ac130003"
+
+
+class TestSQLArgs:
+    def test_placeholders(self):
+        args = SQLArgs()
+        assert args.add("a") == "$1"
+        assert args.add(2) == "$2"
+        assert len(args) == 2
+        assert list(args) == ["a", 2]
+
+    def test_ids(self):
+        args = SQLArgs()
+        args.add("name")
+        dashed = "af10c8f0-e9b1-11e9-b8f9-0242ac130003"
+        assert args.ids([FOLDER_ID, None, dashed]) == "$2::uuid[]"  # type: ignore
+        assert list(args) == ["name", [FOLDER_ID, FOLDER_ID]]
+
+    def test_invalid_id(self):
+        with pytest.raises(ValueError):
+            SQLArgs().ids(["nope"])
+
+    def test_same_query_for_different_values(self):
+        queries = []
+        for ids in ([FOLDER_ID], [FOLDER_ID, FOLDER_ID]):
+            args = SQLArgs()
+            queries.append(f"SELECT * FROM folders WHERE id = ANY({args.ids(ids)})")
+        assert queries[0] == queries[1]
+
+
+class TestNormalizeQuery:
+    def test_literals(self):
+        query = "SELECT * FROM t WHERE name = 'it''s' AND size > 10.5 AND id = $1"
+        expected = "SELECT * FROM t WHERE name = ? AND size > ? AND id = $1"
+        assert normalize_query(query) == expected
+
+    def test_lists_and_projects(self):
+        query = """
+            SELECT id
+            FROM project_demo.folders
+            WHERE id IN ('a', 'b', 'c') AND depth = ANY(ARRAY[1, 2])
+        """
+        expected = (
+            "SELECT id FROM project_?.folders "
+            "WHERE id IN (?) AND depth = ANY(ARRAY[?])"
+        )
+        assert normalize_query(query) == expected
+
+    def test_identifiers_are_kept(self):
+        assert normalize_query("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
+
+
+class TestIsReadOnlyQuery:
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "SELECT 1",
+            "  (SELECT id FROM users) UNION (SELECT id FROM users)",
+            "WITH x AS (SELECT 1) SELECT * FROM x",
+            "select updated_at from folders",
+        ],
+    )
+    def test_read_only(self, query):
+        assert is_read_only_query(query)
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            "INSERT INTO t VALUES (1)",
+            "WITH x AS (DELETE FROM t RETURNING id) SELECT * FROM x",
+            "SELECT * FROM t FOR UPDATE",
+            "SELECT * FROM t FOR NO KEY UPDATE NOWAIT",
+            "SELECT nextval('seq')",
+            "SELECT pg_advisory_xact_lock(1)",
+            "SELECT pg_notify('channel', 'payload')",
+        ],
+    )
+    def test_write(self, query):
+        assert not is_read_only_query(query)
+
+
+class TestReplicaRouter:
+    @pytest.fixture
+    def router(self):
+        router = ReplicaRouter()
+        router.add_pool("replica0", object())  # type: ignore
+        router.add_pool("replica1", object())  # type: ignore
+        return router
+
+    def test_disabled_without_replicas(self):
+        assert ReplicaRouter().select("SELECT 1") is None
+
+    def test_round_robin(self, router):
+        assert [router.select("SELECT 1") for _ in range(3)] == [0, 1, 0]
+        assert router.select("UPDATE t SET a = 1") is None
+        assert router.replica_reads == [2, 1]
+
+    def test_request_guard(self, router):
+        async def run():
+            with router.session(None):
+                assert router.select("SELECT 1") is not None
+                router.mark_write()
+                assert router.select("SELECT 1") is None
+            # a new request without a session is not guarded
+            with router.session(None):
+                return router.select("SELECT 1")
+
+        assert asyncio.run(run()) is not None
+        assert router.guarded == 1
+
+    def test_session_guard(self, router):
+        async def run():
+            with router.session("alice"):
+                router.mark_write()
+            with router.session("alice"):
+                guarded = router.select("SELECT 1")
+            with router.session("bob"):
+                other = router.select("SELECT 1")
+            return guarded, other
+
+        guarded, other = asyncio.run(run())
+        assert guarded is None
+        assert other is not None
+
+    def test_primary(self, router):
+        async def run():
+            with router.primary():
+                in_block = router.select("SELECT 1")
+            return in_block, router.select("SELECT 1")
+
+        in_block, after = asyncio.run(run())
+        assert in_block is None
+        assert after is not None
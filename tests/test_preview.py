@@ -0,0 +1,72 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ayon_server.helpers.preview import SingleFlight
+
+
+def test_concurrent_callers_share_result():
+    calls = 0
+
+    async def create() -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"preview"
+
+    async def run():
+        flights = SingleFlight()
+        results = await asyncio.gather(*[flights.run("a", create) for _ in range(5)])
+        other = await flights.run("b", create)
+        return results, other, flights._tasks
+
+    results, other, tasks = asyncio.run(run())
+    assert results == [b"preview"] * 5
+    assert other == b"preview"
+    assert calls == 2
+    assert tasks == {}
+
+
+def test_exception_is_shared_and_not_cached():
+    calls = 0
+
+    async def fail() -> bytes:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def run():
+        flights = SingleFlight()
+        results = await asyncio.gather(
+            flights.run("a", fail),
+            flights.run("a", fail),
+            return_exceptions=True,
+        )
+        with pytest.raises(ValueError):
+            await flights.run("a", fail)
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def create() -> bytes:
+        await asyncio.sleep(0.05)
+        return b"preview"
+
+    async def run():
+        flights = SingleFlight()
+        first = asyncio.create_task(flights.run("a", create))
+        second = asyncio.create_task(flights.run("a", create))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == (b"preview", True)
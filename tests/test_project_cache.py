@@ -0,0 +1,67 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+import ayon_server.helpers.project_cache as project_cache_module
+from ayon_server.config import ayonconfig
+from ayon_server.helpers.project_cache import ProjectCache, invalidate_project_cache
+from ayon_server.utils import json_loads
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(ayonconfig, "project_cache_ttl", 60)
+    monkeypatch.setattr(ayonconfig, "project_cache_size", 2)
+    return ProjectCache()
+
+
+def test_entries_are_shared(cache):
+    entry = cache.put("project-data", "Demo", "{}", cache.generation)
+    assert entry is not None
+    assert cache.get("project-data", "demo") is entry
+    assert cache.get("project-anatomy", "demo") is None
+
+
+def test_data_loaded_before_invalidation_is_not_cached(cache):
+    generation = cache.generation
+    cache.drop("other")
+    assert cache.put("project-data", "demo", "{}", generation) is None
+    assert cache.get("project-data", "demo") is None
+
+
+def test_drop(cache):
+    cache.put("project-data", "demo", "{}", cache.generation)
+    cache.put("project-anatomy", "other", "{}", cache.generation)
+    cache.drop("DEMO")
+    assert cache.get("project-data", "demo") is None
+    assert cache.get("project-anatomy", "other") is not None
+    cache.drop()
+    assert not cache.entries
+
+
+def test_expiration_and_size_limit(cache):
+    first = cache.put("project-data", "a", "{}", cache.generation)
+    cache.put("project-data", "b", "{}", cache.generation)
+    cache.get("project-data", "a")
+    cache.put("project-data", "c", "{}", cache.generation)
+    # "b" was the least recently used entry
+    assert [key[1] for key in cache.entries] == ["a", "c"]
+
+    assert first is not None
+    first.created_at -= ayonconfig.project_cache_ttl + 1
+    assert cache.get("project-data", "a") is None
+    assert [key[1] for key in cache.entries] == ["c"]
+
+
+def test_invalidation_is_published(cache, redis, monkeypatch):
+    monkeypatch.setattr(project_cache_module, "project_cache", cache)
+    cache.put("project-data", "demo", "{}", cache.generation)
+    asyncio.run(invalidate_project_cache("demo"))
+    assert cache.get("project-data", "demo") is None
+    assert [json_loads(message) for _, message in redis.published] == [
+        {"topic": "server.project_changed", "project": "demo"}
+    ]
@@ -0,0 +1,87 @@
+import asyncio
+import datetime
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+import ayon_server.helpers.project_list as project_list
+from ayon_server.exceptions import NotFoundException
+from ayon_server.helpers.project_list import ProjectIndex
+from ayon_server.lib.postgres import Postgres
+
+CREATED_AT = datetime.datetime(2026, 1, 5)
+
+
+def project_row(name: str) -> dict:
+    return {
+        "name": name,
+        "code": name.lower()[:3],
+        "active": True,
+        "created_at": CREATED_AT,
+        "role": None,
+    }
+
+
+@pytest.fixture
+def projects(redis, monkeypatch):
+    """Rows of the projects table and number of executed queries"""
+
+    state = {"rows": [project_row("Demo")], "queries": 0}
+
+    async def iterate(query, *args, **kwargs):
+        state["queries"] += 1
+        for row in state["rows"]:
+            yield row
+
+    monkeypatch.setattr(Postgres, "iterate", staticmethod(iterate))
+    monkeypatch.setattr(project_list, "project_index", ProjectIndex())
+    return state
+
+
+def test_list_is_built_when_not_cached(projects, redis):
+    async def run():
+        first = await project_list.get_project_list()
+        second = await project_list.get_project_list()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert [p.name for p in first] == ["Demo"]
+    assert [p.name for p in second] == ["Demo"]
+    assert projects["queries"] == 1
+    assert len(redis.published) == 1
+
+
+def test_lookup_is_case_insensitive(projects):
+    async def run():
+        name = await project_list.normalize_project_name("DEMO")
+        with pytest.raises(NotFoundException):
+            await project_list.get_project_info("missing")
+        return name
+
+    assert asyncio.run(run()) == "Demo"
+
+
+def test_index_follows_version_of_other_processes(projects):
+    """An index of another process picks up projects it was not notified about"""
+
+    other = ProjectIndex()
+
+    async def run():
+        await project_list.build_project_list()
+        await other.refresh()
+        loaded = other.projects
+
+        # unchanged version does not reload the list
+        other.invalidate()
+        await other.refresh()
+        assert other.projects is loaded
+
+        projects["rows"].append(project_row("Next"))
+        await project_list.build_project_list()
+        return await other.get("next")
+
+    project = asyncio.run(run())
+    assert project is not None and project.name == "Next"
@@ -0,0 +1,50 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ayon_server.lib import runtime_metrics
+from ayon_server.lib.runtime_metrics import Counter, Histogram
+
+
+def test_histogram_rendering():
+    histogram = Histogram("op_seconds", "Operation time", ("op",), (0.5, 0.1))
+    histogram.observe(0.05, "read")
+    histogram.observe(0.1, "read")
+    histogram.observe(2, "read")
+
+    assert histogram.render("ayon") == (
+        "# HELP ayon_op_seconds Operation time\n"
+        "# TYPE ayon_op_seconds histogram\n"
+        'ayon_op_seconds_bucket{op="read",le="0.1"} 2\n'
+        'ayon_op_seconds_bucket{op="read",le="0.5"} 2\n'
+        'ayon_op_seconds_bucket{op="read",le="+Inf"} 3\n'
+        'ayon_op_seconds_sum{op="read"} 2.15\n'
+        'ayon_op_seconds_count{op="read"} 3\n'
+    )
+
+
+def test_histogram_without_labels():
+    histogram = Histogram("lag_seconds", "Lag", buckets=(1,))
+    histogram.observe(0.5)
+    rendered = histogram.render("ayon")
+    assert 'ayon_lag_seconds_bucket{le="1"} 1\n' in rendered
+    assert "ayon_lag_seconds_count 1\n" in rendered
+
+
+def test_series_limit(monkeypatch):
+    monkeypatch.setattr(runtime_metrics, "MAX_SERIES", 2)
+    counter = Counter("calls_total", "Calls", ("route",))
+    for route in ("a", "b", "c", "d", "a"):
+        counter.inc(route)
+    assert counter.values == {("a",): 2, ("b",): 1, ("other",): 2}
+
+
+def test_metric_without_rendering():
+    class Gauge(runtime_metrics._Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Gauge("value", "Value")  # type: ignore
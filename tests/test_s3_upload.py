@@ -0,0 +1,105 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+import ayon_server.files.s3 as s3
+from ayon_server.config import ayonconfig
+from ayon_server.files.s3 import S3Uploader, upload_stream_to_s3
+
+
+class FakeS3Client:
+    """Records multipart upload calls made from the uploader threads"""
+
+    def __init__(self, failing_part: int | None = None):
+        self.failing_part = failing_part
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_pending = 0
+        self.calls: list[tuple] = []
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create", kwargs["Key"]))
+        return {"UploadId": "upload"}
+
+    def upload_part(self, Body, PartNumber, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # later parts finish first
+        time.sleep(0.05 / PartNumber)
+        with self.lock:
+            self.in_flight -= 1
+            if PartNumber == self.failing_part:
+                raise ConnectionError(f"Part {PartNumber} failed")
+            self.calls.append(("upload", PartNumber, Body))
+        return {"ResponseMetadata": {"HTTPHeaders": {"etag": f"etag{PartNumber}"}}}
+
+    def complete_multipart_upload(self, MultipartUpload, **kwargs):
+        self.calls.append(("complete", MultipartUpload["Parts"]))
+
+    def abort_multipart_upload(self, **kwargs):
+        with self.lock:
+            self.calls.append(("abort", self.in_flight))
+
+
+def upload(client: FakeS3Client, *data: bytes) -> int:
+    async def run():
+        uploader = S3Uploader(client, "bucket", concurrency=2)
+
+        async def chunks():
+            for chunk in data:
+                # pushed parts held in memory
+                pending = sum(not task.done() for task in uploader._tasks)
+                client.max_pending = max(client.max_pending, pending)
+                yield chunk
+
+        await uploader.init_file_upload("file")
+        try:
+            size = await upload_stream_to_s3(uploader, chunks())
+            await uploader.complete()
+        except Exception:
+            await uploader.abort()
+            raise
+        return size
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def part_size(monkeypatch):
+    monkeypatch.setattr(s3, "MIN_PART_SIZE", 1)
+    monkeypatch.setattr(ayonconfig, "s3_upload_part_size", 4)
+
+
+def test_parts_are_uploaded_concurrently():
+    client = FakeS3Client()
+    assert upload(client, b"ab", b"cde", b"fghi", b"j", b"klmn", b"o") == 15
+    assert client.max_in_flight == 2
+    assert client.max_pending == 2
+    assert sorted(call[1:] for call in client.calls if call[0] == "upload") == [
+        (1, b"abcde"),
+        (2, b"fghi"),
+        (3, b"jklmn"),
+        (4, b"o"),
+    ]
+    assert client.calls[-1] == (
+        "complete",
+        [{"ETag": f"etag{i}", "PartNumber": i} for i in range(1, 5)],
+    )
+
+
+def test_failed_part_aborts_upload():
+    client = FakeS3Client(failing_part=2)
+    with pytest.raises(ConnectionError):
+        upload(client, b"abcd", b"efgh", b"ijkl", b"mnop", b"qrst")
+    names = [call[0] for call in client.calls]
+    # parts in flight are finished before the abort
+    assert client.calls[-1] == ("abort", 0)
+    assert "complete" not in names
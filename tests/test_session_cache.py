@@ -0,0 +1,68 @@
+import asyncio
+import collections
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+from ayon_server.auth.session import Session, SessionModel
+from ayon_server.background.session_sync import SessionSync
+from ayon_server.lib.redis import Redis
+
+TOKEN = "alice-token"
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Sessions stored in Redis, number of loads and a hook run while loading"""
+
+    session = SessionModel(user={"name": "alice"}, token=TOKEN, last_used=time.time())
+    state = {"stored": {TOKEN: session.json()}, "loads": 0, "during_load": None}
+
+    async def get(namespace, key):
+        state["loads"] += 1
+        data = state["stored"].get(key)
+        if state["during_load"] is not None:
+            await state["during_load"]()
+        return data
+
+    monkeypatch.setattr(Redis, "get", staticmethod(get))
+    monkeypatch.setattr(Session, "_cache", collections.OrderedDict())
+    monkeypatch.setattr(Session, "_cache_generation", 0)
+    return state
+
+
+def check() -> SessionModel | None:
+    return asyncio.run(Session.check(TOKEN, None))
+
+
+def test_session_is_cached(sessions):
+    first = check()
+    second = check()
+    assert first is not None and second is not None
+    assert second.user.name == "alice"
+    assert second is not first
+    assert sessions["loads"] == 1
+
+
+def test_invalidation_drops_cached_session(sessions):
+    check()
+    SessionSync().handle_message({"token": None, "user": "alice"})
+    check()
+    assert sessions["loads"] == 2
+
+
+def test_session_loaded_during_invalidation_is_not_cached(sessions):
+    """A session loaded before an invalidation must not be cached after it"""
+
+    async def invalidate():
+        sessions["during_load"] = None
+        Session.drop_cached(user_name="alice")
+
+    sessions["during_load"] = invalidate
+    check()
+    check()
+    assert sessions["loads"] == 2
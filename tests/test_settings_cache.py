@@ -0,0 +1,63 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from ayon_server.addons.settings_caching import (
+    clear_resolved_settings,
+    get_resolved_settings,
+    resolved_settings_key,
+    set_resolved_settings,
+)
+from ayon_server.config import ayonconfig
+
+SETTINGS = {"enabled": True}
+
+
+def key(project_name: str | None = None) -> str | None:
+    return asyncio.run(
+        resolved_settings_key("core", "1.0.0", "production", project_name)
+    )
+
+
+def get(settings_key: str) -> dict | None:
+    return asyncio.run(get_resolved_settings(settings_key))
+
+
+def test_key_identifies_scope(redis):
+    studio_key = key()
+    assert studio_key is not None
+    assert key() == studio_key
+    assert key("demo") not in (None, studio_key)
+
+
+def test_clear_drops_resolved_settings(redis):
+    settings_key = key()
+    assert settings_key is not None
+    asyncio.run(set_resolved_settings(settings_key, SETTINGS))
+    assert get(settings_key) == SETTINGS
+
+    asyncio.run(clear_resolved_settings())
+    assert get(settings_key) is None
+    new_key = key()
+    assert new_key is not None and new_key != settings_key
+    assert get(new_key) is None
+
+
+def test_settings_resolved_during_clear_are_not_used(redis):
+    """Settings resolved from overrides replaced by a clear are never read"""
+
+    settings_key = key()
+    assert settings_key is not None
+    asyncio.run(clear_resolved_settings())
+    asyncio.run(set_resolved_settings(settings_key, SETTINGS))
+
+    new_key = key()
+    assert new_key is not None
+    assert get(new_key) is None
+
+
+def test_cache_disabled(redis, monkeypatch):
+    monkeypatch.setattr(ayonconfig, "settings_cache_ttl", 0)
+    assert key() is None
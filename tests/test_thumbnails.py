@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+from datetime import UTC, datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import ayon_server.helpers.thumbnails as thumbnails_helpers
+from api.thumbnails import thumbnails as thumbnails_api
+from ayon_server.api.files import etag_matches
+from ayon_server.exceptions import AyonException, ForbiddenException
+from ayon_server.helpers.project_list import ProjectListItem
+from ayon_server.lib.postgres import Postgres
+
+PROJECT_NAME = "demo"
+THUMBNAIL_ID = "af10c8f0e9b111e9b8f90242ac130003"
+PAYLOAD = b"\xff\xd8thumbnail"
+
+
+@pytest.fixture
+def signing_key(monkeypatch):
+    monkeypatch.setattr(thumbnails_helpers, "_signing_key", b"k" * 32)
+
+
+@pytest.fixture
+def client(monkeypatch, signing_key):
+    record = {
+        "id": THUMBNAIL_ID,
+        "mime": "image/jpeg",
+        "data": PAYLOAD,
+        "meta": {"hash": "0123456789abcdef"},
+        "created_at": datetime(2024, 1, 1, tzinfo=UTC),
+    }
+
+    async def fetch(query, *args):
+        return [record] if args == (THUMBNAIL_ID,) else []
+
+    async def get_project(project_name):
+        if project_name.lower() != PROJECT_NAME:
+            return None
+        return ProjectListItem(
+            name=PROJECT_NAME,
+            code="demo",
+            created_at=record["created_at"],
+            nickname="demo",
+        )
+
+    monkeypatch.setattr(Postgres, "fetch", staticmethod(fetch))
+    monkeypatch.setattr(thumbnails_api.project_index, "get", get_project)
+
+    app = FastAPI()
+
+    @app.exception_handler(AyonException)
+    async def handle_ayon_exception(request, exc):
+        return JSONResponse({"detail": exc.detail}, status_code=exc.status)
+
+    app.include_router(thumbnails_api.router, prefix="/api")
+    return TestClient(app)
+
+
+def sign(version: str = "0123456789abcdef") -> str:
+    return asyncio.run(
+        thumbnails_helpers.get_signed_thumbnail_url(PROJECT_NAME, THUMBNAIL_ID, version)
+    )
+
+
+class TestEtagMatches:
+    def test_exact_match(self):
+        assert etag_matches('"abc"', '"abc"')
+
+    def test_weak_and_list(self):
+        assert etag_matches('"x", W/"abc"', '"abc"')
+
+    def test_wildcard(self):
+        assert etag_matches(" * ", None)
+
+    def test_mismatch(self):
+        assert not etag_matches('"abc"', '"abd"')
+        assert not etag_matches('"abc"', None)
+
+
+class TestThumbnailSigning:
+    def test_url_is_stable_and_verifiable(self, signing_key):
+        url = sign()
+        assert url == sign()
+        query = dict(p.split("=") for p in url.split("?")[1].split("&"))
+        asyncio.run(
+            thumbnails_helpers.verify_thumbnail_signature(
+                PROJECT_NAME, THUMBNAIL_ID, query["v"], int(query["exp"]), query["sig"]
+            )
+        )
+
+    def test_tampered_signature(self, signing_key):
+        query = dict(p.split("=") for p in sign().split("?")[1].split("&"))
+        with pytest.raises(ForbiddenException):
+            asyncio.run(
+                thumbnails_helpers.verify_thumbnail_signature(
+                    PROJECT_NAME, THUMBNAIL_ID, "other", int(query["exp"]), query["sig"]
+                )
+            )
+
+    def test_expired(self, signing_key):
+        query = dict(p.split("=") for p in sign().split("?")[1].split("&"))
+        with pytest.raises(ForbiddenException):
+            asyncio.run(
+                thumbnails_helpers.verify_thumbnail_signature(
+                    PROJECT_NAME, THUMBNAIL_ID, query["v"], 1000, query["sig"]
+                )
+            )
+
+
+class TestSignedThumbnailEndpoint:
+    def test_fetch_without_token(self, client):
+        response = client.get(sign())
+        assert response.status_code == 200
+        assert response.content == PAYLOAD
+        assert response.headers["etag"] == '"0123456789abcdef"'
+        assert "immutable" in response.headers["cache-control"]
+
+    def test_not_modified(self, client):
+        url = sign()
+        response = client.get(url, headers={"if-none-match": '"0123456789abcdef"'})
+        assert response.status_code == 304
+
+    def test_invalid_signature(self, client):
+        response = client.get(sign().replace("sig=", "sig=0"))
+        assert response.status_code == 403
+
+    def test_outdated_version(self, client):
+        response = client.get(sign("outdated"))
+        assert response.status_code == 200
+        assert "immutable" not in response.headers["cache-control"]
@@ -0,0 +1,54 @@
+import asyncio
+import datetime
+import os
+import sys
+import types
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import ayon_server.background.traffic_stats as traffic_stats_module
+from ayon_server.background.traffic_stats import TrafficStatsCollector
+from ayon_server.lib.postgres import Postgres
+
+MONDAY = datetime.date(2026, 1, 5)
+TUESDAY = datetime.date(2026, 1, 6)
+
+
+def test_amounts_are_stored_for_the_day_they_were_reported(monkeypatch):
+    calls = []
+
+    async def execute(query, *args):
+        calls.append(args)
+
+    today = MONDAY
+    clock = types.SimpleNamespace(date=types.SimpleNamespace(today=lambda: today))
+    monkeypatch.setattr(traffic_stats_module, "datetime", clock)
+    monkeypatch.setattr(Postgres, "execute", staticmethod(execute))
+
+    collector = TrafficStatsCollector()
+    collector.add("ayon", ingress=10)
+    today = TUESDAY
+    collector.add("ayon", egress=5)
+    collector.add("ayon", ingress=1)
+    asyncio.run(collector.flush())
+
+    assert calls == [([MONDAY, TUESDAY], ["ayon", "ayon"], [10, 1], [0, 5])]
+    assert collector.pending == {}
+
+
+def test_failed_flush_keeps_the_dates(monkeypatch):
+    async def execute(query, *args):
+        raise ConnectionError("database is gone")
+
+    monkeypatch.setattr(Postgres, "execute", staticmethod(execute))
+    monkeypatch.setattr(traffic_stats_module, "log_traceback", lambda *a, **k: None)
+
+    collector = TrafficStatsCollector()
+    collector.add("ayon", ingress=10, date=MONDAY)
+    collector.add("ayon", ingress=1, date=TUESDAY)
+    asyncio.run(collector.flush())
+
+    assert collector.pending == {
+        (MONDAY, "ayon"): [10, 0],
+        (TUESDAY, "ayon"): [1, 0],
+    }